@@ -1,25 +1,49 @@
 import os
 from datetime import datetime, timedelta
+from decimal import Decimal
 from dotenv import load_dotenv
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from flask import Flask, request, jsonify, redirect
+from flask import Flask, request, jsonify, redirect, Response, stream_with_context, send_file
 import json
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from passlib.context import CryptContext
 import jwt
 import logging
+import base64
+import calendar
+import hashlib
+import io
+import tempfile
+from db_config import engine_options, pool_status, pool_stats, env_bool, env_int
+from token_cache import TokenCache
+from logging_config import configure_logging
+from reference_cache import ReferenceDataCache
+from spend_index import SpendIndexCache
+from expense_import import validate_expense, parse_ndjson, spend_totals, insert_expenses
+from csv_import import DEFAULT_COLUMNS, import_csv
+from expense_export import csv_lines, ndjson_lines, encode_chunks, gzip_chunks
+from statements import StatementRenderer
+from json_provider import FastJSONProvider
+from money import DEFAULT_MINOR_UNIT_DIGITS, scale_for, to_major, to_minor
+from bootstrap import seed_reference_data
+from metrics import RequestMetrics, metrics_response, observe_pool_checkout
+from sql_profiler import SQLProfiler
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session as OrmSession
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (queue-backed JSON output; level from LOG_LEVEL)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "*"}})
+app.json = FastJSONProvider(app)  # orjson when installed; dates and Decimals serialized natively
+CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=['X-SQL-Profile'])
 
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL')
@@ -31,6 +55,7 @@ else:
 
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(DATABASE_URL)  # Pool settings from DB_* env vars
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
 
 # Session configuration for production (behind CloudFront/Load Balancer)
@@ -42,6 +67,20 @@ app.config['PREFERRED_URL_SCHEME'] = 'https'  # Generate HTTPS URLs
 
 db = SQLAlchemy(app)
 
+# Prometheus metrics: per-route latency, status codes, SQL per request, pool usage (GET /metrics)
+request_metrics = RequestMetrics(app, enabled=env_bool('METRICS_ENABLED', True))
+pool_stats.listeners.append(observe_pool_checkout)
+
+# Opt-in SQL profiler: N+1 warnings, slow-query log with plans, X-SQL-Profile report header
+sql_profiler = SQLProfiler(
+    app,
+    engine=lambda: db.engine,
+    enabled=env_bool('SQL_PROFILER', False),
+    slow_query_ms=env_int('SQL_SLOW_QUERY_MS', 100),
+    repeat_threshold=env_int('SQL_REPEAT_THRESHOLD', 5),
+    explain_slow=env_bool('SQL_EXPLAIN', True)
+)
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -50,6 +89,12 @@ JWT_SECRET = app.config['SECRET_KEY']
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Verified tokens are cached so bursts of dashboard calls decode each JWT once
+token_cache = TokenCache(
+    maxsize=env_int('JWT_CACHE_SIZE', 1024),
+    ttl_seconds=env_int('JWT_CACHE_TTL_SECONDS', 300)
+)
+
 # ===================== DATABASE MODELS =====================
 
 class Currency(db.Model):
@@ -57,6 +102,8 @@ class Currency(db.Model):
     currency_id = db.Column(db.Integer, primary_key=True)
     currency_name = db.Column(db.String(50), nullable=False)
     currency_symbol = db.Column(db.String(10), nullable=False)
+    # Amounts in this currency are stored as integers of 10 ** minor_unit_digits per unit
+    minor_unit_digits = db.Column(db.Integer, nullable=False, default=2, server_default='2')
 
 class User(db.Model):
     __tablename__ = "user"
@@ -64,20 +111,26 @@ class User(db.Model):
     username = db.Column(db.String(50), nullable=False, unique=True)
     password = db.Column(db.String(255), nullable=True)  # Made nullable for Google OAuth
     email = db.Column(db.String(120), unique=True, nullable=False)
-    global_limit = db.Column(db.Float, default=0)
+    global_limit = db.Column(db.BigInteger, default=0)  # Minor units of the user's currency
     currency_id = db.Column(db.Integer, db.ForeignKey('currency.currency_id'), default=1)
     name = db.Column(db.String(100))
+    # Bumped on every write to the user's data; drives the ETags of per-user reads
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
 class Expense(db.Model):
     __tablename__ = "expense"
     expense_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.user_id'), nullable=False)
     expense_name = db.Column(db.String(200), nullable=True)  # New column for expense name
-    expense_item_price = db.Column(db.Float, nullable=False)
+    expense_item_price = db.Column(db.BigInteger, nullable=False)  # Minor units of the user's currency
     expense_category_id = db.Column(db.Integer, db.ForeignKey('expense_category.expense_category_id'), nullable=False)
     expense_description = db.Column(db.String(255))
     expense_item_count = db.Column(db.Integer, default=1)
     expenditure_date = db.Column(db.Date, nullable=False)
+    __table_args__ = (
+        # Every expense read filters by user and a date range
+        db.Index('ix_expense_user_id_expenditure_date', 'user_id', 'expenditure_date'),
+    )
 
 class ExpenseCategory(db.Model):
     __tablename__ = "expense_category"
@@ -85,14 +138,36 @@ class ExpenseCategory(db.Model):
     expense_category_name = db.Column(db.String(100), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.user_id'), nullable=True)
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
+    __table_args__ = (
+        # Category lists only ever show non-deleted rows
+        db.Index('ix_expense_category_user_id_active', 'user_id',
+                 postgresql_where=db.text('is_deleted = false')),
+        # One global category per name; the conflict target of the seed inserts
+        db.Index('uq_expense_category_global_name', 'expense_category_name', unique=True,
+                 postgresql_where=db.text('user_id IS NULL'), sqlite_where=db.text('user_id IS NULL')),
+    )
 
 class MonthlyLimit(db.Model):
     __tablename__ = "monthly_limit"
     monthly_limit_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.user_id'), nullable=False)
-    monthly_limit_amount = db.Column(db.Float, nullable=False)
+    monthly_limit_amount = db.Column(db.BigInteger, nullable=False)  # Minor units of the user's currency
     month_id = db.Column(db.Integer, db.ForeignKey('month.month_id'), nullable=False)
     year_id = db.Column(db.Integer, db.ForeignKey('year.year_id'), nullable=False)
+    __table_args__ = (
+        # One limit per user and month; the conflict target of limit upserts
+        db.UniqueConstraint('user_id', 'year_id', 'month_id', name='uq_monthly_limit_user_id_year_id_month_id'),
+    )
+
+class MonthlySpendRollup(db.Model):
+    """Per-user, per-month, per-category spend totals kept in step with expense writes"""
+    __tablename__ = "monthly_spend_rollup"
+    user_id = db.Column(db.Integer, db.ForeignKey('user.user_id'), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('expense_category.expense_category_id'), primary_key=True)
+    total = db.Column(db.BigInteger, nullable=False, default=0)  # Minor units
+    count = db.Column(db.Integer, nullable=False, default=0)
 
 class Month(db.Model):
     __tablename__ = "month"
@@ -117,39 +192,394 @@ def create_access_token(data):
 def verify_token(token):
     """Verify JWT token"""
     try:
-        logger.info(f'verify_token - Attempting to decode token: {token[:20]}...')
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        logger.info(f'verify_token - Token decoded successfully. Payload: {payload}')
+        logger.debug('verify_token - Token decoded for user_id %s', payload.get('user_id'))
         return payload
     except jwt.ExpiredSignatureError as e:
-        logger.error(f'verify_token - Token expired: {e}')
+        logger.error('verify_token - Token expired: %s', e)
         return None
     except jwt.InvalidTokenError as e:
-        logger.error(f'verify_token - Invalid token: {e}')
+        logger.error('verify_token - Invalid token: %s', e)
         return None
 
 def get_current_user_id():
     """Get current user ID from token"""
     auth_header = request.headers.get('Authorization')
-    logger.info(f'get_current_user_id - Auth header: {auth_header[:50] if auth_header else "None"}')
     
     if auth_header and auth_header.startswith('Bearer '):
         token = auth_header.split(' ')[1]
-        logger.info(f'get_current_user_id - Token extracted: {token[:20]}...')
+        
+        user_id = token_cache.get(token)
+        if user_id is not None:
+            return user_id
         
         payload = verify_token(token)
         if payload:
             user_id = payload.get('user_id')
-            logger.info(f'get_current_user_id - User ID from token: {user_id}')
+            logger.debug('get_current_user_id - User ID from token: %s', user_id)
+            if user_id is not None:
+                token_cache.put(token, user_id, payload.get('exp'))
             return user_id
         else:
             logger.warning('get_current_user_id - Token verification failed!')
     else:
         logger.warning('get_current_user_id - No valid auth header found!')
     
-    logger.error('get_current_user_id - No authenticated user found')
+    logger.debug('get_current_user_id - No authenticated user found')
     return None  # No default user - authentication required
 
+# Columns selectable with ?fields= on GET /api/expenses. Null handling and
+# the minor-to-major unit conversion are done in SQL, and dates are encoded by
+# the JSON provider, so a result row maps straight onto the response object.
+EXPENSE_FIELDS = {
+    'expense_id': Expense.expense_id,
+    'expense_name': db.func.coalesce(Expense.expense_name, ''),
+    'expense_item_price': Expense.expense_item_price,
+    'expense_category_id': Expense.expense_category_id,
+    'expense_category_name': db.func.coalesce(ExpenseCategory.expense_category_name, 'Unknown'),
+    'expense_description': db.func.coalesce(Expense.expense_description, ''),
+    'expense_item_count': Expense.expense_item_count,
+    'expenditure_date': Expense.expenditure_date
+}
+ALL_EXPENSE_FIELDS = list(EXPENSE_FIELDS)
+EXPENSES_MAX_PAGE_SIZE = env_int('EXPENSES_MAX_PAGE_SIZE', 1000)
+
+def parse_expense_fields(value):
+    """Split a comma-separated ?fields= value; raises ValueError on unknown names"""
+    if not value:
+        return ALL_EXPENSE_FIELDS
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in EXPENSE_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}' if unknown else 'fields is empty')
+    return fields
+
+def encode_expense_cursor(expenditure_date, expense_id):
+    """Opaque keyset cursor for the position after (expenditure_date, expense_id)"""
+    raw = f'{expenditure_date.isoformat()}|{expense_id}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_expense_cursor(cursor):
+    """Inverse of encode_expense_cursor; raises ValueError on a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        day, expense_id = raw.split('|')
+        return datetime.strptime(day, '%Y-%m-%d').date(), int(expense_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def expense_field_column(field, scale):
+    """Labeled select column for a ?fields= name; prices come back in major units"""
+    if field == 'expense_item_price':
+        return (db.cast(Expense.expense_item_price, db.Float) / scale).label(field)
+    return EXPENSE_FIELDS[field].label(field)
+
+def expense_rows_query(user_id, fields, scale, after=None, start_date=None, end_date=None):
+    """Query a user's expenses ordered by (expenditure_date, expense_id).
+
+    Only the requested columns are selected, and the category join is
+    skipped unless its name is requested. Rows start with `fields` in order,
+    followed by the cursor columns; `scale` is the user's money_scale(). The cursor predicate keeps a plain
+    expenditure_date lower bound, so a page is a range scan on
+    ix_expense_user_id_expenditure_date starting at the cursor rather than
+    an OFFSET that re-reads earlier pages.
+    """
+    query = db.session.query(
+        *(expense_field_column(field, scale) for field in fields),
+        Expense.expenditure_date.label('_cursor_date'),
+        Expense.expense_id.label('_cursor_id')
+    ).select_from(Expense)
+    if 'expense_category_name' in fields:
+        query = query.outerjoin(
+            ExpenseCategory,
+            ExpenseCategory.expense_category_id == Expense.expense_category_id
+        )
+    query = query.filter(Expense.user_id == user_id)
+    if start_date is not None:
+        query = query.filter(Expense.expenditure_date >= start_date)
+    if end_date is not None:
+        query = query.filter(Expense.expenditure_date < end_date)
+    if after is not None:
+        after_date, after_id = after
+        query = query.filter(
+            Expense.expenditure_date >= after_date,
+            db.or_(
+                Expense.expenditure_date > after_date,
+                Expense.expense_id > after_id
+            )
+        )
+    return query.order_by(Expense.expenditure_date, Expense.expense_id)
+
+def query_expense_page(user_id, fields, scale, limit, after=None, start_date=None, end_date=None):
+    """Fetch one keyset page (every row when limit is None); returns (rows, next_cursor)"""
+    query = expense_rows_query(user_id, fields, scale, after, start_date, end_date)
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_expense_cursor(rows[-1]._cursor_date, rows[-1]._cursor_id)
+    return rows, next_cursor
+
+def project_expense_row(row, fields):
+    """Response object for a row from query_expense_page; the first columns are `fields`"""
+    return dict(zip(fields, row))
+
+def dialect_insert(model):
+    """INSERT construct with ON CONFLICT support for the active database"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+def apply_spend_delta(user_id, expenditure_date, category_id, total_delta, count_delta):
+    """Add a delta to the user's monthly_spend_rollup row.
+
+    Call in the same transaction as the expense write so the rollup never
+    drifts from the expense table.
+    """
+    rollup = MonthlySpendRollup.__table__
+    key = {
+        'user_id': user_id,
+        'year': expenditure_date.year,
+        'month': expenditure_date.month,
+        'category_id': category_id
+    }
+    stmt = dialect_insert(rollup).values(**key, total=total_delta, count=count_delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={
+            'total': rollup.c.total + stmt.excluded.total,
+            'count': rollup.c['count'] + stmt.excluded['count']
+        }
+    )
+    db.session.execute(stmt)
+    if count_delta < 0:
+        db.session.execute(rollup.delete().where(
+            *(rollup.c[column] == value for column, value in key.items()),
+            rollup.c['count'] <= 0
+        ))
+
+# ===================== MONEY =====================
+
+def money_scale(user_id):
+    """Minor units per major unit of the user's currency (100 for cents)"""
+    digits = db.session.query(Currency.minor_unit_digits).join(
+        User, User.currency_id == Currency.currency_id
+    ).filter(User.user_id == user_id).scalar()
+    return scale_for(digits)
+
+def rebuild_user_spend_rollup(user_id):
+    """Recompute the user's monthly_spend_rollup rows from their expenses"""
+    rollup = MonthlySpendRollup.__table__
+    expense_year = db.extract('year', Expense.expenditure_date)
+    expense_month = db.extract('month', Expense.expenditure_date)
+    totals = db.select(
+        Expense.user_id,
+        expense_year,
+        expense_month,
+        Expense.expense_category_id,
+        db.func.sum(Expense.expense_item_price * Expense.expense_item_count),
+        db.func.count(Expense.expense_id)
+    ).where(Expense.user_id == user_id).group_by(
+        Expense.user_id, expense_year, expense_month, Expense.expense_category_id
+    )
+    db.session.execute(rollup.delete().where(rollup.c.user_id == user_id))
+    db.session.execute(rollup.insert().from_select(
+        ['user_id', 'year', 'month', 'category_id', 'total', 'count'], totals
+    ))
+
+def rescaled_amount(column, old_scale, new_scale):
+    """SQL for column * new_scale / old_scale rounded half up, in exact NUMERIC arithmetic.
+
+    A float factor would round half to even on PostgreSQL (12.5 -> 12) and
+    lose precision above 2**53.
+    """
+    exact = db.Numeric(38, 0)
+    return db.cast(
+        db.func.round(
+            db.cast(column, exact) * db.literal(Decimal(new_scale), exact) / db.literal(Decimal(old_scale), exact)
+        ),
+        db.BigInteger
+    )
+
+def change_user_currency(user, currency_id):
+    """Switch the user's currency, rescaling stored amounts to its minor unit.
+
+    Amounts keep their value in major units (12.50 stays 12.50), rounded
+    half up when the new currency has fewer minor digits. Call inside the
+    write's transaction.
+    """
+    old_scale = money_scale(user.user_id)
+    user.currency_id = currency_id
+    new_scale = money_scale(user.user_id)
+    if new_scale == old_scale:
+        return
+    
+    def rescaled(column):
+        return rescaled_amount(column, old_scale, new_scale)
+    
+    Expense.query.filter_by(user_id=user.user_id).update(
+        {Expense.expense_item_price: rescaled(Expense.expense_item_price)}, synchronize_session=False
+    )
+    MonthlyLimit.query.filter_by(user_id=user.user_id).update(
+        {MonthlyLimit.monthly_limit_amount: rescaled(MonthlyLimit.monthly_limit_amount)}, synchronize_session=False
+    )
+    User.query.filter_by(user_id=user.user_id).update(
+        {User.global_limit: rescaled(User.global_limit)}, synchronize_session=False
+    )
+    db.session.expire(user, ['global_limit'])
+    # Rebuilt rather than rescaled, so totals stay equal to the sum of the rounded prices
+    rebuild_user_spend_rollup(user.user_id)
+
+# ===================== REFERENCE DATA CACHE =====================
+
+def load_reference_data():
+    """Read the reference tables for ReferenceDataCache"""
+    return {
+        'currencies': [
+            {
+                'currency_id': curr.currency_id,
+                'currency_name': curr.currency_name,
+                'currency_symbol': curr.currency_symbol,
+                'minor_unit_digits': curr.minor_unit_digits
+            }
+            for curr in Currency.query.all()
+        ],
+        'months': [
+            {'month_id': month.month_id, 'month_name': month.month_name}
+            for month in Month.query.order_by(Month.month_id).all()
+        ],
+        'years': [
+            {'year_id': year.year_id, 'year_number': year.year_number}
+            for year in Year.query.all()
+        ],
+        'global_categories': [
+            {
+                'category_id': cat.expense_category_id,
+                'category_name': cat.expense_category_name,
+                'is_global': True
+            }
+            for cat in ExpenseCategory.query.filter(
+                ExpenseCategory.user_id == None,
+                ExpenseCategory.is_deleted == False
+            ).all()
+        ]
+    }
+
+reference_cache = ReferenceDataCache(
+    load_reference_data,
+    ttl_seconds=env_int('REFERENCE_CACHE_TTL_SECONDS', 300)
+)
+
+def is_reference_row(obj):
+    if isinstance(obj, ExpenseCategory):
+        return obj.user_id is None
+    return isinstance(obj, (Currency, Month, Year))
+
+@event.listens_for(OrmSession, 'after_flush')
+def mark_reference_data_changed(session, flush_context):
+    """Remember whether this transaction wrote any reference rows"""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if is_reference_row(obj):
+            session.info['reference_data_changed'] = True
+            return
+
+@event.listens_for(OrmSession, 'after_commit')
+def invalidate_reference_data(session):
+    if session.info.pop('reference_data_changed', False):
+        reference_cache.invalidate()
+
+@event.listens_for(OrmSession, 'after_rollback')
+def discard_reference_data_changes(session):
+    session.info.pop('reference_data_changed', None)
+
+def cached_json_response(body, etag=None):
+    """JSON response with a strong ETag; answers 304 when If-None-Match matches"""
+    response = Response(body, mimetype='application/json')
+    if etag:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def categories_for_user(user_id):
+    """Global categories from the cache plus the user's own, sorted by name"""
+    user_categories = [
+        {
+            'category_id': cat.expense_category_id,
+            'category_name': cat.expense_category_name,
+            'is_global': False
+        }
+        for cat in ExpenseCategory.query.filter(
+            ExpenseCategory.user_id == user_id,
+            ExpenseCategory.is_deleted == False
+        ).all()
+    ]
+    categories = reference_cache.get().global_categories + user_categories
+    return sorted(categories, key=lambda cat: cat['category_name'])
+
+# ===================== DAILY SPEND INDEX =====================
+
+# Prefix sums of daily spend per user, for O(1) custom date-range summaries
+spend_index_cache = SpendIndexCache(
+    maxsize=env_int('SPEND_INDEX_CACHE_SIZE', 256),
+    max_bytes=env_int('SPEND_INDEX_CACHE_MB', 64) * 1024 * 1024
+)
+
+def load_daily_spend(user_id):
+    """(date, category_id, category_name, total, count) per day and category"""
+    return db.session.query(
+        Expense.expenditure_date,
+        Expense.expense_category_id,
+        ExpenseCategory.expense_category_name,
+        db.func.sum(Expense.expense_item_price * Expense.expense_item_count),
+        db.func.count(Expense.expense_id)
+    ).outerjoin(
+        ExpenseCategory,
+        Expense.expense_category_id == ExpenseCategory.expense_category_id
+    ).filter(
+        Expense.user_id == user_id
+    ).group_by(
+        Expense.expenditure_date,
+        Expense.expense_category_id,
+        ExpenseCategory.expense_category_name
+    ).all()
+
+# ===================== CONDITIONAL REQUESTS =====================
+
+def bump_data_version(user_id):
+    """Invalidate the user's ETags; call inside the write's transaction.
+    Returns the new version."""
+    User.query.filter_by(user_id=user_id).update(
+        {User.data_version: User.data_version + 1},
+        synchronize_session=False
+    )
+    return get_data_version(user_id)
+
+def get_data_version(user_id):
+    return db.session.query(User.data_version).filter(User.user_id == user_id).scalar() or 0
+
+def data_version_etag(user_id, version):
+    """Strong ETag for the current URL (path + query) at a given data version"""
+    key = f'{request.full_path}|{user_id}|{version}'
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+def is_not_modified(etag):
+    return request.if_none_match.contains(etag)
+
+def not_modified_response(etag):
+    return versioned_response(Response(status=304), etag)
+
+def versioned_response(response, etag):
+    """Attach the ETag and ask clients to revalidate before reusing the body"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Authorization')
+    return response
+
 from authlib.integrations.flask_client import OAuth
 from flask import url_for, session
 
@@ -178,7 +608,7 @@ def google_login():
     # Ensure the redirect URI is HTTPS for production
     if 'http://' in redirect_uri and 'localhost' not in redirect_uri:
         redirect_uri = redirect_uri.replace('http://', 'https://')
-    logger.info(f"Google OAuth redirect_uri: {redirect_uri}")
+    logger.info("Google OAuth redirect_uri: %s", redirect_uri)
     return oauth.google.authorize_redirect(redirect_uri)
 
 @app.route('/auth/google')
@@ -186,19 +616,13 @@ def google_auth():
     """Callback route for Google OAuth"""
     try:
         # Debug logging - let's see everything
-        logger.info(f"=== OAuth Callback Debug ===")
-        logger.info(f"Full URL: {request.url}")
-        logger.info(f"Request path: {request.path}")
-        logger.info(f"Query string: {request.query_string}")
-        logger.info(f"Request args: {dict(request.args)}")
-        logger.info(f"Request method: {request.method}")
-        logger.info(f"Request headers: {dict(request.headers)}")
+        logger.debug('OAuth callback: path=%s args=%s', request.path, list(request.args))
 
         # Manual token exchange to bypass state verification issues
         # Get authorization code from query params
         code = request.args.get('code')
         if not code:
-            logger.error(f"ERROR: No code found!")
+            logger.error('OAuth callback: no authorization code received')
             raise ValueError("No authorization code received")
 
         # Manually exchange code for token, bypassing state check
@@ -277,7 +701,7 @@ def google_auth():
             return redirect(f"{frontend_callback_url}?token={jwt_token}&user={json.dumps(user_data)}")
 
     except Exception as e:
-        logger.error(f"Error during Google OAuth callback: {e}")
+        logger.error("Error during Google OAuth callback: %s", e)
         db.session.rollback()
 
         if 'mismatching_state' in str(e):
@@ -297,50 +721,125 @@ def google_auth():
 
 @app.route('/api/expenses', methods=['GET'])
 def get_expenses():
-    """Get expenses for a specific year and month"""
+    """Get expenses for a specific year and month.
+
+    With `limit` (and optionally `cursor`) the response is one keyset page,
+    {"expenses": [...], "next_cursor": ...}, ordered by date and id; year and
+    month are then optional. `fields` selects a comma-separated subset of
+    the expense keys in either mode.
+    """
     try:
         year = request.args.get('year', type=int)
         month = request.args.get('month', type=int)
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
         user_id = get_current_user_id()
         
         if user_id is None:
             return jsonify({'error': 'Authentication required'}), 401
         
-        if not year or not month:
+        paginated = limit is not None or cursor is not None
+        if not paginated and (not year or not month):
             return jsonify({'error': 'Year and month are required'}), 400
+        if paginated and bool(year) != bool(month):
+            return jsonify({'error': 'Year and month must be given together'}), 400
+        if paginated and limit is None:
+            limit = 100
+        if paginated and not 1 <= limit <= EXPENSES_MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {EXPENSES_MAX_PAGE_SIZE}'}), 400
+        
+        try:
+            fields = parse_expense_fields(request.args.get('fields'))
+            after = decode_expense_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Rows carry global category names, so the reference data version is part of the ETag
+        etag = data_version_etag(user_id, f'{get_data_version(user_id)}.{reference_cache.get().etag}')
+        if is_not_modified(etag):
+            return not_modified_response(etag)
         
         # Get expenses for the specified month and year
-        start_date = datetime(year, month, 1).date()
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1).date()
-        else:
-            end_date = datetime(year, month + 1, 1).date()
+        start_date = end_date = None
+        if year and month:
+            start_date = datetime(year, month, 1).date()
+            if month == 12:
+                end_date = datetime(year + 1, 1, 1).date()
+            else:
+                end_date = datetime(year, month + 1, 1).date()
         
-        expenses = Expense.query.filter(
-            Expense.user_id == user_id,
-            Expense.expenditure_date >= start_date,
-            Expense.expenditure_date < end_date
-        ).all()
+        if paginated:
+            rows, next_cursor = query_expense_page(
+                user_id, fields, money_scale(user_id), limit, after, start_date, end_date
+            )
+            return versioned_response(jsonify({
+                'expenses': [project_expense_row(row, fields) for row in rows],
+                'next_cursor': next_cursor
+            }), etag), 200
         
-        expenses_data = []
-        for expense in expenses:
-            # Get category name
-            category = ExpenseCategory.query.get(expense.expense_category_id)
-            expenses_data.append({
-                'expense_id': expense.expense_id,
-                'expense_name': expense.expense_name or '',  # Include expense name
-                'expense_item_price': expense.expense_item_price,
-                'expense_category_id': expense.expense_category_id,
-                'expense_category_name': category.expense_category_name if category else 'Unknown',
-                'expense_description': expense.expense_description or '',
-                'expense_item_count': expense.expense_item_count,
-                'expenditure_date': expense.expenditure_date.isoformat()
-            })
+        rows, _ = query_expense_page(user_id, fields, money_scale(user_id), None, None, start_date, end_date)
+        expenses_data = [project_expense_row(row, fields) for row in rows]
         
-        return jsonify(expenses_data), 200
+        return versioned_response(jsonify(expenses_data), etag), 200
         
     except Exception as e:
-        logger.error(f'Error fetching expenses: {e}')
+        logger.error('Error fetching expenses: %s', e)
+        return jsonify({'error': str(e)}), 500
+
+EXPORT_FORMATS = {
+    'csv': (csv_lines, 'text/csv; charset=utf-8'),
+    'ndjson': (ndjson_lines, 'application/x-ndjson')
+}
+EXPORT_YIELD_PER = env_int('EXPORT_YIELD_PER', 1000)
+
+@app.route('/api/expenses/export', methods=['GET'])
+def export_expenses():
+    """Stream the user's expenses as CSV or NDJSON.
+
+    Optional from/to (YYYY-MM-DD, inclusive) bound the range. Rows are
+    fetched EXPORT_YIELD_PER at a time through a server-side cursor and
+    written out as they arrive; the body is gzipped when the client
+    accepts it.
+    """
+    try:
+        export_format = request.args.get('format', 'csv')
+        user_id = get_current_user_id()
+        
+        if user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': 'format must be csv or ndjson'}), 400
+        
+        try:
+            start_date = request.args.get('from')
+            end_date = request.args.get('to')
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() + timedelta(days=1) if end_date else None
+        except ValueError:
+            return jsonify({'error': 'from and to must be YYYY-MM-DD'}), 400
+        
+        # yield_per turns on stream_results, i.e. a named cursor on psycopg2
+        rows = expense_rows_query(
+            user_id, ALL_EXPENSE_FIELDS, money_scale(user_id), start_date=start_date, end_date=end_date
+        ).execution_options(yield_per=EXPORT_YIELD_PER)
+        
+        serialize, content_type = EXPORT_FORMATS[export_format]
+        body = encode_chunks(serialize(project_expense_row(row, ALL_EXPENSE_FIELDS) for row in rows))
+        gzipped = bool(request.accept_encodings['gzip'])
+        if gzipped:
+            body = gzip_chunks(body)
+        
+        response = Response(stream_with_context(body), content_type=content_type)
+        if gzipped:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        response.headers['Content-Disposition'] = f'attachment; filename=expenses.{export_format}'
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+        
+    except Exception as e:
+        logger.error('Error exporting expenses: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/expenses', methods=['POST'])
@@ -348,7 +847,6 @@ def add_expense():
     """Add a new expense"""
     try:
         data = request.get_json()
-        logger.info(f'Add expense request data: {data}')
         year = data.get('year')
         month = data.get('month')
         expense_data = data.get('expense', {})
@@ -356,8 +854,6 @@ def add_expense():
         
         if user_id is None:
             return jsonify({'error': 'Authentication required'}), 401
-            
-        logger.info(f'Expense data: {expense_data}')
         
         if not all([year, month, expense_data]):
             return jsonify({'error': 'Year, month, and expense data are required'}), 400
@@ -378,6 +874,10 @@ def add_expense():
         amount = expense_data.get('amount') or expense_data.get('expense_item_price')
         if not amount:
             return jsonify({'error': 'Amount is required'}), 400
+        try:
+            price = to_minor(amount, money_scale(user_id))
+        except ValueError:
+            return jsonify({'error': 'Amount must be a number'}), 400
         
         # Get expense name - frontend sends 'name'
         expense_name = expense_data.get('name') or expense_data.get('expense_name', '')
@@ -386,7 +886,7 @@ def add_expense():
         new_expense = Expense(
             user_id=user_id,
             expense_name=expense_name,  # Save the expense name
-            expense_item_price=float(amount),
+            expense_item_price=price,
             expense_category_id=int(category_id),
             expense_description=expense_data.get('description') or expense_data.get('expense_description', ''),
             expense_item_count=int(expense_data.get('expense_item_count', 1)),
@@ -394,7 +894,16 @@ def add_expense():
         )
         
         db.session.add(new_expense)
+        apply_spend_delta(
+            user_id, expense_date, new_expense.expense_category_id,
+            new_expense.expense_item_price * new_expense.expense_item_count, 1
+        )
+        version = bump_data_version(user_id)
         db.session.commit()
+        spend_index_cache.apply(
+            user_id, version, expense_date, new_expense.expense_category_id,
+            new_expense.expense_item_price * new_expense.expense_item_count, 1
+        )
         
         return jsonify({
             'message': 'Expense added successfully',
@@ -402,7 +911,7 @@ def add_expense():
         }), 201
         
     except Exception as e:
-        logger.error(f'Error adding expense: {e}')
+        logger.error('Error adding expense: %s', e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -430,12 +939,204 @@ def delete_expense():
             return jsonify({'error': 'Expense not found'}), 404
         
         db.session.delete(expense)
+        apply_spend_delta(
+            user_id, expense.expenditure_date, expense.expense_category_id,
+            -(expense.expense_item_price * expense.expense_item_count), -1
+        )
+        version = bump_data_version(user_id)
         db.session.commit()
+        spend_index_cache.apply(
+            user_id, version, expense.expenditure_date, expense.expense_category_id,
+            -(expense.expense_item_price * expense.expense_item_count), -1
+        )
         
         return jsonify({'message': 'Expense deleted successfully'}), 200
         
     except Exception as e:
-        logger.error(f'Error deleting expense: {e}')
+        logger.error('Error deleting expense: %s', e)
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def active_category_ids(user_id):
+    """Ids of the global and user's own categories that expenses may use"""
+    rows = db.session.query(ExpenseCategory.expense_category_id).filter(
+        db.or_(ExpenseCategory.user_id.is_(None), ExpenseCategory.user_id == user_id),
+        ExpenseCategory.is_deleted == False
+    )
+    return {row.expense_category_id for row in rows}
+
+def apply_spend_totals(user_id, totals):
+    """Fold spend_totals() of a batch into the rollup, one upsert per month and category"""
+    for (year, month, category_id), (total, count) in totals.items():
+        apply_spend_delta(user_id, datetime(year, month, 1).date(), category_id, total, count)
+
+BULK_MAX_ROWS = env_int('BULK_MAX_ROWS', 100000)
+BULK_INSERT_CHUNK_SIZE = env_int('BULK_INSERT_CHUNK_SIZE', 5000)
+
+@app.route('/api/expenses/bulk', methods=['POST'])
+def add_expenses_bulk():
+    """Add many expenses in one transaction.
+
+    Body is a JSON array of expenses (or {"expenses": [...]}) or, with
+    Content-Type application/x-ndjson, one expense per line. Rows are all
+    validated before anything is written. By default any invalid row rejects
+    the whole batch; with ?partial=true the valid rows are inserted and the
+    invalid ones reported.
+    """
+    try:
+        user_id = get_current_user_id()
+        
+        if user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+            records = parse_ndjson(request.stream)
+        else:
+            data = request.get_json(silent=True)
+            if isinstance(data, dict):
+                data = data.get('expenses')
+            if not isinstance(data, list):
+                return jsonify({'error': 'Expected a JSON array of expenses or an NDJSON body'}), 400
+            records = ((row_number, raw, None) for row_number, raw in enumerate(data, 1))
+        
+        partial = request.args.get('partial', 'false').lower() == 'true'
+        category_ids = active_category_ids(user_id)
+        scale = money_scale(user_id)
+        rows = []
+        errors = []
+        try:
+            for row_number, raw, error in records:
+                if row_number > BULK_MAX_ROWS:
+                    return jsonify({'error': f'At most {BULK_MAX_ROWS} expenses per request'}), 413
+                if error is None:
+                    values, error = validate_expense(raw, user_id, category_ids, scale)
+                if error is None:
+                    rows.append(values)
+                else:
+                    errors.append({'row': row_number, 'error': error})
+        except ValueError as e:  # undecodable NDJSON body
+            return jsonify({'error': str(e)}), 400
+        
+        if errors and not partial:
+            return jsonify({'error': 'Validation failed', 'inserted': 0, 'errors': errors}), 400
+        if not rows:
+            return jsonify({'error': 'No valid expenses to insert', 'inserted': 0, 'errors': errors}), 400
+        
+        inserted = insert_expenses(db.session, Expense.__table__, rows, BULK_INSERT_CHUNK_SIZE)
+        apply_spend_totals(user_id, spend_totals(rows))
+        bump_data_version(user_id)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Expenses added successfully',
+            'inserted': inserted,
+            'errors': errors
+        }), 201
+        
+    except Exception as e:
+        logger.error('Error adding expenses in bulk: %s', e)
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# ===================== CSV IMPORT =====================
+
+def category_ids_by_name(user_id):
+    """Lower-cased category name -> id; the user's own categories win over global ones"""
+    rows = db.session.query(
+        ExpenseCategory.expense_category_id,
+        ExpenseCategory.expense_category_name,
+        ExpenseCategory.user_id
+    ).filter(
+        db.or_(ExpenseCategory.user_id.is_(None), ExpenseCategory.user_id == user_id),
+        ExpenseCategory.is_deleted == False
+    ).all()
+    names = {}
+    for row in sorted(rows, key=lambda row: row.user_id is not None):
+        names[row.expense_category_name.lower()] = row.expense_category_id
+    return names
+
+def import_expenses_csv(user_id, lines, partial=False, default_category='Other', progress=None, **options):
+    """Stream a CSV statement into the user's expenses in one transaction.
+
+    Chunks are inserted as they fill, together with their rollup deltas.
+    Commits when every row was valid (or `partial` is set) and at least one
+    row was inserted; otherwise rolls back. Returns (ImportStats, committed).
+    """
+    def write_batch(chunk):
+        insert_expenses(db.session, Expense.__table__, chunk, len(chunk))
+        apply_spend_totals(user_id, spend_totals(chunk))
+    
+    names = category_ids_by_name(user_id)
+    default_category_id = names.get(default_category.lower()) if default_category else None
+    stats = import_csv(
+        lines, user_id, names, write_batch,
+        scale=money_scale(user_id),
+        default_category_id=default_category_id,
+        chunk_size=BULK_INSERT_CHUNK_SIZE,
+        progress=progress,
+        **options
+    )
+    if stats.inserted and (partial or not stats.error_count):
+        bump_data_version(user_id)
+        db.session.commit()
+        return stats, True
+    db.session.rollback()
+    return stats, False
+
+@app.route('/api/expenses/import', methods=['POST'])
+def import_expenses():
+    """Import a bank statement CSV.
+
+    Send the file as multipart field "file" or as a text/csv body. Query
+    parameters: date_format (strptime, default %Y-%m-%d), debits_negative,
+    default_category, partial, and <field>_column to name the CSV header for
+    date, amount, name, description or category.
+    """
+    try:
+        user_id = get_current_user_id()
+        
+        if user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        # Werkzeug spools large multipart uploads to disk, and a raw body is
+        # read straight off the socket, so neither is held in memory whole
+        upload = request.files.get('file')
+        if upload is not None:
+            binary = upload.stream
+        elif request.mimetype == 'text/csv':
+            binary = request.stream
+        else:
+            return jsonify({'error': 'Send a CSV file as multipart field "file" or a text/csv body'}), 400
+        lines = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+        
+        columns = {
+            field: request.args[f'{field}_column']
+            for field in DEFAULT_COLUMNS if request.args.get(f'{field}_column')
+        }
+        
+        def log_progress(stats):
+            logger.info('CSV import for user %s: %d rows read, %d inserted, %d errors',
+                        user_id, stats.rows_read, stats.inserted, stats.error_count)
+        
+        stats, committed = import_expenses_csv(
+            user_id, lines,
+            partial=request.args.get('partial', 'false').lower() == 'true',
+            default_category=request.args.get('default_category', 'Other'),
+            progress=log_progress,
+            columns=columns,
+            date_format=request.args.get('date_format', '%Y-%m-%d'),
+            debits_negative=request.args.get('debits_negative', 'false').lower() == 'true'
+        )
+        
+        if not committed:
+            return jsonify({'error': 'Import rejected; nothing was saved', **stats.to_dict(), 'inserted': 0}), 400
+        return jsonify({'message': 'Import completed', **stats.to_dict()}), 201
+        
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error('Error importing expenses: %s', e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -455,72 +1156,140 @@ def get_global_limit():
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        return jsonify({'global_limit': user.global_limit or 0}), 200
+        etag = data_version_etag(user_id, user.data_version or 0)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        return versioned_response(jsonify({
+            'global_limit': to_major(user.global_limit, money_scale(user_id))
+        }), etag), 200
         
     except Exception as e:
-        logger.error(f'Error fetching global limit: {e}')
+        logger.error('Error fetching global limit: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/global_limit', methods=['POST'])
 def set_global_limit():
     """Set user's global spending limit and currency"""
     try:
-        logger.info('=== SET GLOBAL LIMIT START ===')
-        
-        # Log headers
-        auth_header = request.headers.get('Authorization')
-        logger.info(f'Authorization header: {auth_header[:50] if auth_header else "NO AUTH HEADER"}')
-        
         data = request.get_json()
-        logger.info(f'Request data: {data}')
-        
         global_limit = data.get('global_limit')
         currency_id = data.get('currency_id')
-        
-        # Get user ID and log the process
         user_id = get_current_user_id()
-        logger.info(f'Extracted user_id from token: {user_id}')
         
         if user_id is None:
             return jsonify({'error': 'Authentication required'}), 401
         
-        logger.info(f'Setting global limit: {global_limit}, currency_id: {currency_id} for user_id: {user_id}')
-        
         if global_limit is None:
-            logger.error('Global limit is None')
             return jsonify({'error': 'Global limit is required'}), 400
         
         user = User.query.get(user_id)
         if not user:
-            logger.error(f'User not found with id: {user_id}')
+            logger.warning('set_global_limit - User not found with id: %s', user_id)
             return jsonify({'error': f'User not found with id: {user_id}'}), 404
         
-        logger.info(f'Found user: {user.username} (id: {user.user_id})')
-        logger.info(f'Current global_limit: {user.global_limit}, current currency_id: {user.currency_id}')
-        
-        user.global_limit = float(global_limit)
-        
-        # Update currency if provided
+        # Update currency if provided (rescales stored amounts), then the limit in its units
         if currency_id is not None:
-            user.currency_id = int(currency_id)
-            logger.info(f'Updated currency_id to {currency_id} for user {user_id}')
+            try:
+                currency_id = int(currency_id)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Currency id must be an integer'}), 400
+            # Verify currency exists before any amount is rescaled
+            if Currency.query.get(currency_id) is None:
+                return jsonify({'error': 'Invalid currency'}), 400
+            if currency_id != user.currency_id:
+                change_user_currency(user, currency_id)
+        
+        scale = money_scale(user_id)
+        try:
+            user.global_limit = to_minor(global_limit, scale)
+        except ValueError:
+            db.session.rollback()
+            return jsonify({'error': 'Global limit must be a number'}), 400
         
+        bump_data_version(user_id)
         db.session.commit()
-        logger.info(f'✅ Successfully saved global_limit={user.global_limit} and currency_id={user.currency_id} for user {user.username} (id: {user_id})')
+        logger.info('Saved global_limit=%s currency_id=%s for user_id %s',
+                    user.global_limit, user.currency_id, user_id)
         
         return jsonify({
             'message': 'Global limit and currency updated successfully',
-            'global_limit': user.global_limit,
+            'global_limit': to_major(user.global_limit, scale),
             'currency_id': user.currency_id,
             'user_id': user_id,
             'username': user.username
         }), 200
         
     except Exception as e:
-        logger.error(f'Error setting global limit: {e}')
+        logger.error('Error setting global limit: %s', e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def monthly_limits_for_year(user_id, year, scale):
+    """All twelve monthly limits of a year in major units, 0 where none is set"""
+    limit_rows = db.session.query(
+        MonthlyLimit.month_id,
+        MonthlyLimit.monthly_limit_amount
+    ).join(
+        Year, Year.year_id == MonthlyLimit.year_id
+    ).filter(
+        MonthlyLimit.user_id == user_id,
+        Year.year_number == year
+    ).all()
+    monthly_limits = {month: 0 for month in range(1, 13)}
+    for month_id, amount in limit_rows:
+        monthly_limits[month_id] = to_major(amount, scale)
+    return monthly_limits
+
+# Years limits can be set for; year rows are shared reference data, so clients can't add arbitrary ones
+LIMIT_MIN_YEAR = 2000
+LIMIT_MAX_YEARS_AHEAD = env_int('LIMIT_MAX_YEARS_AHEAD', 5)
+
+def parse_limit_year(value):
+    """The year as an int when it is a whole number in the allowed range, else None"""
+    if isinstance(value, bool):
+        return None
+    try:
+        year = int(value)
+    except (TypeError, ValueError):
+        return None
+    if not LIMIT_MIN_YEAR <= year <= datetime.now().year + LIMIT_MAX_YEARS_AHEAD:
+        return None
+    return year
+
+def year_id_for(year, create=False):
+    """year_id of a year number, inserting the year row first when `create` is set"""
+    year_id = reference_cache.get().year_ids.get(year)
+    if year_id is not None:
+        return year_id
+    if create:
+        db.session.execute(
+            dialect_insert(Year).values(year_number=year).on_conflict_do_nothing(index_elements=['year_number'])
+        )
+        db.session.info['reference_data_changed'] = True
+    return db.session.query(Year.year_id).filter(Year.year_number == year).scalar()
+
+def save_monthly_limits(user_id, year_id, limits):
+    """Upsert {month: minor units} in one statement; months set to 0 are cleared.
+    Call inside the write's transaction."""
+    upserts = [
+        {'user_id': user_id, 'year_id': year_id, 'month_id': month, 'monthly_limit_amount': amount}
+        for month, amount in limits.items() if amount > 0
+    ]
+    cleared = [month for month, amount in limits.items() if amount <= 0]
+    if upserts:
+        insert = dialect_insert(MonthlyLimit).values(upserts)
+        db.session.execute(insert.on_conflict_do_update(
+            index_elements=['user_id', 'year_id', 'month_id'],
+            set_={'monthly_limit_amount': insert.excluded.monthly_limit_amount}
+        ))
+    if cleared:
+        MonthlyLimit.query.filter(
+            MonthlyLimit.user_id == user_id,
+            MonthlyLimit.year_id == year_id,
+            MonthlyLimit.month_id.in_(cleared)
+        ).delete(synchronize_session=False)
+
 @app.route('/api/limit', methods=['GET'])
 def get_monthly_limit():
     """Get monthly spending limit"""
@@ -535,10 +1304,14 @@ def get_monthly_limit():
         if not year or not month:
             return jsonify({'error': 'Year and month are required'}), 400
         
+        etag = data_version_etag(user_id, get_data_version(user_id))
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
         # Get or create year
         year_obj = Year.query.filter_by(year_number=year).first()
         if not year_obj:
-            return jsonify({'limit': 0}), 200
+            return versioned_response(jsonify({'limit': 0}), etag), 200
         
         # Get monthly limit
         monthly_limit = MonthlyLimit.query.filter_by(
@@ -547,12 +1320,12 @@ def get_monthly_limit():
             year_id=year_obj.year_id
         ).first()
         
-        return jsonify({
-            'limit': monthly_limit.monthly_limit_amount if monthly_limit else 0
-        }), 200
+        return versioned_response(jsonify({
+            'limit': to_major(monthly_limit.monthly_limit_amount, money_scale(user_id)) if monthly_limit else 0
+        }), etag), 200
         
     except Exception as e:
-        logger.error(f'Error fetching monthly limit: {e}')
+        logger.error('Error fetching monthly limit: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/limit', methods=['POST'])
@@ -571,38 +1344,27 @@ def set_monthly_limit():
         if not all([year, month]) or limit is None:
             return jsonify({'error': 'Year, month, and limit are required'}), 400
         
-        # Get or create year
-        year_obj = Year.query.filter_by(year_number=year).first()
-        if not year_obj:
-            year_obj = Year(year_number=year)
-            db.session.add(year_obj)
-            db.session.flush()
-        
-        # Check if monthly limit exists
-        monthly_limit = MonthlyLimit.query.filter_by(
-            user_id=user_id,
-            month_id=month,
-            year_id=year_obj.year_id
-        ).first()
+        year = parse_limit_year(year)
+        if year is None:
+            return jsonify({'error': f'Year must be between {LIMIT_MIN_YEAR} and '
+                                     f'{datetime.now().year + LIMIT_MAX_YEARS_AHEAD}'}), 400
         
-        if monthly_limit:
-            # Update existing limit
-            if limit == 0:
-                # Delete if setting to 0
-                db.session.delete(monthly_limit)
-            else:
-                monthly_limit.monthly_limit_amount = float(limit)
-        else:
-            # Create new limit if not 0
-            if limit > 0:
-                monthly_limit = MonthlyLimit(
-                    user_id=user_id,
-                    monthly_limit_amount=float(limit),
-                    month_id=month,
-                    year_id=year_obj.year_id
-                )
-                db.session.add(monthly_limit)
+        try:
+            limit_minor = to_minor(limit, money_scale(user_id))
+        except ValueError:
+            return jsonify({'error': 'Limit must be a number'}), 400
+        if limit_minor < 0:
+            return jsonify({'error': 'Limit must not be negative'}), 400
         
+        try:
+            month = int(month)
+        except (TypeError, ValueError):
+            month = None
+        if month is None or not 1 <= month <= 12:
+            return jsonify({'error': 'Month must be between 1 and 12'}), 400
+        
+        save_monthly_limits(user_id, year_id_for(year, create=True), {month: limit_minor})
+        bump_data_version(user_id)
         db.session.commit()
         
         return jsonify({
@@ -611,49 +1373,190 @@ def set_monthly_limit():
         }), 200
         
     except Exception as e:
-        logger.error(f'Error setting monthly limit: {e}')
+        logger.error('Error setting monthly limit: %s', e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/limits', methods=['GET'])
+def get_monthly_limits():
+    """Get all twelve monthly limits of a year"""
+    try:
+        year = request.args.get('year', type=int)
+        user_id = get_current_user_id()
+        
+        if user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if not year:
+            return jsonify({'error': 'Year is required'}), 400
+        
+        user_row = db.session.query(
+            User.data_version,
+            Currency.minor_unit_digits
+        ).outerjoin(
+            Currency, Currency.currency_id == User.currency_id
+        ).filter(User.user_id == user_id).first()
+        
+        if not user_row:
+            return jsonify({'error': 'User not found'}), 404
+        
+        etag = data_version_etag(user_id, user_row.data_version or 0)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        return versioned_response(jsonify({
+            'year': year,
+            'limits': monthly_limits_for_year(user_id, year, scale_for(user_row.minor_unit_digits))
+        }), etag), 200
+        
+    except Exception as e:
+        logger.error('Error fetching monthly limits: %s', e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/limits', methods=['PUT'])
+def set_monthly_limits():
+    """Set several monthly limits of a year at once.
+    
+    Body: {"limits": {"1": 500, "2": 0, ...}}; the year comes from ?year= or
+    the body. Months left out are unchanged, a limit of 0 clears the month.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        year = request.args.get('year', type=int) or data.get('year')
+        limits = data.get('limits')
+        user_id = get_current_user_id()
+        
+        if user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if not year or not isinstance(limits, dict) or not limits:
+            return jsonify({'error': 'Year and limits are required'}), 400
+        
+        year = parse_limit_year(year)
+        if year is None:
+            return jsonify({'error': f'Year must be between {LIMIT_MIN_YEAR} and '
+                                     f'{datetime.now().year + LIMIT_MAX_YEARS_AHEAD}'}), 400
+        
+        scale = money_scale(user_id)
+        limits_minor = {}
+        for key, limit in limits.items():
+            try:
+                month = int(key)
+            except (TypeError, ValueError):
+                month = None
+            if month is None or not 1 <= month <= 12:
+                return jsonify({'error': f'Invalid month {key!r}'}), 400
+            try:
+                limits_minor[month] = to_minor(limit or 0, scale)
+            except ValueError:
+                return jsonify({'error': f'Limit for month {month} must be a number'}), 400
+            if limits_minor[month] < 0:
+                return jsonify({'error': f'Limit for month {month} must not be negative'}), 400
+        
+        save_monthly_limits(user_id, year_id_for(year, create=True), limits_minor)
+        bump_data_version(user_id)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Monthly limits updated successfully',
+            'year': year,
+            'limits': monthly_limits_for_year(user_id, year, scale)
+        }), 200
+        
+    except Exception as e:
+        logger.error('Error setting monthly limits: %s', e)
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# ===================== DASHBOARD ENDPOINTS =====================
+
+@app.route('/api/year_bundle', methods=['GET'])
+def get_year_bundle():
+    """Get everything the dashboard needs for one year in a single response"""
+    try:
+        year = request.args.get('year', type=int)
+        user_id = get_current_user_id()
+        
+        if user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if not year:
+            return jsonify({'error': 'Year is required'}), 400
+        
+        # User settings and currency in one query
+        user_row = db.session.query(
+            User.data_version,
+            User.global_limit,
+            Currency.currency_id,
+            Currency.currency_name,
+            Currency.currency_symbol,
+            Currency.minor_unit_digits
+        ).outerjoin(
+            Currency, Currency.currency_id == User.currency_id
+        ).filter(User.user_id == user_id).first()
+        
+        if not user_row:
+            return jsonify({'error': 'User not found'}), 404
+        scale = scale_for(user_row.minor_unit_digits)
+        
+        # The bundle embeds global categories, so their version is part of the ETag
+        version = f'{user_row.data_version or 0}.{reference_cache.get().etag}'
+        etag = data_version_etag(user_id, version)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        # All expenses of the year, grouped by month in Python
+        start_date = datetime(year, 1, 1).date()
+        end_date = datetime(year + 1, 1, 1).date()
+        expenses_by_month = {month: [] for month in range(1, 13)}
+        rows, _ = query_expense_page(user_id, ALL_EXPENSE_FIELDS, scale, None, None, start_date, end_date)
+        for row in rows:
+            expenses_by_month[row._cursor_date.month].append(project_expense_row(row, ALL_EXPENSE_FIELDS))
+        
+        monthly_limits = monthly_limits_for_year(user_id, year, scale)
+        
+        # Spend per month for limit-vs-spend checks, from the rollup
+        spend_rows = db.session.query(
+            MonthlySpendRollup.month,
+            db.func.sum(MonthlySpendRollup.total)
+        ).filter(
+            MonthlySpendRollup.user_id == user_id,
+            MonthlySpendRollup.year == year
+        ).group_by(MonthlySpendRollup.month).all()
+        monthly_spend = {month: 0 for month in range(1, 13)}
+        for month_id, total in spend_rows:
+            monthly_spend[month_id] = to_major(total, scale)
+        
+        return versioned_response(jsonify({
+            'year': year,
+            'expenses': expenses_by_month,
+            'monthly_limits': monthly_limits,
+            'monthly_spend': monthly_spend,
+            'categories': categories_for_user(user_id),
+            'global_limit': to_major(user_row.global_limit, scale),
+            'currency': {
+                'currency_id': user_row.currency_id,
+                'currency_name': user_row.currency_name,
+                'currency_symbol': user_row.currency_symbol
+            } if user_row.currency_id else None
+        }), etag), 200
+        
+    except Exception as e:
+        logger.error('Error fetching year bundle: %s', e)
+        return jsonify({'error': str(e)}), 500
+
 # ===================== CURRENCY ENDPOINTS =====================
 
 @app.route('/api/currencies', methods=['GET'])
 def get_currencies():
     """Get all available currencies"""
     try:
-        currencies = Currency.query.all()
-        
-        if not currencies:
-            # Add default currencies
-            default_currencies = [
-                {'currency_id': 1, 'currency_name': 'US Dollar', 'currency_symbol': '$'},
-                {'currency_id': 2, 'currency_name': 'Euro', 'currency_symbol': '€'},
-                {'currency_id': 3, 'currency_name': 'British Pound', 'currency_symbol': '£'},
-                {'currency_id': 4, 'currency_name': 'Indian Rupee', 'currency_symbol': '₹'},
-                {'currency_id': 5, 'currency_name': 'Japanese Yen', 'currency_symbol': '¥'},
-            ]
-            
-            for curr in default_currencies:
-                currency = Currency(**curr)
-                db.session.add(currency)
-            
-            db.session.commit()
-            currencies = Currency.query.all()
-        
-        currencies_data = [
-            {
-                'currency_id': curr.currency_id,
-                'currency_name': curr.currency_name,
-                'currency_symbol': curr.currency_symbol
-            }
-            for curr in currencies
-        ]
-        
-        return jsonify({'currencies': currencies_data}), 200
+        data = reference_cache.get()
+        payload = data.currencies_payload
+        return cached_json_response(payload.body, payload.etag)
         
     except Exception as e:
-        logger.error(f'Error fetching currencies: {e}')
-        db.session.rollback()
+        logger.error('Error fetching currencies: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/user/currency', methods=['POST'])
@@ -688,7 +1591,8 @@ def update_user_currency():
         if not currency:
             return jsonify({'error': 'Invalid currency'}), 400
         
-        user.currency_id = currency_id
+        change_user_currency(user, currency.currency_id)
+        bump_data_version(user_id)
         db.session.commit()
         
         return jsonify({
@@ -701,7 +1605,7 @@ def update_user_currency():
         }), 200
         
     except Exception as e:
-        logger.error(f'Error updating currency: {e}')
+        logger.error('Error updating currency: %s', e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -716,46 +1620,13 @@ def get_categories():
         if user_id is None:
             return jsonify({'error': 'Authentication required'}), 401
         
-        # Get both global and user-specific categories
-        categories = ExpenseCategory.query.filter(
-            db.or_(
-                ExpenseCategory.user_id == None,
-                ExpenseCategory.user_id == user_id
-            ),
-            ExpenseCategory.is_deleted == False
-        ).order_by(ExpenseCategory.expense_category_name).all()
-        
-        if not categories:
-            # Create default categories
-            default_categories = [
-                'Food & Dining', 'Transportation', 'Shopping', 'Entertainment',
-                'Bills & Utilities', 'Healthcare', 'Travel', 'Education', 'Other'
-            ]
-            
-            for cat_name in default_categories:
-                category = ExpenseCategory(
-                    expense_category_name=cat_name,
-                    user_id=None,
-                    is_deleted=False
-                )
-                db.session.add(category)
-            
-            db.session.commit()
-            categories = ExpenseCategory.query.filter_by(is_deleted=False).all()
+        # Global categories come from the reference cache
+        categories = categories_for_user(user_id)
         
-        categories_data = [
-            {
-                'category_id': cat.expense_category_id,
-                'category_name': cat.expense_category_name,
-                'is_global': cat.user_id is None
-            }
-            for cat in categories
-        ]
-        
-        return jsonify({'categories': categories_data}), 200
+        return cached_json_response(app.json.dumps({'categories': categories}))
         
     except Exception as e:
-        logger.error(f'Error fetching categories: {e}')
+        logger.error('Error fetching categories: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/categories', methods=['POST'])
@@ -790,6 +1661,7 @@ def add_category():
         )
         
         db.session.add(new_category)
+        bump_data_version(user_id)
         db.session.commit()
         
         return jsonify({
@@ -802,7 +1674,7 @@ def add_category():
         }), 201
         
     except Exception as e:
-        logger.error(f'Error adding category: {e}')
+        logger.error('Error adding category: %s', e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -831,12 +1703,13 @@ def delete_category():
         
         # Soft delete
         category.is_deleted = True
+        bump_data_version(user_id)
         db.session.commit()
         
         return jsonify({'message': 'Category deleted successfully'}), 200
         
     except Exception as e:
-        logger.error(f'Error deleting category: {e}')
+        logger.error('Error deleting category: %s', e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -846,34 +1719,12 @@ def delete_category():
 def get_months():
     """Get all months"""
     try:
-        months = Month.query.order_by(Month.month_id).all()
-        
-        if not months:
-            month_names = [
-                "January", "February", "March", "April", "May", "June",
-                "July", "August", "September", "October", "November", "December"
-            ]
-            
-            for i, month_name in enumerate(month_names, 1):
-                month = Month(month_id=i, month_name=month_name)
-                db.session.add(month)
-            
-            db.session.commit()
-            months = Month.query.order_by(Month.month_id).all()
-        
-        months_data = [
-            {
-                'month_id': month.month_id,
-                'month_name': month.month_name
-            }
-            for month in months
-        ]
-        
-        return jsonify({'months': months_data}), 200
+        data = reference_cache.get()
+        payload = data.months_payload
+        return cached_json_response(payload.body, payload.etag)
         
     except Exception as e:
-        logger.error(f'Error fetching months: {e}')
-        db.session.rollback()
+        logger.error('Error fetching months: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/test-db', methods=['GET'])
@@ -893,6 +1744,20 @@ def test_db():
             'message': str(e)
         }), 500
 
+@app.route('/api/pool-stats', methods=['GET'])
+def get_pool_stats():
+    """Connection pool occupancy and checkout latency for this worker"""
+    try:
+        return jsonify(pool_status(db.engine)), 200
+    except Exception as e:
+        logger.error('Error fetching pool stats: %s', e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics, aggregated over all workers in multiprocess mode"""
+    return metrics_response()
+
 # ===================== SUMMARY ENDPOINTS (BONUS) =====================
 
 @app.route('/api/summary', methods=['GET'])
@@ -902,76 +1767,242 @@ def get_summary():
         summary_type = request.args.get('type', 'monthly')
         year = request.args.get('year', type=int)
         month = request.args.get('month', type=int)
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
         user_id = get_current_user_id()
         
         if user_id is None:
             return jsonify({'error': 'Authentication required'}), 401
         
+        version = get_data_version(user_id)
+        # Category totals are keyed by global category names, so their version is part of the ETag
+        etag = data_version_etag(user_id, f'{version}.{reference_cache.get().etag}')
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        # Totals are exact integer sums of minor units, converted once at the end
+        scale = money_scale(user_id)
+        
         if summary_type == 'monthly' and year and month:
-            # Get monthly summary
-            start_date = datetime(year, month, 1).date()
-            if month == 12:
-                end_date = datetime(year + 1, 1, 1).date()
-            else:
-                end_date = datetime(year, month + 1, 1).date()
-            
-            expenses = Expense.query.filter(
-                Expense.user_id == user_id,
-                Expense.expenditure_date >= start_date,
-                Expense.expenditure_date < end_date
-            ).all()
+            # Category breakdown from the rollup (one row per category); the
+            # month total and count are derived from the grouped rows
+            rows = db.session.query(
+                ExpenseCategory.expense_category_name,
+                db.func.sum(MonthlySpendRollup.total),
+                db.func.sum(MonthlySpendRollup.count)
+            ).select_from(MonthlySpendRollup).outerjoin(
+                ExpenseCategory,
+                ExpenseCategory.expense_category_id == MonthlySpendRollup.category_id
+            ).filter(
+                MonthlySpendRollup.user_id == user_id,
+                MonthlySpendRollup.year == year,
+                MonthlySpendRollup.month == month
+            ).group_by(ExpenseCategory.expense_category_name).all()
             
-            total = sum(e.expense_item_price * e.expense_item_count for e in expenses)
-            
-            # Get category breakdown
             category_totals = {}
-            for expense in expenses:
-                category = ExpenseCategory.query.get(expense.expense_category_id)
-                cat_name = category.expense_category_name if category else 'Unknown'
-                if cat_name not in category_totals:
-                    category_totals[cat_name] = 0
-                category_totals[cat_name] += expense.expense_item_price * expense.expense_item_count
+            total = 0
+            expense_count = 0
+            for cat_name, cat_total, cat_count in rows:
+                category_totals[cat_name or 'Unknown'] = to_major(cat_total, scale)
+                total += int(cat_total or 0)
+                expense_count += cat_count
             
-            return jsonify({
+            return versioned_response(jsonify({
                 'type': 'monthly',
                 'year': year,
                 'month': month,
-                'total_expenses': total,
-                'expense_count': len(expenses),
+                'total_expenses': to_major(total, scale),
+                'expense_count': expense_count,
                 'categories': category_totals
-            }), 200
+            }), etag), 200
             
         elif summary_type == 'yearly' and year:
-            # Get yearly summary
-            start_date = datetime(year, 1, 1).date()
-            end_date = datetime(year + 1, 1, 1).date()
-            
-            expenses = Expense.query.filter(
-                Expense.user_id == user_id,
-                Expense.expenditure_date >= start_date,
-                Expense.expenditure_date < end_date
-            ).all()
+            # Monthly breakdown from the rollup: at most 12 x categories rows
+            rows = db.session.query(
+                MonthlySpendRollup.month,
+                db.func.sum(MonthlySpendRollup.total),
+                db.func.sum(MonthlySpendRollup.count)
+            ).filter(
+                MonthlySpendRollup.user_id == user_id,
+                MonthlySpendRollup.year == year
+            ).group_by(MonthlySpendRollup.month).all()
             
-            total = sum(e.expense_item_price * e.expense_item_count for e in expenses)
-            
-            # Get monthly breakdown
             monthly_totals = {month: 0 for month in range(1, 13)}
-            for expense in expenses:
-                month = expense.expenditure_date.month
-                monthly_totals[month] += expense.expense_item_price * expense.expense_item_count
+            total = 0
+            expense_count = 0
+            for row_month, month_total, month_count in rows:
+                monthly_totals[int(row_month)] = to_major(month_total, scale)
+                total += int(month_total or 0)
+                expense_count += month_count
             
-            return jsonify({
+            return versioned_response(jsonify({
                 'type': 'yearly',
                 'year': year,
-                'total_expenses': total,
-                'expense_count': len(expenses),
+                'total_expenses': to_major(total, scale),
+                'expense_count': expense_count,
                 'monthly_breakdown': monthly_totals
-            }), 200
+            }), etag), 200
+            
+        elif summary_type == 'custom' and start_date and end_date:
+            try:
+                start = datetime.strptime(start_date, '%Y-%m-%d').date()
+                end = datetime.strptime(end_date, '%Y-%m-%d').date()
+            except ValueError:
+                return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD'}), 400
+            if start > end:
+                return jsonify({'error': 'start_date must not be after end_date'}), 400
+            
+            # Range totals are two prefix-sum lookups per category, however
+            # long the range; the index is rebuilt only when data_version moves
+            index = spend_index_cache.get(
+                user_id, version, lambda: load_daily_spend(user_id),
+                current_version=lambda: get_data_version(user_id)
+            )
+            total, expense_count, by_category = index.range_summary(start, end)
+            
+            minor_totals = {}
+            for category_id, (cat_total, _) in by_category.items():
+                cat_name = index.category_names.get(category_id) or 'Unknown'
+                minor_totals[cat_name] = minor_totals.get(cat_name, 0) + cat_total
+            category_totals = {name: to_major(amount, scale) for name, amount in minor_totals.items()}
+            
+            return versioned_response(jsonify({
+                'type': 'custom',
+                'start_date': start.isoformat(),
+                'end_date': end.isoformat(),
+                'total_expenses': to_major(total, scale),
+                'expense_count': expense_count,
+                'categories': category_totals
+            }), etag), 200
         
         return jsonify({'error': 'Invalid summary type or missing parameters'}), 400
         
     except Exception as e:
-        logger.error(f'Error getting summary: {e}')
+        logger.error('Error getting summary: %s', e)
+        return jsonify({'error': str(e)}), 500
+
+# ===================== STATEMENT ENDPOINTS =====================
+
+statement_renderer = StatementRenderer(
+    cache_dir=os.getenv('STATEMENT_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'expense-statements'),
+    max_workers=env_int('STATEMENT_WORKERS', 2),
+    render_timeout=env_int('STATEMENT_RENDER_TIMEOUT', 300)
+)
+
+def build_statement(user_id, year, month=None):
+    """Gather the numbers for a monthly (month given) or yearly statement"""
+    user_row = db.session.query(
+        User.name,
+        User.username,
+        User.global_limit,
+        Currency.currency_name,
+        Currency.currency_symbol,
+        Currency.minor_unit_digits
+    ).outerjoin(
+        Currency, Currency.currency_id == User.currency_id
+    ).filter(User.user_id == user_id).first()
+    digits = user_row.minor_unit_digits if user_row else None
+    scale = scale_for(digits)
+    
+    rollup_filters = [MonthlySpendRollup.user_id == user_id, MonthlySpendRollup.year == year]
+    if month:
+        rollup_filters.append(MonthlySpendRollup.month == month)
+    
+    category_rows = db.session.query(
+        ExpenseCategory.expense_category_name,
+        db.func.sum(MonthlySpendRollup.total),
+        db.func.sum(MonthlySpendRollup.count)
+    ).select_from(MonthlySpendRollup).outerjoin(
+        ExpenseCategory,
+        ExpenseCategory.expense_category_id == MonthlySpendRollup.category_id
+    ).filter(*rollup_filters).group_by(ExpenseCategory.expense_category_name).all()
+    categories = sorted(
+        ((name or 'Unknown', int(total or 0), int(count or 0)) for name, total, count in category_rows),
+        key=lambda category: -category[1]
+    )
+    
+    spend_rows = db.session.query(
+        MonthlySpendRollup.month,
+        db.func.sum(MonthlySpendRollup.total)
+    ).filter(*rollup_filters).group_by(MonthlySpendRollup.month).all()
+    monthly_spend = {int(row_month): int(total or 0) for row_month, total in spend_rows}
+    
+    limit_query = db.session.query(
+        MonthlyLimit.month_id,
+        MonthlyLimit.monthly_limit_amount
+    ).join(
+        Year, Year.year_id == MonthlyLimit.year_id
+    ).filter(MonthlyLimit.user_id == user_id, Year.year_number == year)
+    if month:
+        limit_query = limit_query.filter(MonthlyLimit.month_id == month)
+    monthly_limits = dict(limit_query.all())
+    
+    # Sums stay in integer minor units; the statement carries major units
+    total = sum(category[1] for category in categories)
+    months = [month] if month else range(1, 13)
+    limits = [
+        (f'{calendar.month_name[m]} {year}', monthly_limits.get(m, 0), monthly_spend.get(m, 0))
+        for m in months
+    ]
+    if not month:
+        limits.append((f'Year {year} (global limit)', (user_row.global_limit or 0) if user_row else 0, total))
+    
+    period = f'{calendar.month_name[month]} {year}' if month else str(year)
+    return {
+        'title': f'{"Monthly" if month else "Yearly"} statement: {period}',
+        'subtitle': (user_row.name or user_row.username) if user_row else '',
+        'currency_name': user_row.currency_name if user_row else None,
+        'currency_symbol': user_row.currency_symbol if user_row else None,
+        'minor_unit_digits': DEFAULT_MINOR_UNIT_DIGITS if digits is None else digits,
+        'total': to_major(total, scale),
+        'count': sum(category[2] for category in categories),
+        'categories': [(name, to_major(amount, scale), count) for name, amount, count in categories],
+        'limits': [(label, to_major(limit, scale), to_major(spend, scale)) for label, limit, spend in limits]
+    }
+
+@app.route('/api/statements', methods=['GET'])
+def get_statement():
+    """Download a PDF statement (type=monthly&year=&month= or type=yearly&year=).
+
+    The first request for a period and data version queues a render and
+    answers 202; poll the same URL until it returns the PDF.
+    """
+    try:
+        statement_type = request.args.get('type', 'monthly')
+        year = request.args.get('year', type=int)
+        month = request.args.get('month', type=int)
+        user_id = get_current_user_id()
+        
+        if user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if statement_type == 'monthly' and year and month and 1 <= month <= 12:
+            period = f'{year}-{month:02d}'
+        elif statement_type == 'yearly' and year:
+            period, month = str(year), None
+        else:
+            return jsonify({'error': 'Invalid statement type or missing parameters'}), 400
+        
+        path = statement_renderer.path_for(user_id, period, get_data_version(user_id))
+        if os.path.exists(path):
+            response = send_file(path, mimetype='application/pdf', as_attachment=True,
+                                 download_name=f'statement-{period}.pdf', conditional=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        
+        error = statement_renderer.pop_failure(path)
+        if error:
+            return jsonify({'error': f'Statement rendering failed: {error}'}), 500
+        
+        if not statement_renderer.is_pending(path):
+            statement_renderer.submit(path, build_statement(user_id, year, month))
+        
+        response = jsonify({'status': 'rendering'})
+        response.headers['Retry-After'] = '1'
+        return response, 202
+        
+    except Exception as e:
+        logger.error('Error generating statement: %s', e)
         return jsonify({'error': str(e)}), 500
 
 # ===================== CORS AND ERROR HANDLERS =====================
@@ -995,97 +2026,26 @@ def internal_error(error):
 
 # ===================== APP INITIALIZATION =====================
 
+# ===================== BOOTSTRAP =====================
+
+def bootstrap_database():
+    """Create missing tables and seed the reference data; safe to run repeatedly"""
+    db.create_all()
+    with db.engine.begin() as connection:
+        inserted = seed_reference_data(connection, db.metadata)
+    reference_cache.invalidate()
+    return inserted
+
 if __name__ == '__main__':
     with app.app_context():
         try:
-            logger.info('Creating database tables if they do not exist...')
-            db.create_all()
-            logger.info('Database tables created successfully')
-            
-            # Initialize currencies if not present
-            currency_count = Currency.query.count()
-            if currency_count == 0:
-                logger.info('Adding currencies...')
-                currencies = [
-                    Currency(currency_id=1, currency_name="USD", currency_symbol="$"),
-                    Currency(currency_id=2, currency_name="EUR", currency_symbol="€"),
-                    Currency(currency_id=3, currency_name="GBP", currency_symbol="£"),
-                    Currency(currency_id=4, currency_name="JPY", currency_symbol="¥"),
-                    Currency(currency_id=5, currency_name="CAD", currency_symbol="C$"),
-                    Currency(currency_id=6, currency_name="AUD", currency_symbol="A$"),
-                    Currency(currency_id=7, currency_name="CHF", currency_symbol="Fr"),
-                    Currency(currency_id=8, currency_name="CNY", currency_symbol="¥"),
-                    Currency(currency_id=9, currency_name="INR", currency_symbol="₹"),
-                    Currency(currency_id=10, currency_name="MXN", currency_symbol="$"),
-                ]
-                db.session.add_all(currencies)
-                db.session.commit()
-                logger.info(f'Added {len(currencies)} currencies')
-            
-            # Initialize months if not present
-            month_count = Month.query.count()
-            if month_count == 0:
-                logger.info('Adding months...')
-                months = [
-                    Month(month_id=1, month_name="January"),
-                    Month(month_id=2, month_name="February"),
-                    Month(month_id=3, month_name="March"),
-                    Month(month_id=4, month_name="April"),
-                    Month(month_id=5, month_name="May"),
-                    Month(month_id=6, month_name="June"),
-                    Month(month_id=7, month_name="July"),
-                    Month(month_id=8, month_name="August"),
-                    Month(month_id=9, month_name="September"),
-                    Month(month_id=10, month_name="October"),
-                    Month(month_id=11, month_name="November"),
-                    Month(month_id=12, month_name="December"),
-                ]
-                db.session.add_all(months)
-                db.session.commit()
-                logger.info(f'Added {len(months)} months')
-            
-            # Initialize years if not present
-            year_count = Year.query.count()
-            if year_count == 0:
-                logger.info('Adding years...')
-                years = [
-                    Year(year_id=1, year_number=2024),
-                    Year(year_id=2, year_number=2025),
-                    Year(year_id=3, year_number=2026),
-                ]
-                db.session.add_all(years)
-                db.session.commit()
-                logger.info(f'Added {len(years)} years')
-            
-            # Initialize default categories if not present
-            category_count = ExpenseCategory.query.filter_by(user_id=None).count()
-            if category_count == 0:
-                logger.info('Adding default expense categories...')
-                categories = [
-                    ExpenseCategory(expense_category_name="Food & Dining", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Transportation", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Shopping", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Entertainment", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Bills & Utilities", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Healthcare", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Education", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Travel", user_id=None, is_deleted=False),
-                    ExpenseCategory(expense_category_name="Other", user_id=None, is_deleted=False),
-                ]
-                db.session.add_all(categories)
-                db.session.commit()
-                logger.info(f'Added {len(categories)} default categories')
-            
-            # No default user - users must sign up
-            user_count = User.query.count()
-            if user_count == 0:
-                logger.info('No users found - users will be created through signup')
-            else:
-                logger.info(f'Found {user_count} existing users')
-            
+            logger.info('Bootstrapping database...')
+            inserted = bootstrap_database()
+            logger.info('Database ready (seeded rows: %s)', inserted)
         except Exception as e:
-            logger.error(f'Error initializing database: {e}')
+            logger.error('Error initializing database: %s', e)
     
+    # Werkzeug development server; production runs under gunicorn (see gunicorn.conf.py)
     port = int(os.getenv('PORT', 5002))
     host = os.getenv('HOST', '0.0.0.0')
-    app.run(host=host, port=port, debug=True)
\ No newline at end of file
+    app.run(host=host, port=port, debug=env_bool('FLASK_DEBUG', False), threaded=True)
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Idempotent seeding of the reference tables.
+
+Run once per deployment (create_tables.py, the gunicorn master, or the
+development server's __main__) rather than from request handlers. Every
+row is written with INSERT ... ON CONFLICT DO NOTHING against a unique
+key, so rerunning the bootstrap, or two processes running it at once,
+never duplicates a row or overwrites an edited one.
+
+Works on any MetaData that defines the tables (the Flask-SQLAlchemy models
+or models.py), looked up by table name.
+"""
+
+from datetime import date
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from money import minor_unit_digits
+
+# Ids match what create_tables.py, GET /api/currencies and the frontend's
+# fallback list have always used, so existing users keep their currency
+CURRENCIES = [
+    (1, 'US Dollar', '$'),
+    (2, 'Euro', '€'),
+    (3, 'British Pound', '£'),
+    (4, 'Indian Rupee', '₹'),
+    (5, 'Japanese Yen', '¥'),
+    (6, 'Canadian Dollar', 'C$'),
+    (7, 'Australian Dollar', 'A$'),
+    (8, 'Swiss Franc', 'Fr'),
+    (9, 'Chinese Yuan', '¥'),
+    (10, 'Mexican Peso', '$'),
+]
+
+MONTH_NAMES = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+DEFAULT_CATEGORIES = [
+    'Food & Dining', 'Transportation', 'Shopping', 'Entertainment',
+    'Bills & Utilities', 'Healthcare', 'Education', 'Travel', 'Other'
+]
+
+FIRST_YEAR = 2024
+
+
+def insert_ignoring_conflicts(connection, table, rows, index_elements, index_where=None):
+    """INSERT rows, skipping any that hit the unique key; returns the number inserted"""
+    dialect = postgresql if connection.dialect.name == 'postgresql' else sqlite
+    statement = dialect.insert(table).on_conflict_do_nothing(
+        index_elements=index_elements, index_where=index_where
+    )
+    return connection.execute(statement, rows).rowcount
+
+
+def seed_reference_data(connection, metadata, today=None):
+    """Insert missing currencies, months, years and global categories.
+
+    Returns {table name: rows inserted}. Runs in the caller's transaction.
+    """
+    tables = metadata.tables
+    last_year = (today or date.today()).year + 1
+    category_table = tables['expense_category']
+
+    return {
+        'currency': insert_ignoring_conflicts(connection, tables['currency'], [
+            {
+                'currency_id': currency_id,
+                'currency_name': name,
+                'currency_symbol': symbol,
+                'minor_unit_digits': minor_unit_digits(name),
+            }
+            for currency_id, name, symbol in CURRENCIES
+        ], ['currency_id']),
+        'month': insert_ignoring_conflicts(connection, tables['month'], [
+            {'month_id': month_id, 'month_name': name} for month_id, name in enumerate(MONTH_NAMES, 1)
+        ], ['month_id']),
+        # year_id comes from the sequence, so later on-demand year inserts don't collide with it
+        'year': insert_ignoring_conflicts(connection, tables['year'], [
+            {'year_number': year} for year in range(FIRST_YEAR, last_year + 1)
+        ], ['year_number']),
+        'expense_category': insert_ignoring_conflicts(connection, category_table, [
+            {'expense_category_name': name, 'user_id': None, 'is_deleted': False}
+            for name in DEFAULT_CATEGORIES
+        ], ['expense_category_name'], index_where=category_table.c.user_id.is_(None)),
+    }
@@ -0,0 +1,186 @@
+"""
+Streaming CSV import of bank statements.
+
+The import is a chain of generators, so only one chunk of rows is held in
+memory however large the file is:
+
+    csv rows -> map_columns -> resolve_categories -> validate_rows -> chunks
+
+Every stage passes (line_number, record, error) tuples along; a row that
+fails a stage carries its error to the end, where it is counted instead of
+inserted. Writing a chunk is left to the caller's write_batch callable.
+"""
+
+import csv
+from datetime import datetime
+
+from expense_import import MAX_DESCRIPTION_LENGTH, MAX_NAME_LENGTH, chunked, validate_expense
+
+# Header names tried, case-insensitively, when no explicit column is given
+DEFAULT_COLUMNS = {
+    'date': ['date', 'expenditure_date', 'transaction date', 'posted date', 'posting date', 'value date'],
+    'amount': ['amount', 'expense_item_price', 'debit', 'debit amount', 'value'],
+    'name': ['name', 'expense_name', 'payee', 'merchant', 'description', 'details'],
+    'description': ['expense_description', 'memo', 'notes', 'reference'],
+    'category': ['category', 'category_name', 'expense_category_name'],
+}
+
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportStats:
+    """Running counters for one import; `errors` keeps the first MAX_REPORTED_ERRORS"""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line_number, error):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'error': error})
+
+    def to_dict(self):
+        return {
+            'rows_read': self.rows_read,
+            'inserted': self.inserted,
+            'skipped': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors
+        }
+
+
+def pick_columns(headers, columns=None):
+    """Map expense fields to CSV headers, using explicit `columns` first, then DEFAULT_COLUMNS"""
+    columns = dict(columns or {})
+    by_lower = {header.strip().lower(): header for header in headers or []}
+    used = set(columns.values())
+    for field, candidates in DEFAULT_COLUMNS.items():
+        if field in columns:
+            continue
+        for candidate in candidates:
+            header = by_lower.get(candidate)
+            if header is not None and header not in used:
+                columns[field] = header
+                used.add(header)
+                break
+    return columns
+
+
+def parse_amount(value):
+    """Parse a statement amount such as "1,234.50", "$12" or "(45.00)"."""
+    text = (value or '').strip().replace(',', '').lstrip('$€£₹¥')
+    if text.startswith('(') and text.endswith(')'):
+        text = '-' + text[1:-1]
+    return float(text)
+
+
+def map_columns(records, columns, date_format='%Y-%m-%d', debits_negative=False, stats=None):
+    """Turn CSV rows into the expense dicts validate_expense understands.
+
+    With debits_negative, spending is recorded as negative amounts (the
+    usual bank export): those are flipped to positive and credits are
+    skipped.
+    """
+    for line_number, row, error in records:
+        if error is not None:
+            yield line_number, None, error
+            continue
+        try:
+            amount = parse_amount(row.get(columns['amount']))
+        except ValueError:
+            yield line_number, None, f'Invalid amount {row.get(columns["amount"])!r}'
+            continue
+        if debits_negative:
+            if amount >= 0:
+                if stats is not None:
+                    stats.skipped += 1
+                continue
+            amount = -amount
+        try:
+            expense_date = datetime.strptime((row.get(columns['date']) or '').strip(), date_format).date()
+        except ValueError:
+            yield line_number, None, f'Invalid date {row.get(columns["date"])!r}'
+            continue
+        yield line_number, {
+            'date': expense_date.isoformat(),
+            'amount': amount,
+            'name': (row.get(columns.get('name')) or '').strip()[:MAX_NAME_LENGTH],
+            'description': (row.get(columns.get('description')) or '').strip()[:MAX_DESCRIPTION_LENGTH],
+            'category_name': (row.get(columns.get('category')) or '').strip(),
+        }, None
+
+
+def resolve_categories(records, category_ids_by_name, default_category_id=None):
+    """Swap category names for ids (case-insensitive); unknown or blank names use the default"""
+    for line_number, expense, error in records:
+        if error is not None:
+            yield line_number, None, error
+            continue
+        name = expense.pop('category_name')
+        category_id = category_ids_by_name.get(name.lower()) if name else None
+        if category_id is None:
+            category_id = default_category_id
+        if category_id is None:
+            yield line_number, None, f'Unknown category {name!r}' if name else 'Category is required'
+            continue
+        expense['category_id'] = category_id
+        yield line_number, expense, None
+
+
+def validate_rows(records, user_id, category_ids, scale, stats):
+    """Yield expense column values for valid rows; record errors in stats"""
+    for line_number, expense, error in records:
+        if error is None:
+            values, error = validate_expense(expense, user_id, category_ids, scale)
+        if error is None:
+            yield values
+        else:
+            stats.add_error(line_number, error)
+
+
+def import_csv(lines, user_id, category_ids_by_name, write_batch, columns=None,
+               date_format='%Y-%m-%d', debits_negative=False, default_category_id=None,
+               chunk_size=5000, progress=None, scale=100):
+    """Stream a CSV statement into write_batch(chunk) calls and return ImportStats.
+
+    `lines` is any iterable of text lines (an open file, a TextIOWrapper
+    over an upload). Prices are stored as minor units at `scale`.
+    `progress(stats)` is called after each chunk. Raises
+    ValueError when no date or amount column can be found, or when the file
+    is not parseable CSV (a NUL byte, broken quoting).
+    """
+    stats = ImportStats()
+    reader = csv.DictReader(lines)
+    try:
+        fieldnames = reader.fieldnames
+    except csv.Error as e:
+        raise ValueError(f'Malformed CSV at line {reader.reader.line_num}: {e}') from None
+    columns = pick_columns(fieldnames, columns)
+    missing = [field for field in ('date', 'amount') if field not in columns]
+    if missing:
+        raise ValueError(f'CSV has no {" or ".join(missing)} column')
+
+    def rows():
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                raise ValueError(f'Malformed CSV at line {reader.reader.line_num}: {e}') from None
+            stats.rows_read += 1
+            yield reader.line_num, row, None
+
+    records = map_columns(rows(), columns, date_format, debits_negative, stats)
+    records = resolve_categories(records, category_ids_by_name, default_category_id)
+    valid = validate_rows(records, user_id, set(category_ids_by_name.values()), scale, stats)
+    for chunk in chunked(valid, chunk_size):
+        write_batch(chunk)
+        stats.inserted += len(chunk)
+        if progress is not None:
+            progress(stats)
+    return stats
@@ -0,0 +1,140 @@
+"""
+Database engine configuration shared by the Flask app and db.py.
+
+Pool sizing, recycling, pre-ping and the server-side statement timeout are
+driven by environment variables so each deployment (number of gunicorn
+workers, PgBouncer in front of PostgreSQL, load balancer idle timeouts) can
+be tuned without code changes:
+
+    DB_POOL_SIZE             connections kept open per process (default 5)
+    DB_MAX_OVERFLOW          extra connections allowed under burst (default 10)
+    DB_POOL_TIMEOUT          seconds to wait for a free connection (default 30)
+    DB_POOL_RECYCLE          seconds before a connection is replaced (default 1800)
+    DB_POOL_PRE_PING         test connections on checkout (default true)
+    DB_STATEMENT_TIMEOUT_MS  server-side statement_timeout, 0 = off (default 0)
+    DB_PGBOUNCER             PgBouncer transaction-pooling mode (default false)
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+def env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+
+def env_bool(name, default):
+    value = os.getenv(name)
+    if value in (None, ''):
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class PoolStats:
+    """Process-wide counters for connection pool checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.listeners = []  # callables(seconds); seconds is None for a timeout
+
+    def record_checkout(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            if seconds > self.checkout_seconds_max:
+                self.checkout_seconds_max = seconds
+        for listener in self.listeners:
+            listener(seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+        for listener in self.listeners:
+            listener(None)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'checkout_seconds_total': self.checkout_seconds_total,
+                'checkout_seconds_max': self.checkout_seconds_max,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits (including pre-ping)"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_stats.record_timeout()
+            raise
+        pool_stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def engine_options(database_url):
+    """Keyword arguments for create_engine / SQLALCHEMY_ENGINE_OPTIONS"""
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite':
+        # SQLite uses its own single-connection pools; leave the defaults alone
+        return {}
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': env_int('DB_POOL_SIZE', 5),
+        'max_overflow': env_int('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': env_int('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': env_int('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': env_bool('DB_POOL_PRE_PING', True),
+    }
+
+    connect_args = {}
+    pgbouncer = env_bool('DB_PGBOUNCER', False)
+    statement_timeout = env_int('DB_STATEMENT_TIMEOUT_MS', 0)
+    if statement_timeout and not pgbouncer:
+        # PgBouncer rejects the "options" startup parameter; in that mode set
+        # statement_timeout on the database role instead
+        connect_args['options'] = f'-c statement_timeout={statement_timeout}'
+    if pgbouncer and url.get_driver_name() == 'psycopg':
+        # Server-side prepared statements break under transaction pooling.
+        # psycopg2 never prepares statements, so only psycopg 3 needs this.
+        connect_args['prepare_threshold'] = None
+    if connect_args:
+        options['connect_args'] = connect_args
+
+    return options
+
+
+def pool_status(engine):
+    """Current pool occupancy plus the process-wide checkout counters"""
+    pool = engine.pool
+    status = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        status.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': checked_out,
+            'overflow': pool.overflow(),
+            'saturation': checked_out / capacity if capacity else 0.0,
+        })
+    status.update(pool_stats.snapshot())
+    return status
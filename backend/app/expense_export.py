@@ -0,0 +1,75 @@
+"""
+Streaming serializers for the expense export.
+
+Rows arrive one at a time from a server-side cursor and leave as byte
+chunks of roughly CHUNK_BYTES, optionally gzip-compressed on the fly, so
+an export never holds more than one chunk in memory.
+"""
+
+import csv
+import io
+import zlib
+
+from json_provider import dumps
+
+CHUNK_BYTES = 64 * 1024
+
+# Same names as the expense JSON, which the CSV importer also recognizes
+CSV_COLUMNS = [
+    'expense_id', 'expenditure_date', 'expense_name', 'expense_category_name',
+    'expense_item_price', 'expense_item_count', 'expense_description'
+]
+
+
+def csv_lines(expenses):
+    """Yield the header line then one CSV line per expense dict"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue()
+    for expense in expenses:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(expense)
+        yield buffer.getvalue()
+
+
+def ndjson_lines(expenses):
+    """Yield one JSON document per line, as bytes"""
+    for expense in expenses:
+        yield dumps(expense) + b'\n'
+
+
+def encode_chunks(lines, chunk_bytes=CHUNK_BYTES):
+    """Join text (or already encoded) lines into UTF-8 chunks of about chunk_bytes.
+
+    The first line is sent on its own so the client sees bytes before the
+    first batch of rows has been fetched.
+    """
+    pending = []
+    size = 0
+    first = True
+    for line in lines:
+        data = line if isinstance(line, bytes) else line.encode('utf-8')
+        if first:
+            yield data
+            first = False
+            continue
+        pending.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            yield b''.join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield b''.join(pending)
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress a stream of byte chunks as one gzip member, flushing after each chunk"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,138 @@
+"""
+Validation and batched inserts for bulk expense writes.
+
+Rows are validated in memory against the user's category ids and turned
+into plain column dicts, then written with one executemany INSERT per
+chunk. On psycopg2, SQLAlchemy sends an executemany INSERT as multi-row
+VALUES pages (execute_values), so a chunk costs a handful of round trips
+instead of one per row.
+"""
+
+import json
+from datetime import datetime
+from itertools import islice
+
+from money import to_minor
+
+MAX_NAME_LENGTH = 200         # expense.expense_name
+MAX_DESCRIPTION_LENGTH = 255  # expense.expense_description
+MAX_PRICE = 2 ** 63 - 1       # BIGINT, also bounds price * item_count for the rollup totals
+MAX_ITEM_COUNT = 2 ** 31 - 1  # INTEGER
+
+
+def validate_expense(raw, user_id, category_ids, scale=100):
+    """Turn one incoming expense into expense column values.
+
+    Accepts the same field names as POST /api/expenses; the price is stored
+    as minor units at `scale`. Returns (values, None) on success or
+    (None, error message).
+    """
+    if not isinstance(raw, dict):
+        return None, 'Expense must be a JSON object'
+
+    try:
+        category_id = int(raw.get('category_id') or raw.get('expense_category_id'))
+    except (TypeError, ValueError):
+        return None, 'Category ID is required'
+    if category_id not in category_ids:
+        return None, f'Unknown category {category_id}'
+
+    amount = raw.get('amount') or raw.get('expense_item_price')
+    if amount is None or amount == '':
+        return None, 'Amount is required'
+    try:
+        price = to_minor(amount, scale)
+    except ValueError:
+        return None, 'Amount must be a number'
+    if price <= 0:
+        return None, 'Amount must be a positive number'
+    if price > MAX_PRICE:
+        return None, 'Amount is too large'
+
+    try:
+        item_count = int(raw.get('expense_item_count', 1))
+    except (TypeError, ValueError):
+        return None, 'expense_item_count must be an integer'
+    if item_count < 1:
+        return None, 'expense_item_count must be at least 1'
+    if item_count > MAX_ITEM_COUNT or price * item_count > MAX_PRICE:
+        return None, 'expense_item_count is too large'
+
+    expense_date = raw.get('expenditure_date') or raw.get('date')
+    if not expense_date:
+        return None, 'Date is required'
+    try:
+        expense_date = datetime.strptime(str(expense_date), '%Y-%m-%d').date()
+    except ValueError:
+        return None, 'Date must be YYYY-MM-DD'
+
+    name = raw.get('name') or raw.get('expense_name') or ''
+    description = raw.get('description') or raw.get('expense_description') or ''
+    if not isinstance(name, str):
+        return None, 'Name must be a string'
+    if not isinstance(description, str):
+        return None, 'Description must be a string'
+    if len(name) > MAX_NAME_LENGTH:
+        return None, f'Name is longer than {MAX_NAME_LENGTH} characters'
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        return None, f'Description is longer than {MAX_DESCRIPTION_LENGTH} characters'
+
+    return {
+        'user_id': user_id,
+        'expense_name': name,
+        'expense_item_price': price,
+        'expense_category_id': category_id,
+        'expense_description': description,
+        'expense_item_count': item_count,
+        'expenditure_date': expense_date
+    }, None
+
+
+def parse_ndjson(lines):
+    """Yield (line_number, object, error) for each non-blank NDJSON line.
+
+    Raises ValueError when a line is not valid UTF-8: the body as a whole is malformed.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError:
+                raise ValueError(f'Line {line_number} is not valid UTF-8') from None
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+
+
+def chunked(iterable, size):
+    """Yield lists of at most `size` items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def spend_totals(rows):
+    """Sum validated rows into {(year, month, category_id): [total, count]} rollup deltas (minor units)"""
+    totals = {}
+    for row in rows:
+        day = row['expenditure_date']
+        key = (day.year, day.month, row['expense_category_id'])
+        entry = totals.setdefault(key, [0, 0])
+        entry[0] += row['expense_item_price'] * row['expense_item_count']
+        entry[1] += 1
+    return totals
+
+
+def insert_expenses(session, table, rows, chunk_size=5000):
+    """Insert validated rows with one executemany INSERT per chunk; returns the row count"""
+    inserted = 0
+    for chunk in chunked(rows, chunk_size):
+        session.execute(table.insert(), chunk)
+        inserted += len(chunk)
+    return inserted
@@ -0,0 +1,82 @@
+"""
+JSON provider for the Flask app: orjson when it is installed, the stdlib
+encoder otherwise.
+
+Both backends write dates and datetimes as ISO 8601 strings and Decimals
+as numbers, so handlers can put database values straight into responses
+without converting them row by row. Keys are not sorted. Non-string keys
+(e.g. month numbers) become strings, as with the stdlib encoder.
+
+JSON_ENCODER=auto|orjson|stdlib picks the backend (default auto).
+"""
+
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def json_default(obj):
+    """Serialize types the encoders do not handle natively"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, '_asdict'):  # SQLAlchemy Row, namedtuple
+        return obj._asdict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, default=json_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+if orjson is not None:
+    def orjson_dumps(obj):
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+else:
+    orjson_dumps = None
+
+
+def select_dumps(name=None):
+    """Return the bytes-producing dumps function for JSON_ENCODER"""
+    name = (name or os.getenv('JSON_ENCODER') or 'auto').lower()
+    if name == 'stdlib':
+        return stdlib_dumps
+    if name == 'orjson' and orjson_dumps is None:
+        raise RuntimeError('JSON_ENCODER=orjson but orjson is not installed')
+    return orjson_dumps or stdlib_dumps
+
+
+dumps = select_dumps()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by a dumps(obj) -> bytes function"""
+
+    def __init__(self, app, dumps_bytes=None):
+        super().__init__(app)
+        self.dumps_bytes = dumps_bytes or dumps
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Callers asking for json.dumps options (indent, ...) get the stdlib encoder
+            kwargs.setdefault('default', json_default)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,136 @@
+"""
+Logging setup for the Flask API.
+
+Log calls on request threads only enqueue the record; a QueueListener thread
+formats it as one JSON object per line and writes it out, so log I/O no
+longer adds latency to request handling. Configuration comes from the
+environment:
+
+    LOG_LEVEL         root level (default INFO, DEBUG when FLASK_ENV=development)
+    LOG_FORMAT        "json" (default) or "text"
+    LOG_SAMPLE_RATES  per-route sampling of sub-WARNING records, e.g.
+                      "/api/expenses=0.1,/api/year_bundle=0.5"
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as a single-line JSON object"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the request method/path to records emitted inside a request"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.method = request.method
+            record.path = request.path
+        return True
+
+
+class RouteSamplingFilter(logging.Filter):
+    """Keep only a sampled fraction of sub-WARNING records per route.
+
+    The decision is made once per request, so a sampled request keeps all of
+    its log lines and an unsampled one drops all of them.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates or not has_request_context():
+            return True
+        rate = self.rates.get(request.path)
+        if rate is None:
+            return True
+        keep = g.get('_log_sampled')
+        if keep is None:
+            keep = random.random() < rate
+            g._log_sampled = keep
+        return keep
+
+
+def parse_sample_rates(value):
+    """Parse "path=rate,path=rate" into a dict"""
+    rates = {}
+    for item in (value or '').split(','):
+        if '=' not in item:
+            continue
+        path, rate = item.rsplit('=', 1)
+        rates[path.strip()] = float(rate)
+    return rates
+
+
+def default_level():
+    if os.getenv('LOG_LEVEL'):
+        return os.getenv('LOG_LEVEL').upper()
+    return 'DEBUG' if os.getenv('FLASK_ENV') == 'development' else 'INFO'
+
+
+def configure_logging():
+    """Install the queue-based handler on the root logger (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    if os.getenv('LOG_FORMAT', 'json') == 'text':
+        formatter = logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
+    else:
+        formatter = JsonFormatter()
+    output = logging.StreamHandler()
+    output.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RouteSamplingFilter(parse_sample_rates(os.getenv('LOG_SAMPLE_RATES'))))
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(default_level())
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    os.register_at_fork(after_in_child=_restart_listener)
+
+
+def _restart_listener():
+    """A forked child (a preloaded gunicorn worker) inherits the queue but not the listener thread"""
+    if _listener is not None:
+        _listener.start()
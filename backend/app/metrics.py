@@ -0,0 +1,208 @@
+"""
+Prometheus metrics for the Flask API.
+
+RequestMetrics wraps every request with before/after hooks that record
+latency, status codes and in-flight requests per route. SQLAlchemy events
+count the SQL statements each request runs and the time spent in them,
+and track the connection pool. /metrics returns everything in the
+Prometheus text format.
+
+Routes are labelled with their URL rule ("/api/expenses"), never the raw
+path, so the label set stays small. Streaming responses are timed until
+the handler returns, not until the last byte is sent.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR to an empty directory (see
+gunicorn.conf.py). Each worker then writes its values to memory-mapped
+files there, and /metrics aggregates all workers, whichever one serves the
+scrape. Without it, /metrics reports the serving process only.
+
+METRICS_ENABLED=false turns the request hooks off.
+"""
+
+import contextvars
+import os
+import time
+
+from flask import Response, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests by route, method and status',
+    ['route', 'method', 'status']
+)
+LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time spent handling a request',
+    ['route', 'method'], buckets=LATENCY_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    'http_requests_in_flight', 'Requests being handled right now',
+    multiprocess_mode='livesum'
+)
+REQUEST_STATEMENTS = Histogram(
+    'http_request_db_statements', 'SQL statements executed per request',
+    ['route'], buckets=STATEMENT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    'http_request_db_seconds', 'Time spent in SQL statements per request',
+    ['route'], buckets=LATENCY_BUCKETS
+)
+POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out_connections', 'Connections currently checked out of the pool',
+    multiprocess_mode='livesum'
+)
+POOL_CONNECTIONS = Gauge(
+    'db_pool_open_connections', 'Database connections currently open',
+    multiprocess_mode='livesum'
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time to get a connection from the pool, including pre-ping',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+POOL_TIMEOUTS = Counter('db_pool_checkout_timeouts_total', 'Pool checkouts that timed out')
+
+# [statement count, seconds] of the request running in this context, or None
+_request_db = contextvars.ContextVar('request_db', default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_db.get()
+    if stats is not None and context is not None:
+        stats[0] += 1
+        stats[1] += time.perf_counter() - context._metrics_start
+
+
+def _on_connect(dbapi_connection, connection_record):
+    POOL_CONNECTIONS.inc()
+
+
+def _on_close(dbapi_connection, connection_record):
+    POOL_CONNECTIONS.dec()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    POOL_CHECKED_OUT.dec()
+
+
+def install_sql_listeners():
+    """Listen on every engine and pool; safe to call more than once"""
+    for target, name, listener in (
+        (Engine, 'before_cursor_execute', _before_cursor_execute),
+        (Engine, 'after_cursor_execute', _after_cursor_execute),
+        (Pool, 'connect', _on_connect),
+        (Pool, 'close', _on_close),
+        (Pool, 'checkout', _on_checkout),
+        (Pool, 'checkin', _on_checkin),
+    ):
+        if not event.contains(target, name, listener):
+            event.listen(target, name, listener)
+
+
+def observe_pool_checkout(seconds):
+    """PoolStats listener: seconds is None for a checkout that timed out"""
+    if seconds is None:
+        POOL_TIMEOUTS.inc()
+    else:
+        POOL_CHECKOUT_WAIT.observe(seconds)
+
+
+def metrics_registry():
+    """Registry to expose: all workers' files in multiprocess mode, else this process"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_response():
+    return Response(generate_latest(metrics_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+
+class RequestMetrics:
+    """Flask request hooks feeding the request metrics"""
+
+    def __init__(self, app=None, enabled=True, skip_paths=('/metrics',)):
+        self.enabled = enabled
+        self.skip_paths = frozenset(skip_paths)
+        # (route, method, status) -> labelled children; labels() costs more than the updates
+        self._children = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        install_sql_listeners()
+
+    def children(self, route, method, status):
+        key = (route, method, status)
+        children = self._children.get(key)
+        if children is None:
+            children = self._children[key] = (
+                REQUESTS.labels(route, method, status),
+                LATENCY.labels(route, method),
+                REQUEST_STATEMENTS.labels(route),
+                REQUEST_DB_SECONDS.labels(route),
+            )
+        return children
+
+    def _before_request(self):
+        if not self.enabled:
+            return
+        environ = request.environ
+        if environ.get('PATH_INFO') in self.skip_paths:
+            return
+        db_stats = [0, 0.0]
+        environ['metrics.state'] = [time.perf_counter(), _request_db.set(db_stats), db_stats, False]
+        IN_FLIGHT.inc()
+
+    def _after_request(self, response):
+        req = request._get_current_object()
+        state = req.environ.get('metrics.state')
+        if state is None or state[3]:
+            return response
+        elapsed = time.perf_counter() - state[0]
+        rule = req.url_rule
+        requests, latency, statements, db_seconds = self.children(
+            rule.rule if rule is not None else 'unmatched', req.method, str(response.status_code)
+        )
+        requests.inc()
+        latency.observe(elapsed)
+        statements.observe(state[2][0])
+        db_seconds.observe(state[2][1])
+        state[3] = True
+        return response
+
+    def _teardown_request(self, error=None):
+        req = request._get_current_object()
+        state = req.environ.pop('metrics.state', None)
+        if state is None:
+            return
+        if not state[3]:
+            # after_request never ran (the error escaped Flask's handlers)
+            rule = req.url_rule
+            self.children(rule.rule if rule is not None else 'unmatched', req.method, '500')[0].inc()
+        IN_FLIGHT.dec()
+        try:
+            _request_db.reset(state[1])
+        except ValueError:  # torn down in another context (streamed response)
+            _request_db.set(None)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Date, Boolean, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from db import Base
 
@@ -7,6 +7,7 @@ class Currency(Base):
     currency_id = Column(Integer, primary_key=True)
     currency_name = Column(String(50), nullable=False)
     currency_symbol = Column(String(10), nullable=False)
+    minor_unit_digits = Column(Integer, nullable=False, default=2, server_default="2")  # 2 for cents, 0 for yen
     users = relationship("User", back_populates="currency")
 
 class User(Base):
@@ -15,8 +16,9 @@ class User(Base):
     username = Column(String(50), nullable=False, unique=True)
     password = Column(String(255), nullable=False)
     email = Column(String(120), nullable=False, unique=True)
-    global_limit = Column(Float, default=0)
+    global_limit = Column(BigInteger, default=0)  # Minor units
     currency_id = Column(Integer, ForeignKey("currency.currency_id"), default=1)  # Default to USD
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on every write, drives ETags
     expenses = relationship("Expense", back_populates="user")
     monthly_limits = relationship("MonthlyLimit", back_populates="user")
     categories = relationship("ExpenseCategory", back_populates="user")
@@ -30,6 +32,14 @@ class ExpenseCategory(Base):
     is_deleted = Column(Boolean, default=False, nullable=False)
     expenses = relationship("Expense", back_populates="category")
     user = relationship("User", back_populates="categories")
+    __table_args__ = (
+        # Category lists only ever show non-deleted rows
+        Index("ix_expense_category_user_id_active", "user_id",
+              postgresql_where=text("is_deleted = false")),
+        # One global category per name; the conflict target of the seed inserts
+        Index("uq_expense_category_global_name", "expense_category_name", unique=True,
+              postgresql_where=text("user_id IS NULL"), sqlite_where=text("user_id IS NULL")),
+    )
 
 class Month(Base):
     __tablename__ = "month"
@@ -47,22 +57,40 @@ class MonthlyLimit(Base):
     __tablename__ = "monthly_limit"
     monthly_limit_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
-    monthly_limit_amount = Column(Float, nullable=False)
+    monthly_limit_amount = Column(BigInteger, nullable=False)  # Minor units
     month_id = Column(Integer, ForeignKey("month.month_id"), nullable=False)
     year_id = Column(Integer, ForeignKey("year.year_id"), nullable=False)
     user = relationship("User", back_populates="monthly_limits")
     month = relationship("Month", back_populates="monthly_limits")
     year = relationship("Year", back_populates="monthly_limits")
+    __table_args__ = (
+        # One limit per user and month; the conflict target of limit upserts
+        UniqueConstraint("user_id", "year_id", "month_id", name="uq_monthly_limit_user_id_year_id_month_id"),
+    )
+
+class MonthlySpendRollup(Base):
+    """Per-user, per-month, per-category spend totals kept in step with expense writes"""
+    __tablename__ = "monthly_spend_rollup"
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category_id = Column(Integer, ForeignKey("expense_category.expense_category_id"), primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)  # Minor units
+    count = Column(Integer, nullable=False, default=0)
 
 class Expense(Base):
     __tablename__ = "expense"
     expense_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     expense_name = Column(String(200), nullable=True)  # New column for expense name
-    expense_item_price = Column(Float, nullable=False)
+    expense_item_price = Column(BigInteger, nullable=False)  # Minor units
     expense_category_id = Column(Integer, ForeignKey("expense_category.expense_category_id"), nullable=False)
     expense_description = Column(String(255))
     expense_item_count = Column(Integer, default=1)
     expenditure_date = Column(Date, nullable=False)
     user = relationship("User", back_populates="expenses")
-    category = relationship("ExpenseCategory", back_populates="expenses")
\ No newline at end of file
+    category = relationship("ExpenseCategory", back_populates="expenses")
+    __table_args__ = (
+        # Every expense read filters by user and a date range
+        Index("ix_expense_user_id_expenditure_date", "user_id", "expenditure_date"),
+    )
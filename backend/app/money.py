@@ -0,0 +1,51 @@
+"""
+Money stored as integer minor units.
+
+Amounts are kept in BIGINT columns as whole minor units of the user's
+currency (cents for USD, yen for JPY), so sums in SQL are exact integer
+arithmetic. The API keeps speaking major units: values are converted with
+the currency's scale, 10 ** minor_unit_digits, on the way in and out.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+DEFAULT_MINOR_UNIT_DIGITS = 2
+
+# ISO 4217 minor-unit exponents that differ from the default, by code and by
+# the display names the seed data uses
+MINOR_UNIT_DIGITS = {
+    'JPY': 0, 'Japanese Yen': 0,
+    'KRW': 0, 'South Korean Won': 0,
+    'KWD': 3, 'Kuwaiti Dinar': 3,
+}
+
+
+def minor_unit_digits(currency_name):
+    return MINOR_UNIT_DIGITS.get(currency_name, DEFAULT_MINOR_UNIT_DIGITS)
+
+
+def scale_for(digits):
+    """Minor units per major unit"""
+    return 10 ** (DEFAULT_MINOR_UNIT_DIGITS if digits is None else digits)
+
+
+def to_minor(amount, scale):
+    """Convert a major-unit amount (number or numeric string) to integer minor units, rounding half up.
+
+    Floats go through their shortest repr, so 0.1 becomes exactly 10 cents.
+    Raises ValueError for values that are not finite numbers.
+    """
+    try:
+        value = Decimal(str(amount).strip()) * scale
+        return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError, OverflowError) as e:
+        raise ValueError(f'Invalid amount {amount!r}') from e
+
+
+def to_major(minor, scale):
+    """Convert integer minor units to a major-unit number for JSON"""
+    if not minor:
+        return 0
+    if scale == 1:
+        return int(minor)
+    return int(minor) / scale
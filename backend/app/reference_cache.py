@@ -0,0 +1,74 @@
+"""
+In-process read-through cache for reference data.
+
+Currencies, months, years and the global expense categories almost never
+change, yet every dashboard load used to query them. The cache loads them
+once through a loader callable, keeps the list endpoints' JSON bodies
+pre-serialized together with a strong ETag, and reloads after invalidate()
+or once the TTL has passed. The TTL bounds staleness across worker processes,
+which each hold their own copy.
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+
+class CachedPayload:
+    """Pre-serialized JSON body and its ETag"""
+
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, obj):
+        self.body = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+
+
+class ReferenceData:
+    """One immutable snapshot of the reference tables"""
+
+    def __init__(self, currencies, months, years, global_categories):
+        self.currencies = currencies
+        self.months = months
+        self.years = years
+        self.global_categories = global_categories
+        self.currencies_payload = CachedPayload({'currencies': currencies})
+        self.months_payload = CachedPayload({'months': months})
+        self.year_ids = {year['year_number']: year['year_id'] for year in years}
+        # Changes whenever any reference row changes; lets per-user ETags
+        # cover responses that embed reference data
+        self.etag = CachedPayload([currencies, months, years, global_categories]).etag
+
+
+class ReferenceDataCache:
+    """Thread-safe holder of the current ReferenceData snapshot.
+
+    `loader` is called with no arguments and must return a dict with the
+    keys "currencies", "months", "years" and "global_categories", each a
+    list of plain dicts.
+    """
+
+    def __init__(self, loader, ttl_seconds=300, clock=time.monotonic):
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self):
+        data = self._data
+        if data is not None and self._clock() - self._loaded_at < self.ttl_seconds:
+            return data
+        with self._lock:
+            if self._data is None or self._clock() - self._loaded_at >= self.ttl_seconds:
+                self._data = ReferenceData(**self._loader())
+                self._loaded_at = self._clock()
+                self.loads += 1
+            return self._data
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
@@ -0,0 +1,175 @@
+"""
+Per-user cumulative daily spend, for constant-time date-range summaries.
+
+A DailySpendIndex holds, for every category a user has spent in, prefix
+sums of daily totals and expense counts from the user's first to last
+expense day. The total for any [start, end] range is then
+prefix[end + 1] - prefix[start], regardless of how many expenses or years
+the range covers.
+
+Indexes are immutable: apply_delta returns a copy, so readers never see a
+half-updated array. SpendIndexCache keeps one index per user, tagged with
+the user's data_version, so a write from another worker forces a rebuild.
+The cache is bounded by entry count and by the bytes of its arrays.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+
+
+class DailySpendIndex:
+    """Prefix sums of daily spend per category for one user"""
+
+    def __init__(self, origin, days, totals, counts, category_names):
+        self.origin = origin              # first indexed day (date) or None when empty
+        self.days = days                  # number of indexed days
+        self.totals = totals              # category_id -> array('q') of minor units, length days + 1
+        self.counts = counts              # category_id -> array('q') of length days + 1
+        self.category_names = category_names
+
+    @classmethod
+    def build(cls, rows):
+        """Build from (expenditure_date, category_id, category_name, total, count) rows"""
+        rows = list(rows)
+        if not rows:
+            return cls(None, 0, {}, {}, {})
+
+        origin = min(row[0] for row in rows)
+        days = (max(row[0] for row in rows) - origin).days + 1
+        totals, counts, names = {}, {}, {}
+        for day, category_id, category_name, total, count in rows:
+            if category_id not in totals:
+                totals[category_id] = array('q', bytes(8 * (days + 1)))
+                counts[category_id] = array('q', bytes(8 * (days + 1)))
+                names[category_id] = category_name
+            offset = (day - origin).days + 1
+            totals[category_id][offset] += int(total or 0)
+            counts[category_id][offset] += count
+
+        for category_id in totals:
+            cumulative_total, cumulative_count = totals[category_id], counts[category_id]
+            for i in range(1, days + 1):
+                cumulative_total[i] += cumulative_total[i - 1]
+                cumulative_count[i] += cumulative_count[i - 1]
+
+        return cls(origin, days, totals, counts, names)
+
+    @property
+    def nbytes(self):
+        """Memory held by the prefix arrays"""
+        return sum(prefix.itemsize * len(prefix) for prefix in self.totals.values()) * 2
+
+    def range_summary(self, start, end):
+        """Return (total, count, {category_id: (total, count)}) for start..end inclusive"""
+        if self.origin is None:
+            return 0, 0, {}
+        first = max((start - self.origin).days, 0)
+        last = min((end - self.origin).days, self.days - 1)
+        if first > last:
+            return 0, 0, {}
+
+        by_category = {}
+        total, count = 0, 0
+        for category_id, prefix in self.totals.items():
+            category_count = self.counts[category_id][last + 1] - self.counts[category_id][first]
+            if category_count:
+                category_total = prefix[last + 1] - prefix[first]
+                by_category[category_id] = (category_total, category_count)
+                total += category_total
+                count += category_count
+        return total, count, by_category
+
+    def apply_delta(self, day, category_id, amount, count):
+        """Return a copy with one expense added (or removed), or None if a rebuild is needed"""
+        if self.origin is None or category_id not in self.totals:
+            return None
+        offset = (day - self.origin).days + 1
+        if offset < 1 or offset > self.days:
+            return None
+
+        totals = dict(self.totals)
+        counts = dict(self.counts)
+        category_totals = array('q', self.totals[category_id])
+        category_counts = array('q', self.counts[category_id])
+        for i in range(offset, self.days + 1):
+            category_totals[i] += int(amount)
+            category_counts[i] += count
+        totals[category_id] = category_totals
+        counts[category_id] = category_counts
+        return DailySpendIndex(self.origin, self.days, totals, counts, self.category_names)
+
+
+class SpendIndexCache:
+    """LRU of user_id -> (data_version, DailySpendIndex), bounded by entries and by bytes"""
+
+    def __init__(self, maxsize=256, max_bytes=64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, user_id, version, load_rows, current_version=None):
+        """Return the user's index at `version`, rebuilding it with load_rows() if stale.
+
+        current_version() is read again after loading: a write that committed
+        in between may already be in the rows, so the index is then returned
+        without being cached under the older version.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+
+        index = DailySpendIndex.build(load_rows())
+        consistent = current_version is None or current_version() == version
+        with self._lock:
+            self.builds += 1
+            if consistent:
+                self._store(user_id, version, index)
+            else:
+                self._discard(user_id)
+        return index
+
+    def apply(self, user_id, new_version, day, category_id, amount, count):
+        """Fold a committed expense write into the cached index.
+
+        Only applies when the cached index is exactly one version behind;
+        otherwise another write happened elsewhere and the entry is dropped.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return
+            updated = None
+            if entry[0] == new_version - 1:
+                updated = entry[1].apply_delta(day, category_id, amount, count)
+            if updated is None:
+                self._discard(user_id)
+            else:
+                self._store(user_id, new_version, updated)
+
+    def _store(self, user_id, version, index):
+        self._discard(user_id)
+        if self.maxsize <= 0 or index.nbytes > self.max_bytes:
+            return
+        self._entries[user_id] = (version, index)
+        self.nbytes += index.nbytes
+        while len(self._entries) > self.maxsize or self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def _discard(self, user_id):
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self.nbytes -= entry[1].nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
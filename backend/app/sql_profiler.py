@@ -0,0 +1,197 @@
+"""
+Opt-in per-request SQL profiler.
+
+When enabled, SQLAlchemy cursor events record every statement a request
+runs, with its duration. At the end of the request the profiler:
+
+  * groups statements by shape (the SQL with literals and IN lists
+    normalized) and logs a warning for any shape repeated at least
+    SQL_REPEAT_THRESHOLD times, which is the signature of an N+1 loop;
+  * logs statements slower than SQL_SLOW_QUERY_MS with their plan, from
+    EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL or EXPLAIN QUERY PLAN on
+    SQLite. Only plain SELECTs are explained, after the response is built;
+  * returns the report in the X-SQL-Profile response header (compact JSON)
+    plus a Server-Timing entry, when the request sends X-SQL-Profile: 1.
+
+Configuration (off by default; EXPLAIN ANALYZE runs slow queries twice):
+
+    SQL_PROFILER          enable the profiler (default false)
+    SQL_SLOW_QUERY_MS     slow-query threshold, 0 = off (default 100)
+    SQL_REPEAT_THRESHOLD  executions of one shape flagged as N+1 (default 5)
+    SQL_EXPLAIN           capture plans for slow queries (default true)
+"""
+
+import contextvars
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+REPORT_HEADER = 'X-SQL-Profile'
+MAX_REPORTED_SHAPES = 10
+MAX_SHAPE_LENGTH = 200
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:[^()]|\([^()]*\))*\)', re.IGNORECASE)
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+_WRITES = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE)\b', re.IGNORECASE)
+
+# Statements of the request running in this context: [shape, statement, parameters, seconds, executemany]
+_current_statements = contextvars.ContextVar('sql_profile', default=None)
+
+
+def statement_shape(statement):
+    """Normalize a statement so executions that differ only in values compare equal"""
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _IN_LIST.sub('IN (...)', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+def is_explainable(statement):
+    return bool(_EXPLAINABLE.match(statement)) and not _WRITES.search(statement)
+
+
+def summarize(statements, repeat_threshold, slow_seconds):
+    """Per-request report: totals, repeated shapes and slow statements"""
+    counts = Counter(entry[0] for entry in statements)
+    shape_seconds = Counter()
+    for shape, _, _, seconds, _ in statements:
+        shape_seconds[shape] += seconds
+    repeated = [
+        {'shape': shape[:MAX_SHAPE_LENGTH], 'count': count, 'ms': round(shape_seconds[shape] * 1000, 2)}
+        for shape, count in counts.most_common() if count >= repeat_threshold
+    ]
+    slow = [
+        {'sql': statement[:MAX_SHAPE_LENGTH], 'ms': round(seconds * 1000, 2)}
+        for _, statement, _, seconds, _ in statements if slow_seconds and seconds >= slow_seconds
+    ]
+    return {
+        'statements': len(statements),
+        'db_ms': round(sum(entry[3] for entry in statements) * 1000, 2),
+        'shapes': len(counts),
+        'repeated': repeated[:MAX_REPORTED_SHAPES],
+        'slow': slow[:MAX_REPORTED_SHAPES],
+    }
+
+
+def explain(engine, statement, parameters):
+    """Plan of a SELECT as text, run on its own connection and rolled back"""
+    if engine.dialect.name == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    elif engine.dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        return None
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+        cursor.close()
+        connection.rollback()
+    finally:
+        connection.close()
+    return '\n'.join(' '.join(str(column) for column in row) for row in rows)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_statements.get() is not None:
+        context._profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    statements = _current_statements.get()
+    if statements is None or context is None or not hasattr(context, '_profiler_start'):
+        return
+    seconds = time.perf_counter() - context._profiler_start
+    statements.append([statement_shape(statement), statement, parameters, seconds, executemany])
+
+
+class SQLProfiler:
+    """Flask extension collecting and reporting the SQL of each request"""
+
+    def __init__(self, app=None, engine=None, enabled=False, slow_query_ms=100,
+                 repeat_threshold=5, explain_slow=True):
+        self.get_engine = engine  # callable returning the engine, used for EXPLAIN
+        self.enabled = False
+        self.slow_seconds = slow_query_ms / 1000 if slow_query_ms else 0
+        self.repeat_threshold = repeat_threshold
+        self.explain_slow = explain_slow
+        if app is not None:
+            self.init_app(app)
+        if enabled:
+            self.enable()
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def enable(self):
+        """Start profiling; cursor listeners are only installed while enabled"""
+        for name, listener in (('before_cursor_execute', _before_cursor_execute),
+                               ('after_cursor_execute', _after_cursor_execute)):
+            if not event.contains(Engine, name, listener):
+                event.listen(Engine, name, listener)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        for name, listener in (('before_cursor_execute', _before_cursor_execute),
+                               ('after_cursor_execute', _after_cursor_execute)):
+            if event.contains(Engine, name, listener):
+                event.remove(Engine, name, listener)
+
+    def _before_request(self):
+        if self.enabled:
+            request.environ['sql_profiler.token'] = _current_statements.set([])
+
+    def _after_request(self, response):
+        statements = _current_statements.get()
+        if statements is None or 'sql_profiler.token' not in request.environ:
+            return response
+        report = summarize(statements, self.repeat_threshold, self.slow_seconds)
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+        for repeated in report['repeated']:
+            logger.warning('Possible N+1 on %s %s: %s statements of one shape', request.method, route,
+                           repeated['count'], extra={'sql_shape': repeated['shape']})
+        if request.headers.get(REPORT_HEADER):
+            response.headers[REPORT_HEADER] = json.dumps(report, separators=(',', ':'))
+            response.headers.add(
+                'Server-Timing', f'db;dur={report["db_ms"]};desc="{report["statements"]} queries"'
+            )
+        return response
+
+    def _teardown_request(self, error=None):
+        token = request.environ.pop('sql_profiler.token', None)
+        if token is None:
+            return
+        statements = _current_statements.get() or []
+        try:
+            _current_statements.reset(token)
+        except ValueError:  # torn down in another context (streamed response)
+            _current_statements.set(None)
+        if not self.slow_seconds:
+            return
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+        for _, statement, parameters, seconds, executemany in statements:
+            if seconds < self.slow_seconds:
+                continue
+            plan = None
+            if self.explain_slow and not executemany and is_explainable(statement) and self.get_engine:
+                try:
+                    plan = explain(self.get_engine(), statement, parameters)
+                except Exception as e:
+                    plan = f'EXPLAIN failed: {e}'
+            logger.warning('Slow query on %s %s: %.1f ms', request.method, route, seconds * 1000,
+                           extra={'sql': statement, 'plan': plan})
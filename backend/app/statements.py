@@ -0,0 +1,242 @@
+"""
+PDF statements rendered off the request thread and cached on disk.
+
+The Flask handler gathers a statement's numbers (a small, picklable dict)
+and hands it to StatementRenderer, which renders it with reportlab on a
+worker pool and writes the PDF to
+<cache_dir>/<user_id>/<period>-v<data_version>.pdf. Because the data
+version is in the file name, a cached file is never stale; once it exists
+it is served as a static file. Older versions of the same period are
+removed when a new one is written.
+
+Gunicorn runs several workers and a client's polls can reach any of them, so
+the render status lives next to the output file rather than in memory: a
+<path>.pending marker claims the job (created exclusively, so only one worker
+renders it) and a <path>.failed marker holds the error of a failed render
+until a poll reports it and removes it.
+"""
+
+import glob
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+logger = logging.getLogger(__name__)
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4f46e5')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#d1d5db')),
+])
+
+
+def money_formatter(currency_symbol, digits=2):
+    """Format amounts with the currency symbol when the built-in PDF fonts can draw it"""
+    try:
+        (currency_symbol or '').encode('latin-1')
+        prefix = currency_symbol or ''
+    except UnicodeEncodeError:
+        prefix = ''
+    return lambda amount: f'{prefix}{amount:,.{digits}f}'
+
+
+def render_statement_pdf(statement):
+    """Render a statement dict to PDF bytes.
+
+    `statement` has: title, subtitle, currency_symbol, currency_name,
+    minor_unit_digits, total, count, categories [(name, total, count)] and
+    limits [(label, limit, spend)], with amounts in major units.
+    """
+    styles = getSampleStyleSheet()
+    money = money_formatter(statement.get('currency_symbol'), statement.get('minor_unit_digits', 2))
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, title=statement['title'],
+                            leftMargin=18 * mm, rightMargin=18 * mm, topMargin=18 * mm, bottomMargin=18 * mm)
+
+    story = [
+        Paragraph(escape(statement['title']), styles['Title']),
+        Paragraph(escape(statement['subtitle']), styles['Normal']),
+    ]
+    if statement.get('currency_name'):
+        story.append(Paragraph(f'Amounts in {escape(statement["currency_name"])}', styles['Normal']))
+    story += [
+        Spacer(1, 6 * mm),
+        Paragraph(f'Total spent: <b>{money(statement["total"])}</b> across {statement["count"]} expenses',
+                  styles['Heading2']),
+        Spacer(1, 4 * mm),
+        Paragraph('By category', styles['Heading3']),
+    ]
+
+    total = statement['total'] or 0
+    category_rows = [['Category', 'Expenses', 'Amount', 'Share']]
+    for name, amount, count in statement['categories']:
+        share = f'{amount / total:.1%}' if total else '-'
+        category_rows.append([name, str(count), money(amount), share])
+    if len(category_rows) == 1:
+        category_rows.append(['No expenses', '', '', ''])
+    story.append(Table(category_rows, colWidths=[80 * mm, 25 * mm, 35 * mm, 25 * mm], style=TABLE_STYLE))
+
+    story += [Spacer(1, 6 * mm), Paragraph('Limit vs. spend', styles['Heading3'])]
+    limit_rows = [['Period', 'Limit', 'Spent', 'Remaining']]
+    for label, limit, spend in statement['limits']:
+        remaining = money(limit - spend) if limit else '-'
+        limit_rows.append([label, money(limit) if limit else 'No limit', money(spend), remaining])
+    story.append(Table(limit_rows, colWidths=[55 * mm, 37 * mm, 37 * mm, 36 * mm], style=TABLE_STYLE))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def write_file_atomic(path, data):
+    """Write bytes to `path` so readers see either the old file or the whole new one"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as tmp:
+        tmp.write(data)
+    os.replace(tmp_path, path)
+
+
+def remove_other_versions(path, suffix=''):
+    """Remove the files of other data versions of the same period as `path`"""
+    directory, name = os.path.split(path)
+    period = name.rsplit('-v', 1)[0]
+    for old_path in glob.glob(os.path.join(directory, f'{glob.escape(period)}-v*.pdf{suffix}')):
+        if old_path != path + suffix:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+def render_statement_file(statement, path):
+    """Render to `path` atomically and drop older versions of the same period"""
+    write_file_atomic(path, render_statement_pdf(statement))
+    remove_other_versions(path)
+    return path
+
+
+def run_render_job(statement, path):
+    """Render job run on the pool: records a failure next to `path` and releases its .pending claim"""
+    try:
+        return render_statement_file(statement, path)
+    except Exception as e:
+        write_file_atomic(path + '.failed', str(e).encode('utf-8'))
+        raise
+    finally:
+        try:
+            os.remove(path + '.pending')
+        except OSError:
+            pass
+
+
+class StatementRenderer:
+    """Queues statement renders on a worker pool, one job per output file.
+
+    A .pending marker older than `render_timeout` seconds belongs to a
+    process that died mid-render and no longer blocks a new attempt.
+    """
+
+    def __init__(self, cache_dir, max_workers=2, executor=None, render_timeout=300):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.render_timeout = render_timeout
+        self._executor = executor
+        self._pending = {}   # path -> Future, for the jobs this process submitted
+        self._lock = threading.Lock()
+
+    def path_for(self, user_id, period, version):
+        return os.path.join(self.cache_dir, str(user_id), f'{period}-v{version}.pdf')
+
+    def is_pending(self, path):
+        """Whether any process is rendering `path`"""
+        try:
+            return time.time() - os.path.getmtime(path + '.pending') < self.render_timeout
+        except OSError:
+            return False
+
+    def pop_failure(self, path):
+        """Return and remove the error of a failed render, so the next request retries"""
+        try:
+            with open(path + '.failed', encoding='utf-8') as marker:
+                error = marker.read()
+            os.remove(path + '.failed')
+        except OSError:
+            return None
+        return error
+
+    def _claim(self, path):
+        """Create the .pending marker; False if another live job holds it"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for _ in range(2):
+            try:
+                os.close(os.open(path + '.pending', os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                if self.is_pending(path):
+                    return False
+                try:
+                    os.remove(path + '.pending')  # abandoned by a dead process
+                except OSError:
+                    pass
+        return False
+
+    def submit(self, path, statement):
+        """Start rendering `statement` to `path` unless that job is already queued.
+
+        Returns the job's Future, or None when another process is rendering it.
+        """
+        with self._lock:
+            if path in self._pending:
+                return self._pending[path]
+            if not self._claim(path):
+                return None
+            remove_other_versions(path, '.pending')
+            remove_other_versions(path, '.failed')
+            try:
+                if self._executor is None:
+                    # spawn, not fork: the parent runs threads (logging, pool) that fork would copy mid-state
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                future = self._executor.submit(run_render_job, statement, path)
+            except Exception:
+                os.remove(path + '.pending')
+                raise
+            self._pending[path] = future
+        future.add_done_callback(lambda done: self._finish(path, done))
+        return future
+
+    def _finish(self, path, future):
+        error = future.exception()
+        if error is not None:
+            logger.error('Statement render failed for %s: %s', path, error)
+        with self._lock:
+            self._pending.pop(path, None)
+
+    def join(self, timeout=None):
+        """Wait for all queued renders"""
+        with self._lock:
+            futures = list(self._pending.values())
+        for future in futures:
+            future.exception(timeout=timeout)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,363 @@
+"""
+Synthetic users, categories, limits and expenses for scale testing.
+
+A Population describes how many users and expenses to create and how they
+are distributed:
+
+  * expenses per user follow a Pareto distribution (a few heavy spenders,
+    a long tail of light ones), with the mean set by the requested total;
+  * dates are weighted by month (December peak, January/February dip) and
+    by weekday (more on weekends), from each user's signup day onwards;
+  * global categories have their own frequency and price range, some users
+    add a few custom categories, and each user has a currency and spend
+    level of their own;
+  * some users set monthly limits around their actual monthly spend.
+
+Users are generated in chunks of consecutive users. Every chunk has its
+own random seed and a reserved range of user and category ids, so chunks
+can be generated and loaded by independent processes in any order, and
+the same seed always produces the same data. Each chunk is loaded in one
+transaction: with COPY FROM STDIN on PostgreSQL, or with batched INSERTs
+on other databases. Its monthly_spend_rollup rows are computed while the
+expenses are generated and loaded with them.
+"""
+
+import io
+import math
+import multiprocessing
+import random
+from bisect import bisect_right
+from datetime import date, timedelta
+from itertools import accumulate
+
+from sqlalchemy import create_engine, func, select, text
+
+from bootstrap import CURRENCIES, insert_ignoring_conflicts, seed_reference_data
+from expense_import import chunked
+from money import minor_unit_digits
+
+# Global category name -> (relative frequency, median price in USD, log-normal sigma, expense names)
+CATEGORY_PROFILES = {
+    'Food & Dining': (30, 18, 0.7, ('Groceries', 'Lunch', 'Dinner', 'Coffee', 'Takeout')),
+    'Transportation': (14, 25, 0.8, ('Fuel', 'Bus pass', 'Taxi', 'Parking')),
+    'Shopping': (14, 45, 1.0, ('Clothes', 'Electronics', 'Household', 'Online order')),
+    'Entertainment': (9, 30, 0.8, ('Movies', 'Concert', 'Streaming', 'Games')),
+    'Bills & Utilities': (8, 90, 0.6, ('Electricity', 'Internet', 'Phone', 'Water', 'Rent')),
+    'Healthcare': (5, 60, 1.0, ('Pharmacy', 'Doctor', 'Dentist')),
+    'Education': (3, 80, 1.1, ('Books', 'Course', 'Tuition')),
+    'Travel': (4, 220, 1.0, ('Flight', 'Hotel', 'Train')),
+    'Other': (5, 25, 1.0, ('Miscellaneous',)),
+}
+
+# Custom category name -> (relative frequency, median price in USD)
+CUSTOM_CATEGORIES = {
+    'Pets': (4, 35), 'Gym': (3, 40), 'Coffee': (8, 5), 'Kids': (5, 30), 'Gifts': (2, 50),
+    'Subscriptions': (3, 12), 'Home Improvement': (2, 120), 'Charity': (1, 40),
+    'Hobbies': (3, 35), 'Car Maintenance': (1, 150), 'Garden': (2, 25), 'Beauty': (3, 30),
+}
+CUSTOM_PRICE_SIGMA = 0.8
+
+# Relative spend by calendar month, January first
+MONTH_WEIGHTS = (0.85, 0.8, 0.95, 0.95, 1.0, 1.05, 1.1, 1.1, 0.95, 1.0, 1.15, 1.45)
+WEEKEND_WEIGHT = 1.3
+
+# (currency_id, share of users, units per USD)
+CURRENCY_MIX = ((1, 60, 1.0), (2, 15, 0.92), (3, 8, 0.79), (4, 10, 83.0), (5, 7, 150.0))
+CURRENCY_SCALES = {currency_id: 10 ** minor_unit_digits(name) for currency_id, name, _ in CURRENCIES}
+
+USER_COLUMNS = ('user_id', 'username', 'email', 'password', 'global_limit', 'currency_id', 'data_version')
+CATEGORY_COLUMNS = ('expense_category_id', 'expense_category_name', 'user_id', 'is_deleted')
+EXPENSE_COLUMNS = ('user_id', 'expense_name', 'expense_item_price', 'expense_category_id',
+                   'expense_description', 'expense_item_count', 'expenditure_date')
+LIMIT_COLUMNS = ('user_id', 'monthly_limit_amount', 'month_id', 'year_id')
+ROLLUP_COLUMNS = ('user_id', 'year', 'month', 'category_id', 'total', 'count')
+
+COPY_BATCH_ROWS = 50_000
+INSERT_BATCH_ROWS = 5_000
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class Population:
+    """What to generate; `expenses` is the expected total, the actual total varies with the draw"""
+
+    def __init__(self, users, expenses, start_date, end_date, seed=1, pareto_alpha=1.5,
+                 custom_category_share=0.4, max_custom_categories=4, limit_share=0.3,
+                 username_prefix='synthetic_'):
+        if users < 1 or expenses < 0:
+            raise ValueError('users must be positive and expenses not negative')
+        if start_date > end_date:
+            raise ValueError('start_date must not be after end_date')
+        if pareto_alpha <= 1:
+            raise ValueError('pareto_alpha must be greater than 1 for a finite mean')
+        if max_custom_categories > len(CUSTOM_CATEGORIES):
+            raise ValueError(f'max_custom_categories must be at most {len(CUSTOM_CATEGORIES)}')
+        self.users = users
+        self.expenses = expenses
+        self.start_date = start_date
+        self.end_date = end_date
+        self.seed = seed
+        self.pareto_alpha = pareto_alpha
+        self.custom_category_share = custom_category_share
+        self.max_custom_categories = max_custom_categories
+        self.limit_share = limit_share
+        self.username_prefix = username_prefix
+
+    @property
+    def years(self):
+        return range(self.start_date.year, self.end_date.year + 1)
+
+    def expense_count(self, rng):
+        """Draw one user's number of expenses; the mean over users is expenses / users"""
+        pareto_mean = self.pareto_alpha / (self.pareto_alpha - 1)
+        expected = self.expenses / self.users * rng.paretovariate(self.pareto_alpha) / pareto_mean
+        return int(expected + rng.random())  # unbiased rounding keeps small means exact on average
+
+
+class Layout:
+    """Ids shared by every chunk: reserved id ranges and the reference rows to point at"""
+
+    def __init__(self, first_user_id, first_category_id, global_categories, year_ids):
+        self.first_user_id = first_user_id
+        self.first_category_id = first_category_id
+        self.global_categories = global_categories  # name -> expense_category_id
+        self.year_ids = year_ids                    # year_number -> year_id
+
+
+class ChunkGenerator:
+    """Rows for users [first_index, first_index + count) of a population.
+
+    users and categories are built up front; expenses() streams the expense
+    rows, and limits and rollup rows are available once it is exhausted.
+    """
+
+    def __init__(self, population, layout, first_index, count):
+        self.population = population
+        self.layout = layout
+        self.rng = random.Random(population.seed * 1_000_003 + first_index)
+        self.users = []
+        self.categories = []
+        self._plans = []
+        self._monthly_totals = {}  # (user_id, year, month, category_id) -> [total, count]
+
+        self.days = []
+        weights = []
+        day = population.start_date
+        while day <= population.end_date:
+            self.days.append(day)
+            weights.append(MONTH_WEIGHTS[day.month - 1] * (WEEKEND_WEIGHT if day.weekday() >= 5 else 1.0))
+            day += timedelta(days=1)
+        self.cum_weights = list(accumulate(weights))
+
+        global_profiles = [
+            (category_id, CATEGORY_PROFILES[name]) for name, category_id in layout.global_categories.items()
+        ]
+        currency_ids = [currency_id for currency_id, _, _ in CURRENCY_MIX]
+        currency_weights = [share for _, share, _ in CURRENCY_MIX]
+        rates = {currency_id: rate for currency_id, _, rate in CURRENCY_MIX}
+
+        for index in range(first_index, first_index + count):
+            self._add_user(index, global_profiles, currency_ids, currency_weights, rates)
+
+    def _add_user(self, index, global_profiles, currency_ids, currency_weights, rates):
+        rng = self.rng
+        population = self.population
+        user_id = self.layout.first_user_id + index
+        currency_id = rng.choices(currency_ids, currency_weights)[0]
+        username = f'{population.username_prefix}{user_id}'
+        self.users.append((user_id, username, f'{username}@example.com', '', 0, currency_id, 0))
+
+        # Price scale in minor units of the user's currency, times a personal spend level
+        price_scale = rates[currency_id] * CURRENCY_SCALES[currency_id] * rng.lognormvariate(0, 0.4)
+        choices = [
+            (category_id, weight, math.log(median * price_scale), sigma, names)
+            for category_id, (weight, median, sigma, names) in global_profiles
+        ]
+        if population.max_custom_categories and rng.random() < population.custom_category_share:
+            custom_names = rng.sample(sorted(CUSTOM_CATEGORIES), rng.randint(1, population.max_custom_categories))
+            for offset, name in enumerate(custom_names):
+                category_id = self.layout.first_category_id + index * population.max_custom_categories + offset
+                self.categories.append((category_id, name, user_id, False))
+                weight, median = CUSTOM_CATEGORIES[name]
+                choices.append((category_id, weight, math.log(median * price_scale), CUSTOM_PRICE_SIGMA, (name,)))
+
+        # Signup somewhere in the first 60% of the period; no expenses before it
+        first_day = int(rng.random() * len(self.days) * 0.6)
+        set_limits = rng.random() < population.limit_share
+        self._plans.append((user_id, population.expense_count(rng), choices, first_day, set_limits))
+
+    def expenses(self):
+        rng = self.rng
+        days = self.days
+        cum_weights = self.cum_weights
+        totals = self._monthly_totals
+        for user_id, count, choices, first_day, _ in self._plans:
+            low = cum_weights[first_day - 1] if first_day else 0.0
+            span = cum_weights[-1] - low
+            picked = rng.choices(choices, cum_weights=list(accumulate(choice[1] for choice in choices)), k=count)
+            for category_id, _, mu, sigma, names in picked:
+                day = days[bisect_right(cum_weights, low + rng.random() * span, first_day)]
+                price = int(rng.lognormvariate(mu, sigma)) or 1
+                item_count = 1 if rng.random() < 0.92 else rng.randint(2, 4)
+                key = (user_id, day.year, day.month, category_id)
+                total = totals.get(key)
+                if total is None:
+                    totals[key] = [price * item_count, 1]
+                else:
+                    total[0] += price * item_count
+                    total[1] += 1
+                yield (user_id, names[int(rng.random() * len(names))], price, category_id, '', item_count, day)
+
+    def limits(self):
+        """Monthly limits of 80-130% of the user's actual spend in that month, rounded to 10 major units"""
+        limiting = {plan[0] for plan in self._plans if plan[4]}
+        monthly = {}
+        for (user_id, year, month, _), (total, _) in self._monthly_totals.items():
+            if user_id in limiting:
+                monthly[user_id, year, month] = monthly.get((user_id, year, month), 0) + total
+        scales = {user[0]: CURRENCY_SCALES[user[5]] for user in self.users}
+        rng = random.Random(self.rng.random())
+        rows = []
+        for (user_id, year, month), total in sorted(monthly.items()):
+            step = 10 * scales[user_id]
+            amount = max(step, round(total * rng.uniform(0.8, 1.3) / step) * step)
+            rows.append((user_id, amount, month, self.layout.year_ids[year]))
+        return rows
+
+    def rollup(self):
+        return [(*key, total, count) for key, (total, count) in self._monthly_totals.items()]
+
+
+# ===================== LOADING =====================
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    if value.__class__ is str:
+        return value.translate(_COPY_ESCAPES)
+    return str(value)  # numbers, dates and booleans never need escaping
+
+
+def copy_lines(rows):
+    """Rows as COPY text format: tab-separated, \\N for NULL, one line per row"""
+    return ''.join('\t'.join(map(copy_value, row)) + '\n' for row in rows)
+
+
+def load_rows(connection, table, columns, rows):
+    """Write rows (tuples in `columns` order) into table; COPY on PostgreSQL. Returns the row count"""
+    loaded = 0
+    if connection.dialect.name == 'postgresql':
+        preparer = connection.dialect.identifier_preparer
+        statement = (f'COPY {preparer.format_table(table)} '
+                     f'({", ".join(preparer.quote(column) for column in columns)}) FROM STDIN')
+        cursor = connection.connection.cursor()
+        for batch in chunked(rows, COPY_BATCH_ROWS):
+            cursor.copy_expert(statement, io.StringIO(copy_lines(batch)))
+            loaded += len(batch)
+        cursor.close()
+    else:
+        for batch in chunked(rows, INSERT_BATCH_ROWS):
+            connection.execute(table.insert(), [dict(zip(columns, row)) for row in batch])
+            loaded += len(batch)
+    return loaded
+
+
+def load_chunk(engine, metadata, population, layout, first_index, count):
+    """Generate and load one chunk in a single transaction; returns rows loaded per table"""
+    tables = metadata.tables
+    chunk = ChunkGenerator(population, layout, first_index, count)
+    with engine.begin() as connection:
+        return {
+            'user': load_rows(connection, tables['user'], USER_COLUMNS, chunk.users),
+            'expense_category': load_rows(connection, tables['expense_category'], CATEGORY_COLUMNS,
+                                          chunk.categories),
+            'expense': load_rows(connection, tables['expense'], EXPENSE_COLUMNS, chunk.expenses()),
+            'monthly_limit': load_rows(connection, tables['monthly_limit'], LIMIT_COLUMNS, chunk.limits()),
+            'monthly_spend_rollup': load_rows(connection, tables['monthly_spend_rollup'], ROLLUP_COLUMNS,
+                                              chunk.rollup()),
+        }
+
+
+def prepare_layout(engine, metadata, population):
+    """Seed reference data and the population's years, and reserve id ranges after the existing rows"""
+    tables = metadata.tables
+    user, category, year = tables['user'], tables['expense_category'], tables['year']
+    with engine.begin() as connection:
+        seed_reference_data(connection, metadata)
+        insert_ignoring_conflicts(connection, year, [{'year_number': number} for number in population.years],
+                                  ['year_number'])
+        year_ids = dict(connection.execute(
+            select(year.c.year_number, year.c.year_id).where(year.c.year_number.in_(list(population.years)))
+        ).all())
+        global_categories = {
+            name: category_id for name, category_id in connection.execute(
+                select(category.c.expense_category_name, category.c.expense_category_id)
+                .where(category.c.user_id.is_(None), category.c.is_deleted.is_(False))
+            ) if name in CATEGORY_PROFILES
+        }
+        first_user_id = (connection.execute(select(func.max(user.c.user_id))).scalar() or 0) + 1
+        first_category_id = (connection.execute(select(func.max(category.c.expense_category_id))).scalar() or 0) + 1
+    if not global_categories:
+        raise ValueError('No global categories to generate expenses for')
+    return Layout(first_user_id, first_category_id, global_categories, year_ids)
+
+
+def sync_sequences(engine, metadata):
+    """Move the PostgreSQL id sequences past the explicitly numbered users and categories"""
+    if engine.dialect.name != 'postgresql':
+        return
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as connection:
+        for table_name, column in (('user', 'user_id'), ('expense_category', 'expense_category_id')):
+            table = preparer.format_table(metadata.tables[table_name])
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence(:table, :column), "
+                f"(SELECT COALESCE(MAX({column}), 1) FROM {table}))"
+            ), {'table': table, 'column': column})
+
+
+_worker = {}
+
+
+def _init_worker(url, metadata, population, layout):
+    _worker.update(engine=create_engine(url, pool_size=1, max_overflow=0), metadata=metadata,
+                   population=population, layout=layout)
+
+
+def _load_chunk_in_worker(bounds):
+    return load_chunk(_worker['engine'], _worker['metadata'], _worker['population'], _worker['layout'], *bounds)
+
+
+def generate_population(engine, metadata, population, workers=1, chunk_users=500, progress=None):
+    """Generate and load a population; returns rows loaded per table.
+
+    With workers > 1 on PostgreSQL, chunks are loaded by that many processes
+    with their own connections. Other databases load in this process.
+    progress(totals) is called after every chunk.
+    """
+    layout = prepare_layout(engine, metadata, population)
+    bounds = [
+        (first_index, min(chunk_users, population.users - first_index))
+        for first_index in range(0, population.users, chunk_users)
+    ]
+    totals = dict.fromkeys(('user', 'expense_category', 'expense', 'monthly_limit', 'monthly_spend_rollup'), 0)
+
+    def add(counts):
+        for table_name, count in counts.items():
+            totals[table_name] += count
+        if progress:
+            progress(totals)
+
+    try:
+        if workers > 1 and engine.dialect.name == 'postgresql':
+            url = engine.url.render_as_string(hide_password=False)
+            engine.dispose()  # forked workers must not share the parent's connections
+            with multiprocessing.Pool(workers, _init_worker, (url, metadata, population, layout)) as pool:
+                for counts in pool.imap_unordered(_load_chunk_in_worker, bounds):
+                    add(counts)
+        else:
+            for first_index, count in bounds:
+                add(load_chunk(engine, metadata, population, layout, first_index, count))
+    finally:
+        sync_sequences(engine, metadata)
+    return totals
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers.
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:app
+
+Importing the app does not touch the database. Tables and reference data
+are created by bootstrap_database(), which gunicorn.conf.py runs once in the
+master and create_tables.py runs on demand.
+"""
+
+from app_integrated import app
+
+application = app  # name some WSGI hosts look for
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite with a seeded dataset and a stored baseline.
+
+Boots the app in-process and drives it through the Flask test client
+against a local database seeded with one user per data size (default 100,
+10k and 1M expenses over five years). The data comes from a fixed random
+seed, so every run sees the same rows. For each endpoint and size it
+records the median and p95 latency and the SQL statement count, taken
+from the SQL profiler's X-SQL-Profile report.
+
+Results are compared with benchmarks/baselines/endpoint_benchmark.json.
+The run fails (exit 1) when:
+  * an endpoint issues more SQL statements than in the baseline, or
+  * its median latency exceeds the baseline by more than --tolerance
+    (and by more than --min-delta-ms, so sub-millisecond jitter passes).
+
+    python3 benchmarks/endpoint_benchmark.py                      # compare
+    python3 benchmarks/endpoint_benchmark.py --update-baseline    # record
+    python3 benchmarks/endpoint_benchmark.py --sizes 100,10000 --iterations 50
+
+The database defaults to a SQLite file in the temp dir; seeded users are
+reused across runs. Set DATABASE_URL to benchmark PostgreSQL instead;
+latency baselines are only compared against runs on the same database
+type.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, timedelta
+
+# Add the app directory to the path
+app_path = os.path.join(os.path.dirname(__file__), '..', 'app')
+sys.path.insert(0, app_path)
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'expense_benchmark.db')}")
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+warnings.filterwarnings('ignore', module='jwt')  # short development SECRET_KEY
+
+from app_integrated import (  # noqa: E402
+    app, db, bootstrap_database, create_access_token, rebuild_user_spend_rollup, sql_profiler,
+    Expense, ExpenseCategory, MonthlyLimit, User
+)
+from expense_import import insert_expenses  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'endpoint_benchmark.json')
+DEFAULT_SIZES = (100, 10_000, 1_000_000)
+FIRST_YEAR = 2021
+YEARS = 5
+SEED = 20240101
+ADDED_EXPENSE_NAME = 'benchmark add_expense'
+
+
+# ===================== DATASET =====================
+
+def generate_expenses(user_id, count, category_ids, seed):
+    """Yield `count` expense rows spread over YEARS years, reproducible for a seed"""
+    rng = random.Random(seed)
+    first_day = date(FIRST_YEAR, 1, 1)
+    days = (date(FIRST_YEAR + YEARS, 1, 1) - first_day).days
+    for i in range(count):
+        yield {
+            'user_id': user_id,
+            'expense_name': f'Expense {i}',
+            'expense_item_price': int(rng.lognormvariate(7, 1)),  # minor units, median about 11.00
+            'expense_category_id': rng.choice(category_ids),
+            'expense_description': '',
+            'expense_item_count': 1 if rng.random() < 0.9 else rng.randint(2, 5),
+            'expenditure_date': first_day + timedelta(days=rng.randrange(days)),
+        }
+
+
+def seed_user(size):
+    """Return the user_id of the benchmark user with exactly `size` expenses, seeding it if needed"""
+    username = f'bench_{size}'
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        user = User(username=username, email=f'{username}@example.com', name=username, currency_id=1)
+        db.session.add(user)
+        db.session.commit()
+    existing = Expense.query.filter_by(user_id=user.user_id).count()
+    if existing == size:
+        return user.user_id
+
+    print(f"   Seeding {size:,} expenses for {username}...")
+    start = time.perf_counter()
+    Expense.query.filter_by(user_id=user.user_id).delete()
+    category_ids = [
+        category_id for (category_id,) in
+        db.session.query(ExpenseCategory.expense_category_id).filter(ExpenseCategory.user_id.is_(None))
+    ]
+    insert_expenses(db.session, Expense.__table__,
+                    generate_expenses(user.user_id, size, category_ids, SEED + size), chunk_size=20_000)
+    rebuild_user_spend_rollup(user.user_id)
+    user.data_version = (user.data_version or 0) + 1
+    db.session.commit()
+    print(f"   ✓ {size:,} expenses in {time.perf_counter() - start:.1f}s")
+    return user.user_id
+
+
+def reset_user(user_id):
+    """Undo what add_expense and put_limits wrote, so every run starts from the same data"""
+    Expense.query.filter_by(user_id=user_id, expense_name=ADDED_EXPENSE_NAME).delete()
+    MonthlyLimit.query.filter_by(user_id=user_id).delete()
+    rebuild_user_spend_rollup(user_id)
+    db.session.commit()
+
+
+# ===================== CASES =====================
+
+def benchmark_cases(year, month):
+    """(name, method, path, json body) for each measured request"""
+    return [
+        ('get_expenses_month', 'GET', f'/api/expenses?year={year}&month={month}', None),
+        ('get_expenses_page', 'GET', '/api/expenses?limit=100', None),
+        ('get_summary_monthly', 'GET', f'/api/summary?type=monthly&year={year}&month={month}', None),
+        ('get_summary_yearly', 'GET', f'/api/summary?type=yearly&year={year}', None),
+        ('get_summary_custom', 'GET',
+         f'/api/summary?type=custom&start_date={year}-02-10&end_date={year}-05-20', None),
+        ('get_limits', 'GET', f'/api/limits?year={year}', None),
+        ('get_limit', 'GET', f'/api/limit?year={year}&month={month}', None),
+        ('put_limits', 'PUT', f'/api/limits?year={year}',
+         {'limits': {str(m): 1000 + m for m in range(1, 13)}}),
+        ('add_expense', 'POST', '/api/expenses', {
+            'year': year, 'month': month,
+            'expense': {'category_id': None, 'amount': 12.5, 'name': ADDED_EXPENSE_NAME,
+                        'date': f'{year}-{month:02d}-15'}
+        }),
+    ]
+
+
+def measure(client, headers, method, path, body, iterations, warmup):
+    """Return (latencies in ms, statements per request, most repeats of one SQL shape)"""
+    latencies = []
+    report = None
+    for i in range(warmup + iterations):
+        start = time.perf_counter()
+        response = client.open(path, method=method, json=body, headers=headers)
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f'{method} {path} returned {response.status_code}: {response.get_data(as_text=True)}')
+        if i >= warmup:
+            latencies.append(elapsed)
+            report = json.loads(response.headers['X-SQL-Profile'])
+    repeats = max([shape['count'] for shape in report['repeated']], default=1)
+    return latencies, report['statements'], repeats
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_suite(sizes, iterations, warmup):
+    results = {}
+    client = app.test_client()
+    year, month = FIRST_YEAR + YEARS - 1, 3
+    for size in sizes:
+        with app.app_context():
+            user_id = seed_user(size)
+            reset_user(user_id)
+            category_id = db.session.query(ExpenseCategory.expense_category_id).filter(
+                ExpenseCategory.user_id.is_(None)).order_by(ExpenseCategory.expense_category_id).first()[0]
+        token = create_access_token({'user_id': user_id, 'username': f'bench_{size}', 'email': ''})
+        headers = {'Authorization': f'Bearer {token}', 'X-SQL-Profile': '1'}
+
+        for name, method, path, body in benchmark_cases(year, month):
+            if name == 'add_expense':
+                body['expense']['category_id'] = category_id
+            # Large months return tens of thousands of rows; keep the run time bounded
+            runs = max(3, iterations // 10) if size >= 1_000_000 and name == 'get_expenses_month' else iterations
+            latencies, statements, repeats = measure(client, headers, method, path, body, runs, warmup)
+            key = f'{name}@{size}'
+            results[key] = {
+                'median_ms': round(statistics.median(latencies), 3),
+                'p95_ms': round(percentile(latencies, 0.95), 3),
+                'queries': statements,
+                'max_repeats': repeats,
+            }
+            print(f"   {key:<34} {results[key]['median_ms']:>9.2f} {results[key]['p95_ms']:>9.2f} "
+                  f"{statements:>8} {repeats:>8}")
+
+        with app.app_context():
+            reset_user(user_id)
+    return results
+
+
+# ===================== BASELINE =====================
+
+def compare(results, baseline, tolerance, min_delta_ms, same_database):
+    """Return regression messages; query counts always, latency only on the same database type"""
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append(f"{key}: {result['queries']} queries (baseline {expected['queries']})")
+        slower_ms = result['median_ms'] - expected['median_ms']
+        if same_database and slower_ms > expected['median_ms'] * tolerance and slower_ms > min_delta_ms:
+            regressions.append(
+                f"{key}: median {result['median_ms']:.2f} ms (baseline {expected['median_ms']:.2f} ms, "
+                f"+{tolerance:.0%} allowed)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='comma-separated expenses per user')
+    parser.add_argument('--iterations', type=int, default=30, help='measured requests per case')
+    parser.add_argument('--warmup', type=int, default=3, help='unmeasured requests per case')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed median slowdown vs. the baseline (0.5 = 50%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                        help='ignore median slowdowns smaller than this, whatever the ratio')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='write the results as the new baseline')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    logging.getLogger('sql_profiler').setLevel(logging.ERROR)  # repeats are reported below instead
+    sql_profiler.enable()
+    sql_profiler.slow_seconds = 0
+
+    with app.app_context():
+        bootstrap_database()
+        database = db.engine.dialect.name
+
+    print(f"⏱️  Endpoint benchmark ({database}, sizes {', '.join(f'{size:,}' for size in sizes)})")
+    print("=" * 50)
+    print(f"   {'case':<34} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'repeats':>8}")
+    results = run_suite(sizes, args.iterations, args.warmup)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        baseline = {'database': database, 'results': results}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            if previous.get('database') == database:
+                baseline['results'] = {**previous['results'], **results}
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\n💾 Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️  No baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['results'], args.tolerance, args.min_delta_ms,
+                          baseline.get('database') == database)
+    if regressions:
+        print("\n❌ Regressions against the baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+    print("\n✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark of JSON response serialization.
+
+Builds a 10k-expense payload and times three ways of turning it into a
+Flask response:
+
+    dicts + stdlib    per-row dicts with date.isoformat(), Flask's default provider
+    tuples + stdlib   rows zipped straight into objects, FastJSONProvider (stdlib)
+    tuples + orjson   rows zipped straight into objects, FastJSONProvider (orjson)
+
+No database is needed.
+
+    python3 benchmarks/json_benchmark.py --rows 10000 --iterations 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+# Add the app directory to the path
+app_path = os.path.join(os.path.dirname(__file__), '..', 'app')
+sys.path.insert(0, app_path)
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app_integrated import ALL_EXPENSE_FIELDS, app, project_expense_row  # noqa: E402
+from json_provider import FastJSONProvider, orjson_dumps, stdlib_dumps  # noqa: E402
+
+
+def synthetic_rows(count):
+    """Tuples shaped like query_expense_page rows (fields, then cursor columns)"""
+    start = date(2015, 1, 1)
+    rows = []
+    for i in range(count):
+        day = start + timedelta(days=i % 3650)
+        rows.append((i, f'Expense {i}', 12.5 + i % 100, 1 + i % 9, 'Food & Dining',
+                     'Weekly groceries', 1, day, day, i))
+    return rows
+
+
+def legacy_dict(row):
+    """The per-row dict the endpoints built before the provider handled dates"""
+    return {
+        'expense_id': row[0],
+        'expense_name': row[1] or '',
+        'expense_item_price': row[2],
+        'expense_category_id': row[3],
+        'expense_category_name': row[4] or 'Unknown',
+        'expense_description': row[5] or '',
+        'expense_item_count': row[6],
+        'expenditure_date': row[7].isoformat()
+    }
+
+
+def time_response(provider, build, rows, iterations):
+    """Return mean milliseconds per response and the body size"""
+    times = []
+    with app.app_context():
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = provider.response(build(rows))
+            times.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(times), len(response.get_data())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows)
+    from_dicts = lambda rows: [legacy_dict(row) for row in rows]  # noqa: E731
+    from_tuples = lambda rows: [project_expense_row(row, ALL_EXPENSE_FIELDS) for row in rows]  # noqa: E731
+
+    default_provider = DefaultJSONProvider(app)
+    default_provider.compact = True  # FLASK_DEBUG would otherwise indent the baseline
+    cases = [('dicts + stdlib', default_provider, from_dicts),
+             ('tuples + stdlib', FastJSONProvider(app, stdlib_dumps), from_tuples)]
+    if orjson_dumps is not None:
+        cases.append(('tuples + orjson', FastJSONProvider(app, orjson_dumps), from_tuples))
+    else:
+        print("⚠️  orjson is not installed; skipping the orjson case")
+
+    print(f"🧾 JSON serialization of {args.rows:,} expenses")
+    print("=" * 50)
+    baseline = None
+    for label, provider, build in cases:
+        mean_ms, size = time_response(provider, build, rows, args.iterations)
+        baseline = baseline or mean_ms
+        print(f"   {label:16s} {mean_ms:8.2f} ms   {args.rows / mean_ms * 1000:12,.0f} rows/s"
+              f"   {baseline / mean_ms:5.1f}x   ({size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Load test a running API with the dashboard's request mix.
+
+Each client thread holds one keep-alive connection and sends requests drawn
+from DASHBOARD_MIX (weighted like a dashboard load: the year bundle, the
+month's expenses, summaries, limits and reference data) for --duration
+seconds after a --warmup period. Prints throughput and latency percentiles
+overall and per route.
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:app &
+    python3 benchmarks/load_test.py --url http://localhost:5002 --user-id 1 --concurrency 32
+
+Without --token, a token for --user-id is signed with SECRET_KEY from the
+environment (.env), which must match the server's.
+"""
+
+import argparse
+import http.client
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+import jwt
+from dotenv import load_dotenv
+
+# (label, path template, weight)
+DASHBOARD_MIX = [
+    ('year_bundle', '/api/year_bundle?year={year}', 2),
+    ('expenses', '/api/expenses?year={year}&month={month}', 4),
+    ('summary_monthly', '/api/summary?type=monthly&year={year}&month={month}', 2),
+    ('summary_yearly', '/api/summary?type=yearly&year={year}', 1),
+    ('limit', '/api/limit?year={year}&month={month}', 1),
+    ('global_limit', '/api/global_limit', 1),
+    ('categories', '/api/categories', 1),
+    ('currencies', '/api/currencies', 1),
+]
+
+
+def sign_token(user_id):
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+    payload = {
+        'user_id': user_id,
+        'username': f'loadtest_{user_id}',
+        'email': f'loadtest_{user_id}@example.com',
+        'exp': datetime.now(timezone.utc) + timedelta(hours=1),
+    }
+    return jwt.encode(payload, os.getenv('SECRET_KEY', 'your-secret-key-here'), algorithm='HS256')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Client(threading.Thread):
+    """One keep-alive connection sending weighted random requests until stopped"""
+
+    def __init__(self, url, headers, requests, weights, seed, state):
+        super().__init__(daemon=True)
+        self.url = url
+        self.headers = headers
+        self.requests = requests
+        self.weights = weights
+        self.random = random.Random(seed)
+        self.state = state
+        self.latencies = defaultdict(list)  # label -> seconds, measured requests only
+        self.statuses = defaultdict(int)
+        self.errors = 0
+
+    def connect(self):
+        connection_class = http.client.HTTPSConnection if self.url.scheme == 'https' else http.client.HTTPConnection
+        return connection_class(self.url.hostname, self.url.port, timeout=30)
+
+    def run(self):
+        connection = self.connect()
+        while not self.state['stop'].is_set():
+            label, path = self.random.choices(self.requests, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=self.headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = self.connect()
+                status = None
+            elapsed = time.perf_counter() - start
+            if not self.state['measuring'].is_set():
+                continue
+            if status is None or status >= 400:
+                self.errors += 1
+            if status is not None:
+                self.statuses[status] += 1
+            self.latencies[label].append(elapsed)
+        connection.close()
+
+
+def report(label, latencies, duration):
+    latencies.sort()
+    count = len(latencies)
+    print(f"   {label:<16} {count:>8,} {count / duration:>9.1f} "
+          f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+          f"{percentile(latencies, 0.99) * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5002')
+    parser.add_argument('--user-id', type=int, default=1)
+    parser.add_argument('--token', help='bearer token to send instead of signing one')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads (connections)')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds before measuring')
+    parser.add_argument('--year', type=int, default=datetime.now().year)
+    parser.add_argument('--month', type=int, default=datetime.now().month)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    headers = {'Authorization': f'Bearer {args.token or sign_token(args.user_id)}', 'Accept-Encoding': 'identity'}
+    requests = [(label, template.format(year=args.year, month=args.month)) for label, template, _ in DASHBOARD_MIX]
+    weights = [weight for _, _, weight in DASHBOARD_MIX]
+
+    state = {'stop': threading.Event(), 'measuring': threading.Event()}
+    clients = [Client(url, headers, requests, weights, args.seed + i, state) for i in range(args.concurrency)]
+
+    print(f"🔥 Load test: {args.url}, {args.concurrency} connections, {args.duration:g}s (+{args.warmup:g}s warmup)")
+    print("=" * 50)
+    for client in clients:
+        client.start()
+    time.sleep(args.warmup)
+    state['measuring'].set()
+    time.sleep(args.duration)
+    state['stop'].set()
+    for client in clients:
+        client.join()
+
+    by_route = defaultdict(list)
+    statuses = defaultdict(int)
+    errors = 0
+    for client in clients:
+        for label, latencies in client.latencies.items():
+            by_route[label].extend(latencies)
+        for status, count in client.statuses.items():
+            statuses[status] += count
+        errors += client.errors
+
+    print(f"   {'route':<16} {'requests':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, _, _ in DASHBOARD_MIX:
+        report(label, by_route[label], args.duration)
+    print("-" * 50)
+    report('total', [latency for latencies in by_route.values() for latency in latencies], args.duration)
+    print(f"\n   status codes: {dict(sorted(statuses.items()))}")
+    print(f"   errors:       {errors:,}")
+
+
+if __name__ == "__main__":
+    main()
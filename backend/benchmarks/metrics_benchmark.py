@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the per-request cost of the Prometheus instrumentation.
+
+Times the request hooks on their own, then sends the same cached request
+(GET /api/currencies, no SQL once warm) through the Flask test client with
+the request metrics disabled and enabled, in alternating rounds. Set
+PROMETHEUS_MULTIPROC_DIR to measure the gunicorn (mmap-backed) mode.
+
+    python3 benchmarks/metrics_benchmark.py --requests 20000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the app directory to the path
+app_path = os.path.join(os.path.dirname(__file__), '..', 'app')
+sys.path.insert(0, app_path)
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from flask import Response, request  # noqa: E402
+
+from app_integrated import app, bootstrap_database, request_metrics  # noqa: E402
+
+
+def time_hooks(iterations):
+    """Mean microseconds for one request's before/after/teardown hooks"""
+    request_metrics.enabled = True
+    response = Response('{}', mimetype='application/json')
+    with app.test_request_context('/api/currencies'):
+        request.url_rule = app.url_map.bind('localhost').match('/api/currencies', return_rule=True)[0]
+        start = time.perf_counter()
+        for _ in range(iterations):
+            request_metrics._before_request()
+            request_metrics._after_request(response)
+            request_metrics._teardown_request()
+        return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def time_requests(client, requests, rounds=7):
+    """Median microseconds per request (without, with metrics), alternating rounds to cancel drift"""
+    samples = {False: [], True: []}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            request_metrics.enabled = enabled
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get('/api/currencies')
+            samples[enabled].append((time.perf_counter() - start) / requests * 1_000_000)
+    return statistics.median(samples[False]), statistics.median(samples[True])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per round')
+    parser.add_argument('--iterations', type=int, default=50_000, help='hook iterations')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    with app.app_context():
+        bootstrap_database()
+    client = app.test_client()
+    for _ in range(200):
+        client.get('/api/currencies')  # warm the reference cache
+
+    hooks = time_hooks(args.iterations)
+    without_metrics, with_metrics = time_requests(client, args.requests)
+
+    mode = 'multiprocess' if os.getenv('PROMETHEUS_MULTIPROC_DIR') else 'single process'
+    print(f"📈 Metrics overhead per request ({mode})")
+    print("=" * 50)
+    print(f"   request hooks alone:       {hooks:8.1f} µs")
+    print(f"   test client, without:      {without_metrics:8.1f} µs")
+    print(f"   test client, with metrics: {with_metrics:8.1f} µs")
+    print(f"   end-to-end difference:     {with_metrics - without_metrics:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
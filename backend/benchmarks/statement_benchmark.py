@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark of PDF statement rendering.
+
+Renders synthetic monthly and yearly statements in-process to get the
+time per statement, then pushes a batch through StatementRenderer's worker
+pool to get throughput. No database is needed.
+
+    python3 benchmarks/statement_benchmark.py --iterations 50 --workers 4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the app directory to the path
+app_path = os.path.join(os.path.dirname(__file__), '..', 'app')
+sys.path.insert(0, app_path)
+
+from statements import StatementRenderer, render_statement_pdf  # noqa: E402
+
+
+def synthetic_statement(months, categories):
+    """A statement shaped like build_statement() output"""
+    return {
+        'title': 'Yearly statement: 2025' if months == 12 else 'Monthly statement: March 2025',
+        'subtitle': 'Benchmark User',
+        'currency_name': 'US Dollar',
+        'currency_symbol': '$',
+        'total': 1234.5 * categories,
+        'count': 40 * categories,
+        'categories': [(f'Category {i}', 1234.5, 40) for i in range(categories)],
+        'limits': [(f'Month {m}', 2000.0, 1500.0) for m in range(1, months + 1)]
+    }
+
+
+def time_renders(statement, iterations):
+    """Return per-render times in milliseconds and the PDF size"""
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        pdf = render_statement_pdf(statement)
+        times.append((time.perf_counter() - start) * 1000)
+    return times, len(pdf)
+
+
+def time_pool(statement, count, workers):
+    """Return statements per second rendered to disk through the worker pool"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        renderer = StatementRenderer(cache_dir, max_workers=workers)
+        try:
+            # Start the workers outside the measurement
+            renderer.submit(renderer.path_for(0, 'warmup', 0), statement)
+            renderer.join()
+            start = time.perf_counter()
+            for user_id in range(1, count + 1):
+                renderer.submit(renderer.path_for(user_id, '2025', 1), statement)
+            renderer.join()
+            return count / (time.perf_counter() - start)
+        finally:
+            renderer.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--categories', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--pool-statements', type=int, default=100)
+    args = parser.parse_args()
+
+    print("📄 Statement render time")
+    print("=" * 50)
+    for label, months in (('monthly', 1), ('yearly', 12)):
+        statement = synthetic_statement(months, args.categories)
+        render_statement_pdf(statement)  # warm up fonts and imports
+        times, size = time_renders(statement, args.iterations)
+        p95 = sorted(times)[int(len(times) * 0.95) - 1]
+        print(f"   {label:8s} mean {statistics.mean(times):7.2f} ms   p50 {statistics.median(times):7.2f} ms"
+              f"   p95 {p95:7.2f} ms   ({size:,} bytes)")
+
+    throughput = time_pool(synthetic_statement(12, args.categories), args.pool_statements, args.workers)
+    print(f"   pool ({args.workers} workers): {throughput:,.1f} yearly statements/s")
+
+
+if __name__ == "__main__":
+    main()
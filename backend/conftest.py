@@ -0,0 +1,104 @@
+"""
+Shared pytest fixtures for the Flask API.
+
+The app is imported against an in-memory SQLite database so the tests run
+without a PostgreSQL server.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+
+# Must be set before app_integrated is imported (load_dotenv does not override it)
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+app_path = os.path.join(os.path.dirname(__file__), 'app')
+sys.path.insert(0, app_path)
+
+from app_integrated import (  # noqa: E402
+    app, db, User, Expense, ExpenseCategory, create_access_token, token_cache,
+    reference_cache, spend_index_cache, apply_spend_delta, bump_data_version
+)
+from money import to_minor  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    token_cache.clear()
+    reference_cache.invalidate()
+    spend_index_cache.clear()
+    with app.app_context():
+        db.create_all()
+        try:
+            yield app.test_client()
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+@pytest.fixture
+def user(client):
+    user = User(username='tester', email='tester@example.com', name='Tester')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    token = create_access_token({
+        'user_id': user.user_id,
+        'username': user.username,
+        'email': user.email
+    })
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def category(user):
+    category = ExpenseCategory(expense_category_name='Food & Dining', user_id=None, is_deleted=False)
+    db.session.add(category)
+    db.session.commit()
+    return category
+
+
+def add_expenses(user_id, category_id, count, expenditure_date=date(2025, 3, 10), price=10.0):
+    """Insert `count` identical expenses for a user, keeping the rollup and data_version in step.
+
+    `price` is in major units of the default two-digit currency.
+    """
+    price = to_minor(price, 100)
+    db.session.add_all([
+        Expense(
+            user_id=user_id,
+            expense_name=f'Expense {i}',
+            expense_item_price=price,
+            expense_category_id=category_id,
+            expense_item_count=1,
+            expenditure_date=expenditure_date
+        )
+        for i in range(count)
+    ])
+    apply_spend_delta(user_id, expenditure_date, category_id, price * count, count)
+    bump_data_version(user_id)
+    db.session.commit()
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed on the app engine inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
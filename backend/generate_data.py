@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Script to fill the database with synthetic users and expenses for scale testing.
+
+Users get a power-law number of expenses, seasonal dates, their own currency
+and spend level, optional custom categories and monthly limits (see
+app/synthetic_data.py). Rows are loaded with COPY by --workers parallel
+processes on PostgreSQL; on other databases in one process with INSERTs.
+
+    python generate_data.py --users 10000 --expenses 1000000
+    python generate_data.py --users 1000000 --expenses 100000000 --workers 16
+    python generate_data.py --users 500 --expenses 50000 --start 2024-01-01 --end 2024-12-31 --seed 7
+
+New users are numbered after the existing ones and named <prefix><user_id>.
+Run it against a database nobody is signing up to meanwhile.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# Add the app directory to the path
+app_path = os.path.join(os.path.dirname(__file__), 'app')
+sys.path.insert(0, app_path)
+
+from db import Base, engine  # noqa: E402
+import models  # noqa: E402,F401  (registers the tables on Base.metadata)
+from synthetic_data import CUSTOM_CATEGORIES, Population, generate_population  # noqa: E402
+
+
+def parse_args():
+    today = date.today()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, required=True, help='users to create')
+    parser.add_argument('--expenses', type=int, required=True, help='expected total expenses across all users')
+    parser.add_argument('--start', type=date.fromisoformat, default=date(today.year - 2, 1, 1),
+                        help='first expense date, YYYY-MM-DD (default: January 1st two years ago)')
+    parser.add_argument('--end', type=date.fromisoformat, default=today, help='last expense date (default: today)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='loading processes on PostgreSQL (default: CPU count)')
+    parser.add_argument('--chunk-users', type=int, default=500, help='users generated and committed together')
+    parser.add_argument('--seed', type=int, default=1, help='random seed; the same seed gives the same data')
+    parser.add_argument('--pareto-alpha', type=float, default=1.5,
+                        help='shape of the expenses-per-user distribution; lower is more skewed (default 1.5)')
+    parser.add_argument('--custom-category-share', type=float, default=0.4,
+                        help='fraction of users with custom categories')
+    parser.add_argument('--max-custom-categories', type=int, default=4,
+                        help=f'custom categories per user, at most {len(CUSTOM_CATEGORIES)}')
+    parser.add_argument('--limit-share', type=float, default=0.3, help='fraction of users with monthly limits')
+    parser.add_argument('--prefix', default='synthetic_', help='username prefix')
+    return parser.parse_args()
+
+
+def generate():
+    args = parse_args()
+    try:
+        population = Population(
+            args.users, args.expenses, args.start, args.end,
+            seed=args.seed,
+            pareto_alpha=args.pareto_alpha,
+            custom_category_share=args.custom_category_share,
+            max_custom_categories=args.max_custom_categories,
+            limit_share=args.limit_share,
+            username_prefix=args.prefix
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    workers = args.workers if engine.dialect.name == 'postgresql' else 1
+
+    print("🧪 Synthetic Data Generator")
+    print("=" * 50)
+    print(f"📊 Database URL: {engine.url.render_as_string(hide_password=True)}")
+    print(f"👥 {args.users:,} users, ~{args.expenses:,} expenses, {args.start} to {args.end}")
+    print(f"⚙️  {workers} worker{'s' if workers != 1 else ''}, "
+          f"{'COPY' if engine.dialect.name == 'postgresql' else 'INSERT'}, seed {args.seed}")
+    print("=" * 50)
+
+    started = time.perf_counter()
+
+    def show_progress(totals):
+        elapsed = time.perf_counter() - started
+        print(f"\r   {totals['user']:,} users, {totals['expense']:,} expenses "
+              f"({totals['expense'] / elapsed:,.0f} rows/s)", end='', flush=True)
+
+    try:
+        totals = generate_population(engine, Base.metadata, population, workers=workers,
+                                     chunk_users=args.chunk_users, progress=show_progress)
+    except Exception as e:
+        print(f"\n❌ Generation failed: {e}")
+        print("   Chunks committed before the failure are kept")
+        return False
+
+    print("\n" + "=" * 50)
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+    for table_name, count in totals.items():
+        print(f"   ✓ {table_name}: {count:,} rows")
+    print("=" * 50)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if generate() else 1)
@@ -0,0 +1,146 @@
+"""
+Gunicorn configuration for the Flask API.
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is imported once in the master (preload_app) and forked into the
+workers. Each worker then drops the database connections it inherited and
+restarts its own log listener, so no socket or thread is shared across
+processes. With the gevent worker class the master is monkey-patched (and
+psycopg2 made cooperative via psycogreen) before anything imports the app, so
+the engine, its locks and the log listener are created on gevent primitives.
+Everything is tuned from the environment:
+
+    HOST / PORT                   bind address (default 0.0.0.0:5002)
+    WEB_CONCURRENCY               worker processes (default 2 x CPUs + 1, capped by DB_MAX_CONNECTIONS)
+    GUNICORN_WORKER_CLASS         gthread (default) or gevent
+    GUNICORN_THREADS              threads per gthread worker (default 4)
+    GUNICORN_WORKER_CONNECTIONS   concurrent requests per gevent worker (default 100)
+    GUNICORN_TIMEOUT              seconds before a silent worker is killed (default 30)
+    GUNICORN_GRACEFUL_TIMEOUT     seconds workers get to finish requests on shutdown (default 30)
+    GUNICORN_KEEPALIVE            seconds to hold idle keep-alive connections (default 5)
+    GUNICORN_MAX_REQUESTS         recycle a worker after this many requests, 0 = never (default 0)
+    GUNICORN_MAX_REQUESTS_JITTER  random spread added to max_requests (default 0)
+    GUNICORN_PRELOAD              import the app in the master before forking (default true)
+    GUNICORN_ACCESS_LOG           access log target, e.g. "-" for stdout (default off)
+    DB_MAX_CONNECTIONS            database connections all workers may open together (default 90)
+    DB_BOOTSTRAP                  create tables and seed reference data in the master (default true)
+    PROMETHEUS_MULTIPROC_DIR      where workers share /metrics values (default a per-port temp dir)
+
+Each worker has its own connection pool of up to DB_POOL_SIZE +
+DB_MAX_OVERFLOW connections, so without WEB_CONCURRENCY the worker count is
+
+    min(2 x CPUs + 1, DB_MAX_CONNECTIONS // (DB_POOL_SIZE + DB_MAX_OVERFLOW)), at least 1
+
+e.g. 90 // (5 + 10) = 6 workers with the defaults. Set DB_MAX_CONNECTIONS a
+little below PostgreSQL's max_connections (default 100, minus what migrations
+and admin sessions need) or PgBouncer's pool. An explicit WEB_CONCURRENCY that
+exceeds the budget is logged as a warning at startup. Keep GUNICORN_THREADS at
+or below DB_POOL_SIZE so threads rarely wait for a connection.
+"""
+
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app')
+sys.path.insert(0, APP_DIR)
+
+from db_config import env_bool, env_int  # noqa: E402
+
+# Same working directory as `python3 app_integrated.py`, so relative paths
+# (the SQLite dev database) resolve the same way
+chdir = APP_DIR
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{env_int('PORT', 5002)}"
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+# Patch before the master imports the app (preload_app, on_starting); patching
+# only in the forked worker would leave the engine on unpatched sockets and locks
+psycogreen_patched = False
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()  # let psycopg2 yield to other greenlets while waiting on PostgreSQL
+        psycogreen_patched = True
+    except ImportError:
+        pass
+
+connections_per_worker = env_int('DB_POOL_SIZE', 5) + env_int('DB_MAX_OVERFLOW', 10)
+max_connections = env_int('DB_MAX_CONNECTIONS', 90)
+workers = env_int(
+    'WEB_CONCURRENCY',
+    max(1, min(multiprocessing.cpu_count() * 2 + 1, max_connections // connections_per_worker))
+)
+threads = env_int('GUNICORN_THREADS', 4)
+worker_connections = env_int('GUNICORN_WORKER_CONNECTIONS', 100)
+
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 0)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 0)
+
+preload_app = env_bool('GUNICORN_PRELOAD', True)
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+
+# Must be set before prometheus_client is imported, i.e. before the app loads
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), f"expense-tracker-metrics-{env_int('PORT', 5002)}")
+)
+os.makedirs(metrics_dir, exist_ok=True)
+
+
+def on_starting(server):
+    """Reset the metrics of earlier runs and seed the database, before any worker starts"""
+    for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+        os.remove(path)
+
+    if not env_bool('DB_BOOTSTRAP', True):
+        return
+    from app_integrated import app, bootstrap_database, db
+    with app.app_context():
+        inserted = bootstrap_database()
+        db.engine.dispose()  # the master serves no requests; don't hold a connection
+    server.log.info('Database bootstrap done (seeded rows: %s)', inserted)
+
+
+def when_ready(server):
+    if worker_class == 'gthread' and threads > connections_per_worker:
+        server.log.warning(
+            'GUNICORN_THREADS=%s exceeds DB_POOL_SIZE + DB_MAX_OVERFLOW=%s; threads will queue for connections',
+            threads, connections_per_worker
+        )
+    if workers * connections_per_worker > max_connections:
+        server.log.warning(
+            '%s workers x %s connections exceeds DB_MAX_CONNECTIONS=%s; PostgreSQL may refuse connections',
+            workers, connections_per_worker, max_connections
+        )
+    if worker_class == 'gevent' and not psycogreen_patched:
+        server.log.warning('psycogreen is not installed; database calls will block gevent workers')
+    server.log.info('Serving with %s %s workers x %s threads', workers, worker_class, threads)
+
+
+def post_fork(server, worker):
+    from app_integrated import app, db
+    with app.app_context():
+        # Connections opened in the master during preload belong to it; start with an empty pool
+        db.engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    """Runs after the worker stopped accepting requests and drained in-flight ones"""
+    from app_integrated import app, db, statement_renderer
+    statement_renderer.shutdown()
+    with app.app_context():
+        db.engine.dispose()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)  # drop the dead worker's live gauges
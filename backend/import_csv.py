@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Script to import a bank statement CSV into a user's expenses.
+The file is streamed in chunks, so memory use does not grow with its size.
+
+    python import_csv.py statement.csv --user-id 1
+    python import_csv.py statement.csv --user-id 1 --date-format %d/%m/%Y --debits-negative
+    python import_csv.py statement.csv --user-id 1 --column date="Posted Date" --column amount=Debit
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the app directory to the path
+app_path = os.path.join(os.path.dirname(__file__), 'app')
+sys.path.insert(0, app_path)
+
+from app_integrated import app, import_expenses_csv  # noqa: E402
+from csv_import import DEFAULT_COLUMNS  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Import a bank statement CSV')
+    parser.add_argument('csv_file', help='path to the CSV file')
+    parser.add_argument('--user-id', type=int, required=True, help='user to import the expenses for')
+    parser.add_argument('--date-format', default='%Y-%m-%d', help='strptime format of the date column')
+    parser.add_argument('--debits-negative', action='store_true',
+                        help='spending is negative in the file; positive rows (credits) are skipped')
+    parser.add_argument('--default-category', default='Other',
+                        help='category for rows with a blank or unknown category')
+    parser.add_argument('--column', action='append', default=[], metavar='FIELD=HEADER',
+                        help=f'CSV header for a field ({", ".join(DEFAULT_COLUMNS)}); repeatable')
+    parser.add_argument('--partial', action='store_true', help='keep the valid rows when some rows fail')
+    return parser.parse_args()
+
+
+def import_statement():
+    args = parse_args()
+    columns = dict(mapping.split('=', 1) for mapping in args.column)
+    
+    print("📥 CSV Statement Import")
+    print("=" * 50)
+    print(f"📄 File: {args.csv_file}")
+    print(f"👤 User ID: {args.user_id}")
+    print("=" * 50)
+    
+    started = time.perf_counter()
+    
+    def show_progress(stats):
+        elapsed = time.perf_counter() - started
+        print(f"\r   {stats.rows_read:,} rows read, {stats.inserted:,} inserted, "
+              f"{stats.error_count:,} errors ({stats.inserted / elapsed:,.0f} rows/s)", end='', flush=True)
+    
+    try:
+        with app.app_context(), open(args.csv_file, encoding='utf-8-sig', newline='') as lines:
+            stats, committed = import_expenses_csv(
+                args.user_id, lines,
+                partial=args.partial,
+                default_category=args.default_category,
+                progress=show_progress,
+                columns=columns,
+                date_format=args.date_format,
+                debits_negative=args.debits_negative
+            )
+    except (OSError, ValueError) as e:
+        print(f"\n❌ Import failed: {e}")
+        return False
+    
+    print()
+    for error in stats.errors:
+        print(f"   ⚠️  line {error['line']}: {error['error']}")
+    if stats.error_count > len(stats.errors):
+        print(f"   ... and {stats.error_count - len(stats.errors):,} more errors")
+    
+    print("\n" + "=" * 50)
+    if committed:
+        print(f"✅ Imported {stats.inserted:,} expenses ({stats.skipped:,} credits skipped) "
+              f"in {time.perf_counter() - started:.1f}s")
+    else:
+        print("❌ Nothing was saved (use --partial to keep the valid rows)")
+    print("=" * 50)
+    return committed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if import_statement() else 1)
@@ -0,0 +1,59 @@
+-- Migration script to make global category names unique, the conflict
+-- target of the idempotent seed (app/bootstrap.py)
+
+BEGIN;
+
+-- Repoint expenses at the oldest copy of any duplicated global category
+UPDATE expense e
+SET expense_category_id = keep.expense_category_id
+FROM expense_category dup
+JOIN (
+    SELECT expense_category_name, min(expense_category_id) AS expense_category_id
+    FROM expense_category
+    WHERE user_id IS NULL
+    GROUP BY expense_category_name
+) keep ON keep.expense_category_name = dup.expense_category_name
+WHERE dup.user_id IS NULL
+  AND dup.expense_category_id <> keep.expense_category_id
+  AND e.expense_category_id = dup.expense_category_id;
+
+-- Fold the duplicates' rollup rows into the kept category, so its totals
+-- include the expenses moved above
+INSERT INTO monthly_spend_rollup (user_id, year, month, category_id, total, count)
+SELECT r.user_id, r.year, r.month, keep.expense_category_id, sum(r.total), sum(r.count)
+FROM monthly_spend_rollup r
+JOIN expense_category dup ON dup.expense_category_id = r.category_id
+JOIN (
+    SELECT expense_category_name, min(expense_category_id) AS expense_category_id
+    FROM expense_category
+    WHERE user_id IS NULL
+    GROUP BY expense_category_name
+) keep ON keep.expense_category_name = dup.expense_category_name
+WHERE dup.user_id IS NULL
+  AND dup.expense_category_id <> keep.expense_category_id
+GROUP BY r.user_id, r.year, r.month, keep.expense_category_id
+ON CONFLICT (user_id, year, month, category_id) DO UPDATE
+SET total = monthly_spend_rollup.total + EXCLUDED.total,
+    count = monthly_spend_rollup.count + EXCLUDED.count;
+
+DELETE FROM monthly_spend_rollup r
+USING expense_category dup, expense_category keep
+WHERE r.category_id = dup.expense_category_id
+  AND dup.user_id IS NULL AND keep.user_id IS NULL
+  AND dup.expense_category_name = keep.expense_category_name
+  AND dup.expense_category_id > keep.expense_category_id;
+
+DELETE FROM expense_category dup
+USING expense_category keep
+WHERE dup.user_id IS NULL AND keep.user_id IS NULL
+  AND dup.expense_category_name = keep.expense_category_name
+  AND dup.expense_category_id > keep.expense_category_id;
+
+COMMIT;
+
+-- CONCURRENTLY cannot run inside a transaction block
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_expense_category_global_name
+    ON expense_category (expense_category_name) WHERE user_id IS NULL;
+
+-- Verify the index
+SELECT indexname, indexdef FROM pg_indexes WHERE indexname = 'uq_expense_category_global_name';
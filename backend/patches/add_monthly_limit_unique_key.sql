@@ -0,0 +1,25 @@
+-- Migration script to make monthly_limit unique per (user_id, year_id, month_id),
+-- the conflict target of PUT /api/limits and POST /api/limit
+
+BEGIN;
+
+-- Keep the newest row of any duplicated limit
+DELETE FROM monthly_limit dup
+USING monthly_limit keep
+WHERE dup.user_id = keep.user_id
+  AND dup.year_id = keep.year_id
+  AND dup.month_id = keep.month_id
+  AND dup.monthly_limit_id < keep.monthly_limit_id;
+
+ALTER TABLE monthly_limit
+    ADD CONSTRAINT uq_monthly_limit_user_id_year_id_month_id UNIQUE (user_id, year_id, month_id);
+
+-- The constraint's index covers the same lookups
+DROP INDEX IF EXISTS ix_monthly_limit_user_id_year_id_month_id;
+
+COMMIT;
+
+-- Verify the constraint
+SELECT conname, pg_get_constraintdef(oid)
+FROM pg_constraint
+WHERE conname = 'uq_monthly_limit_user_id_year_id_month_id';
@@ -0,0 +1,29 @@
+-- Migration script to add the monthly spend rollup and backfill it
+
+CREATE TABLE IF NOT EXISTS monthly_spend_rollup (
+    user_id INTEGER NOT NULL REFERENCES "user" (user_id),
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES expense_category (expense_category_id),
+    total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, year, month, category_id)
+);
+
+-- Backfill from existing expenses (same as `python create_tables.py --rebuild-rollup`)
+BEGIN;
+DELETE FROM monthly_spend_rollup;
+INSERT INTO monthly_spend_rollup (user_id, year, month, category_id, total, count)
+SELECT user_id,
+       EXTRACT(YEAR FROM expenditure_date)::int,
+       EXTRACT(MONTH FROM expenditure_date)::int,
+       expense_category_id,
+       SUM(expense_item_price * expense_item_count),
+       COUNT(expense_id)
+FROM expense
+GROUP BY 1, 2, 3, 4;
+COMMIT;
+
+-- Verify the backfill
+SELECT count(*) AS rollup_rows, sum(count) AS expenses_covered
+FROM monthly_spend_rollup;
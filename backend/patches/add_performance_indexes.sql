@@ -0,0 +1,29 @@
+-- Migration script to add composite indexes for the hot query paths
+
+-- Expenses are always read by user and expenditure_date range
+-- (GET /api/expenses, /api/summary, /api/year_bundle)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_expense_user_id_expenditure_date
+ON expense (user_id, expenditure_date);
+
+-- Monthly limits are looked up by user, year and month
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_monthly_limit_user_id_year_id_month_id
+ON monthly_limit (user_id, year_id, month_id);
+
+-- Category lists only ever show non-deleted rows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_expense_category_user_id_active
+ON expense_category (user_id)
+WHERE is_deleted = false;
+
+-- Refresh planner statistics
+ANALYZE expense;
+ANALYZE monthly_limit;
+ANALYZE expense_category;
+
+-- Verify the indexes were added
+SELECT tablename, indexname, indexdef
+FROM pg_indexes
+WHERE indexname IN (
+    'ix_expense_user_id_expenditure_date',
+    'ix_monthly_limit_user_id_year_id_month_id',
+    'ix_expense_category_user_id_active'
+);
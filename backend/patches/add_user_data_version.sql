@@ -0,0 +1,11 @@
+-- Migration script to add the per-user data version used for ETags
+
+-- Bumped on every write to a user's expenses, limits, categories or currency
+ALTER TABLE "user"
+ADD COLUMN IF NOT EXISTS data_version INTEGER NOT NULL DEFAULT 0;
+
+-- Verify the column was added
+SELECT column_name, data_type, column_default
+FROM information_schema.columns
+WHERE table_name = 'user'
+AND column_name = 'data_version';
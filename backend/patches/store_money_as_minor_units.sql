@@ -0,0 +1,65 @@
+-- Migration script to store money as BIGINT minor units of each user's currency
+-- Run once; amounts are converted with the currency's minor_unit_digits, rounding half up.
+-- The scale is power(10::numeric, ...): power(int, int) is float8, which would round half to even.
+
+BEGIN;
+
+ALTER TABLE currency ADD COLUMN IF NOT EXISTS minor_unit_digits INTEGER NOT NULL DEFAULT 2;
+UPDATE currency SET minor_unit_digits = 0
+WHERE currency_name IN ('JPY', 'Japanese Yen', 'KRW', 'South Korean Won');
+UPDATE currency SET minor_unit_digits = 3
+WHERE currency_name IN ('KWD', 'Kuwaiti Dinar');
+
+-- expense.expense_item_price
+ALTER TABLE expense ADD COLUMN expense_item_price_minor BIGINT;
+UPDATE expense e
+SET expense_item_price_minor = round(e.expense_item_price::numeric * power(10::numeric, coalesce(c.minor_unit_digits, 2)))
+FROM "user" u LEFT JOIN currency c ON c.currency_id = u.currency_id
+WHERE u.user_id = e.user_id;
+ALTER TABLE expense DROP COLUMN expense_item_price;
+ALTER TABLE expense RENAME COLUMN expense_item_price_minor TO expense_item_price;
+ALTER TABLE expense ALTER COLUMN expense_item_price SET NOT NULL;
+
+-- monthly_limit.monthly_limit_amount
+ALTER TABLE monthly_limit ADD COLUMN monthly_limit_amount_minor BIGINT;
+UPDATE monthly_limit m
+SET monthly_limit_amount_minor = round(m.monthly_limit_amount::numeric * power(10::numeric, coalesce(c.minor_unit_digits, 2)))
+FROM "user" u LEFT JOIN currency c ON c.currency_id = u.currency_id
+WHERE u.user_id = m.user_id;
+ALTER TABLE monthly_limit DROP COLUMN monthly_limit_amount;
+ALTER TABLE monthly_limit RENAME COLUMN monthly_limit_amount_minor TO monthly_limit_amount;
+ALTER TABLE monthly_limit ALTER COLUMN monthly_limit_amount SET NOT NULL;
+
+-- "user".global_limit
+ALTER TABLE "user" ADD COLUMN global_limit_minor BIGINT DEFAULT 0;
+UPDATE "user" u
+SET global_limit_minor = round(coalesce(u.global_limit, 0)::numeric * power(10::numeric, coalesce(c.minor_unit_digits, 2)))
+FROM "user" u2 LEFT JOIN currency c ON c.currency_id = u2.currency_id
+WHERE u2.user_id = u.user_id;
+ALTER TABLE "user" DROP COLUMN global_limit;
+ALTER TABLE "user" RENAME COLUMN global_limit_minor TO global_limit;
+
+-- monthly_spend_rollup.total: rebuilt from the converted prices
+ALTER TABLE monthly_spend_rollup ALTER COLUMN total TYPE BIGINT USING 0;
+DELETE FROM monthly_spend_rollup;
+INSERT INTO monthly_spend_rollup (user_id, year, month, category_id, total, count)
+SELECT user_id,
+       EXTRACT(YEAR FROM expenditure_date)::int,
+       EXTRACT(MONTH FROM expenditure_date)::int,
+       expense_category_id,
+       SUM(expense_item_price * expense_item_count),
+       COUNT(expense_id)
+FROM expense
+GROUP BY 1, 2, 3, 4;
+
+COMMIT;
+
+-- Verify the column types
+SELECT table_name, column_name, data_type
+FROM information_schema.columns
+WHERE (table_name, column_name) IN (
+    ('expense', 'expense_item_price'),
+    ('monthly_limit', 'monthly_limit_amount'),
+    ('user', 'global_limit'),
+    ('monthly_spend_rollup', 'total')
+);
@@ -0,0 +1,44 @@
+"""
+Tests for the idempotent reference data bootstrap
+"""
+
+from datetime import date
+
+from app_integrated import db, bootstrap_database, Currency, ExpenseCategory, Year
+from bootstrap import CURRENCIES, DEFAULT_CATEGORIES, MONTH_NAMES, seed_reference_data
+from conftest import count_queries
+
+
+def test_bootstrap_seeds_reference_tables(client):
+    inserted = bootstrap_database()
+
+    assert inserted['currency'] == len(CURRENCIES)
+    assert inserted['month'] == len(MONTH_NAMES)
+    assert inserted['expense_category'] == len(DEFAULT_CATEGORIES)
+    assert db.session.get(Currency, 5).minor_unit_digits == 0
+    assert [year.year_number for year in Year.query.order_by(Year.year_number)][0] == 2024
+    assert len(client.get('/api/months').get_json()['months']) == 12
+
+
+def test_bootstrap_is_idempotent_and_keeps_edited_rows(client):
+    with db.engine.begin() as connection:
+        seed_reference_data(connection, db.metadata, today=date(2026, 1, 1))
+    db.session.get(Currency, 1).currency_symbol = 'US$'
+    db.session.query(ExpenseCategory).filter_by(expense_category_name='Other').update({'is_deleted': True})
+    db.session.commit()
+
+    with db.engine.begin() as connection:
+        inserted = seed_reference_data(connection, db.metadata, today=date(2031, 6, 1))
+
+    assert inserted == {'currency': 0, 'month': 0, 'year': 5, 'expense_category': 0}
+    assert db.session.get(Currency, 1).currency_symbol == 'US$'
+    assert ExpenseCategory.query.filter_by(user_id=None).count() == len(DEFAULT_CATEGORIES)
+    assert Year.query.filter_by(year_number=2032).count() == 1
+
+
+def test_reference_reads_never_write(client):
+    with count_queries() as statements:
+        client.get('/api/currencies')
+        client.get('/api/months')
+
+    assert statements and not any(s.lstrip().upper().startswith('INSERT') for s in statements)
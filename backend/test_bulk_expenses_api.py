@@ -0,0 +1,102 @@
+"""
+Tests for bulk expense ingestion
+"""
+
+import json
+
+from app_integrated import db, Expense, ExpenseCategory, MonthlySpendRollup, User
+from conftest import count_queries
+
+
+def expense(category_id, amount=10, day='2025-03-10', **extra):
+    return {'amount': amount, 'category_id': category_id, 'date': day, **extra}
+
+
+def test_bulk_insert_json_array(client, auth_headers, user, category):
+    rows = [expense(category.expense_category_id, amount=i + 1) for i in range(20)]
+
+    response = client.post('/api/expenses/bulk', headers=auth_headers, json=rows)
+
+    assert response.status_code == 201
+    assert response.get_json()['inserted'] == 20
+    assert Expense.query.filter_by(user_id=user.user_id).count() == 20
+    rollup = MonthlySpendRollup.query.filter_by(user_id=user.user_id, year=2025, month=3).one()
+    assert (rollup.total, rollup.count) == (21000, 20)  # minor units
+
+
+def test_bulk_insert_ndjson(client, auth_headers, user, category):
+    body = '\n'.join(json.dumps(expense(category.expense_category_id, day=f'2025-0{m}-01')) for m in range(1, 4))
+
+    response = client.post('/api/expenses/bulk', data=body + '\n\n',
+                           headers={**auth_headers, 'Content-Type': 'application/x-ndjson'})
+
+    assert response.status_code == 201
+    summary = client.get('/api/summary?type=yearly&year=2025', headers=auth_headers).get_json()
+    assert summary['expense_count'] == 3
+
+
+def test_bulk_insert_reports_row_errors_and_writes_nothing(client, auth_headers, user, category):
+    other = User(username='other', email='other@example.com')
+    db.session.add(other)
+    db.session.flush()
+    foreign = ExpenseCategory(expense_category_name='Theirs', user_id=other.user_id)
+    db.session.add(foreign)
+    db.session.commit()
+
+    rows = [
+        expense(category.expense_category_id),
+        expense(foreign.expense_category_id),
+        expense(category.expense_category_id, amount=-5),
+        expense(category.expense_category_id, day='10/03/2025'),
+    ]
+    response = client.post('/api/expenses/bulk', headers=auth_headers, json=rows)
+
+    assert response.status_code == 400
+    assert [error['row'] for error in response.get_json()['errors']] == [2, 3, 4]
+    assert Expense.query.count() == 0
+
+
+def test_bulk_insert_rejects_wrong_types_and_overflow_per_row(client, auth_headers, user, category):
+    rows = [
+        expense(category.expense_category_id, name=123),
+        expense(category.expense_category_id, description=['x']),
+        expense(category.expense_category_id, amount='1' + '0' * 20),
+        expense(category.expense_category_id, amount=10 ** 15, expense_item_count=10 ** 6),
+    ]
+
+    response = client.post('/api/expenses/bulk', headers=auth_headers, json=rows)
+
+    assert response.status_code == 400
+    assert [error['row'] for error in response.get_json()['errors']] == [1, 2, 3, 4]
+    assert Expense.query.count() == 0
+
+
+def test_bulk_insert_rejects_ndjson_that_is_not_utf8(client, auth_headers, user, category):
+    body = json.dumps(expense(category.expense_category_id)).encode() + b'\n{"name": "\xff\xfe"}\n'
+
+    response = client.post('/api/expenses/bulk', data=body,
+                           headers={**auth_headers, 'Content-Type': 'application/x-ndjson'})
+
+    assert response.status_code == 400
+    assert 'UTF-8' in response.get_json()['error']
+    assert Expense.query.count() == 0
+
+
+def test_bulk_insert_partial_keeps_valid_rows(client, auth_headers, user, category):
+    rows = [expense(category.expense_category_id), {'amount': 3}]
+
+    response = client.post('/api/expenses/bulk?partial=true', headers=auth_headers, json=rows)
+
+    assert response.status_code == 201
+    assert response.get_json()['inserted'] == 1
+    assert response.get_json()['errors'] == [{'row': 2, 'error': 'Category ID is required'}]
+
+
+def test_bulk_insert_statement_count_is_independent_of_rows(client, auth_headers, user, category):
+    with count_queries() as few:
+        client.post('/api/expenses/bulk', headers=auth_headers, json=[expense(category.expense_category_id)])
+    with count_queries() as many:
+        client.post('/api/expenses/bulk', headers=auth_headers,
+                    json=[expense(category.expense_category_id) for _ in range(500)])
+
+    assert len(many) == len(few)
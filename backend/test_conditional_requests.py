@@ -0,0 +1,66 @@
+"""
+Tests for ETag / If-None-Match on per-user reads
+"""
+
+import pytest
+
+from app_integrated import db, reference_cache
+from conftest import add_expenses, count_queries
+
+
+def test_expenses_return_304_until_a_write(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 3)
+    url = '/api/expenses?year=2025&month=3'
+
+    first = client.get(url, headers=auth_headers)
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    conditional = {**auth_headers, 'If-None-Match': etag}
+    with count_queries() as statements:
+        cached = client.get(url, headers=conditional)
+    assert cached.status_code == 304
+    assert not any('expense ' in statement.lower() for statement in statements)
+
+    client.post('/api/expenses', headers=auth_headers, json={
+        'year': 2025, 'month': 3,
+        'expense': {'amount': 5, 'category_id': category.expense_category_id, 'date': '2025-03-11'}
+    })
+
+    refreshed = client.get(url, headers=conditional)
+    assert refreshed.status_code == 200
+    assert len(refreshed.get_json()) == 4
+    assert refreshed.headers['ETag'] != etag
+
+
+def test_etag_differs_per_url(client, auth_headers, user):
+    march = client.get('/api/limit?year=2025&month=3', headers=auth_headers)
+    april = client.get('/api/limit?year=2025&month=4', headers=auth_headers)
+
+    assert march.headers['ETag'] != april.headers['ETag']
+
+
+def test_limit_write_invalidates_global_limit_etag(client, auth_headers, user):
+    etag = client.get('/api/global_limit', headers=auth_headers).headers['ETag']
+    conditional = {**auth_headers, 'If-None-Match': etag}
+    assert client.get('/api/global_limit', headers=conditional).status_code == 304
+
+    client.post('/api/global_limit', headers=auth_headers, json={'global_limit': 900})
+
+    response = client.get('/api/global_limit', headers=conditional)
+    assert response.status_code == 200
+    assert response.get_json()['global_limit'] == 900
+
+
+@pytest.mark.parametrize('url', ['/api/expenses?year=2025&month=3', '/api/summary?type=monthly&year=2025&month=3'])
+def test_renaming_a_global_category_changes_the_etag(client, auth_headers, user, category, url):
+    add_expenses(user.user_id, category.expense_category_id, 1)
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+
+    category.expense_category_name = 'Groceries'
+    db.session.commit()
+    reference_cache.invalidate()
+    response = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert 'Groceries' in response.get_data(as_text=True)
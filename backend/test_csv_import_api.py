@@ -0,0 +1,104 @@
+"""
+Tests for the streaming CSV import
+"""
+
+import io
+from datetime import date
+
+from app_integrated import db, Expense, ExpenseCategory, MonthlySpendRollup
+from csv_import import import_csv, parse_amount
+
+
+STATEMENT = """Posted Date,Payee,Debit,Category
+03/01/2025,Coffee Shop,-4.50,food & dining
+03/02/2025,Salary,2500.00,
+03/05/2025,Bus pass,"-1,200.00",
+"""
+
+
+def test_import_csv_streams_in_chunks():
+    lines = ['date,amount,category\n'] + [f'2025-01-{day:02d},{day},Food\n' for day in range(1, 11)]
+    batches = []
+
+    stats = import_csv(iter(lines), 1, {'food': 7}, batches.append, chunk_size=4)
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batches[0][0]['expense_category_id'] == 7
+    assert (stats.rows_read, stats.inserted, stats.error_count) == (10, 10, 0)
+
+
+def test_parse_amount_handles_statement_formats():
+    assert parse_amount('1,234.50') == 1234.5
+    assert parse_amount('$12') == 12.0
+    assert parse_amount('(45.00)') == -45.0
+
+
+def test_import_endpoint_maps_columns_and_resolves_categories(client, auth_headers, user, category):
+    other = ExpenseCategory(expense_category_name='Other', user_id=None, is_deleted=False)
+    db.session.add(other)
+    db.session.commit()
+
+    response = client.post(
+        '/api/expenses/import?date_format=%25m/%25d/%25Y&debits_negative=true&amount_column=Debit',
+        headers=auth_headers,
+        data={'file': (io.BytesIO(STATEMENT.encode('utf-8')), 'statement.csv')}
+    )
+
+    assert response.status_code == 201
+    result = response.get_json()
+    assert (result['inserted'], result['skipped']) == (2, 1)
+    expenses = {e.expense_name: e for e in Expense.query.filter_by(user_id=user.user_id)}
+    assert expenses['Coffee Shop'].expense_category_id == category.expense_category_id
+    assert expenses['Bus pass'].expense_category_id == other.expense_category_id
+    assert expenses['Bus pass'].expense_item_price == 120000
+    assert expenses['Bus pass'].expenditure_date == date(2025, 3, 5)
+    rollup_total = db.session.query(db.func.sum(MonthlySpendRollup.total)).scalar()
+    assert rollup_total == 120450
+
+
+def test_import_endpoint_accepts_raw_csv_body(client, auth_headers, user, category):
+    response = client.post('/api/expenses/import', headers={**auth_headers, 'Content-Type': 'text/csv'},
+                           data='date,amount,category\n2025-01-01,5,Food & Dining\n')
+
+    assert response.status_code == 201
+    assert Expense.query.count() == 1
+
+
+def test_import_endpoint_rolls_back_on_row_errors(client, auth_headers, user, category):
+    body = 'date,amount,category\n2025-01-01,5,Food & Dining\n2025-01-02,abc,Food & Dining\n2025-01-03,5,Nope\n'
+
+    response = client.post('/api/expenses/import', headers={**auth_headers, 'Content-Type': 'text/csv'},
+                           data=body)
+
+    assert response.status_code == 400
+    assert [error['line'] for error in response.get_json()['errors']] == [3, 4]
+    assert Expense.query.count() == 0
+    assert MonthlySpendRollup.query.count() == 0
+
+
+def test_import_endpoint_rejects_csv_without_amount(client, auth_headers, user):
+    response = client.post('/api/expenses/import', headers={**auth_headers, 'Content-Type': 'text/csv'},
+                           data='date,payee\n2025-01-01,Shop\n')
+
+    assert response.status_code == 400
+    assert 'amount' in response.get_json()['error']
+
+
+def test_import_endpoint_rejects_malformed_csv_with_line_number(client, auth_headers, user, category):
+    body = 'date,amount,category\n2025-01-01,5,Food & Dining\n2025-01-02,"' + 'x' * 200_000 + '\n'
+
+    response = client.post('/api/expenses/import', headers={**auth_headers, 'Content-Type': 'text/csv'},
+                           data=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Malformed CSV at line 3')
+    assert Expense.query.count() == 0
+
+
+def test_import_csv_truncates_long_names_and_descriptions():
+    lines = ['date,amount,category,name,memo\n', f'2025-01-01,5,Food,{"n" * 300},{"d" * 300}\n']
+    batches = []
+
+    import_csv(iter(lines), 1, {'food': 7}, batches.extend)
+
+    assert (len(batches[0]['expense_name']), len(batches[0]['expense_description'])) == (200, 255)
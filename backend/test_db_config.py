@@ -0,0 +1,50 @@
+"""
+Tests for the environment-driven engine configuration
+"""
+
+from sqlalchemy import create_engine, text
+
+from db_config import engine_options, pool_status, pool_stats, InstrumentedQueuePool
+
+
+def test_sqlite_keeps_default_pool():
+    assert engine_options('sqlite://') == {}
+
+
+def test_pool_settings_from_env(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '20')
+    monkeypatch.setenv('DB_MAX_OVERFLOW', '0')
+    monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+
+    options = engine_options('postgresql://u:p@localhost/expense_db')
+
+    assert options['poolclass'] is InstrumentedQueuePool
+    assert options['pool_size'] == 20
+    assert options['max_overflow'] == 0
+    assert options['pool_pre_ping'] is False
+    assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+
+
+def test_pgbouncer_mode_disables_prepared_statements(monkeypatch):
+    monkeypatch.setenv('DB_PGBOUNCER', 'true')
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+
+    options = engine_options('postgresql+psycopg://u:p@localhost/expense_db')
+
+    assert options['connect_args'] == {'prepare_threshold': None}
+
+
+def test_pool_status_reports_checkouts_and_saturation(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path}/pool.db', poolclass=InstrumentedQueuePool,
+                           pool_size=2, max_overflow=2)
+    before = pool_stats.snapshot()['checkouts']
+
+    with engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+        status = pool_status(engine)
+
+    assert status['checked_out'] == 1
+    assert status['saturation'] == 0.25
+    assert status['checkouts'] == before + 1
+    engine.dispose()
@@ -0,0 +1,86 @@
+"""
+Tests for the expense endpoints
+"""
+
+from datetime import date
+
+from app_integrated import reference_cache
+from conftest import add_expenses, count_queries
+
+
+def test_get_expenses_returns_category_name(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 2)
+
+    response = client.get('/api/expenses?year=2025&month=3', headers=auth_headers)
+
+    assert response.status_code == 200
+    expenses = response.get_json()
+    assert len(expenses) == 2
+    assert expenses[0]['expense_category_name'] == 'Food & Dining'
+    assert expenses[0]['expenditure_date'] == '2025-03-10'
+
+
+def test_get_expenses_query_count_is_constant(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 1)
+    reference_cache.get()  # loaded once per process, not per request
+    with count_queries() as few:
+        response = client.get('/api/expenses?year=2025&month=3', headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+
+    add_expenses(user.user_id, category.expense_category_id, 99)
+    with count_queries() as many:
+        response = client.get('/api/expenses?year=2025&month=3', headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.get_json()) == 100
+
+    assert len(many) == len(few)
+
+
+def test_keyset_pages_cover_history_without_overlap(client, auth_headers, user, category):
+    for day in (1, 2, 3):
+        add_expenses(user.user_id, category.expense_category_id, 3, expenditure_date=date(2025, 1, day))
+    add_expenses(user.user_id, category.expense_category_id, 2, expenditure_date=date(2024, 12, 31))
+
+    seen = []
+    cursor = None
+    while True:
+        url = '/api/expenses?limit=4' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url, headers=auth_headers).get_json()
+        seen += page['expenses']
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    keys = [(e['expenditure_date'], e['expense_id']) for e in seen]
+    assert len(seen) == 11
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 11
+
+
+def test_keyset_page_within_month_and_field_projection(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 3, expenditure_date=date(2025, 3, 10))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 4, 1))
+
+    response = client.get('/api/expenses?year=2025&month=3&limit=5&fields=expense_name,expense_item_price,expenditure_date',
+                          headers=auth_headers)
+
+    page = response.get_json()
+    assert page['next_cursor'] is None
+    assert len(page['expenses']) == 3
+    assert set(page['expenses'][0]) == {'expense_name', 'expense_item_price', 'expenditure_date'}
+
+
+def test_field_projection_without_pagination_keeps_array_shape(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 2)
+
+    response = client.get('/api/expenses?year=2025&month=3&fields=expense_id', headers=auth_headers)
+
+    assert [set(e) for e in response.get_json()] == [{'expense_id'}, {'expense_id'}]
+
+
+def test_pagination_rejects_bad_parameters(client, auth_headers, user):
+    assert client.get('/api/expenses?limit=0', headers=auth_headers).status_code == 400
+    assert client.get('/api/expenses?limit=5&cursor=not-a-cursor', headers=auth_headers).status_code == 400
+    assert client.get('/api/expenses?limit=5&fields=password', headers=auth_headers).status_code == 400
+    assert client.get('/api/expenses?limit=5&year=2025', headers=auth_headers).status_code == 400
@@ -0,0 +1,51 @@
+"""
+Tests for the streaming expense export
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+from conftest import add_expenses
+
+
+def test_csv_export_streams_all_history_in_date_order(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 2, expenditure_date=date(2025, 3, 10))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2016, 1, 1), price=4.5)
+
+    response = client.get('/api/expenses/export?format=csv', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.headers['Content-Type'].startswith('text/csv')
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['expenditure_date'] for row in rows] == ['2016-01-01', '2025-03-10', '2025-03-10']
+    assert rows[0]['expense_item_price'] == '4.5'
+    assert rows[0]['expense_category_name'] == 'Food & Dining'
+
+
+def test_ndjson_export_filters_inclusive_range(client, auth_headers, user, category):
+    for day in (1, 15, 31):
+        add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 1, day))
+
+    response = client.get('/api/expenses/export?format=ndjson&from=2025-01-15&to=2025-01-31', headers=auth_headers)
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['expenditure_date'] for line in lines] == ['2025-01-15', '2025-01-31']
+
+
+def test_export_is_gzipped_when_accepted(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 300)
+
+    response = client.get('/api/expenses/export?format=ndjson',
+                          headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(gzip.decompress(response.get_data()).splitlines()) == 300
+
+
+def test_export_rejects_unknown_format_and_bad_dates(client, auth_headers, user):
+    assert client.get('/api/expenses/export?format=xml', headers=auth_headers).status_code == 400
+    assert client.get('/api/expenses/export?from=01-01-2025', headers=auth_headers).status_code == 400
@@ -0,0 +1,89 @@
+"""
+Tests for the environment-driven gunicorn configuration
+"""
+
+import os
+import runpy
+import sys
+import types
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'gunicorn.conf.py')
+
+
+def test_defaults_preload_gthread_workers(monkeypatch, tmp_path):
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    for name in ('WEB_CONCURRENCY', 'GUNICORN_WORKER_CLASS', 'GUNICORN_THREADS', 'GUNICORN_PRELOAD', 'PORT', 'HOST',
+                 'DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_MAX_CONNECTIONS'):
+        monkeypatch.delenv(name, raising=False)
+
+    config = runpy.run_path(CONFIG_PATH)
+
+    assert config['bind'] == '0.0.0.0:5002'
+    assert config['worker_class'] == 'gthread'
+    assert config['workers'] == min(os.cpu_count() * 2 + 1, 90 // 15)
+    assert config['threads'] == 4
+    assert config['preload_app'] is True
+    assert config['graceful_timeout'] == 30
+    assert config['chdir'].endswith('app')
+
+
+def test_default_workers_fit_the_connection_budget(monkeypatch, tmp_path):
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+    monkeypatch.setattr('multiprocessing.cpu_count', lambda: 16)
+    monkeypatch.setenv('DB_POOL_SIZE', '4')
+    monkeypatch.setenv('DB_MAX_OVERFLOW', '6')
+
+    monkeypatch.setenv('DB_MAX_CONNECTIONS', '95')
+    assert runpy.run_path(CONFIG_PATH)['workers'] == 9
+    monkeypatch.setenv('DB_MAX_CONNECTIONS', '5')
+    assert runpy.run_path(CONFIG_PATH)['workers'] == 1
+    monkeypatch.setenv('DB_MAX_CONNECTIONS', '1000')
+    assert runpy.run_path(CONFIG_PATH)['workers'] == 33
+
+
+def fake_gevent(monkeypatch):
+    """Install stand-ins for gevent and psycogreen that record the patching calls"""
+    calls = []
+    monkey = types.ModuleType('gevent.monkey')
+    monkey.patch_all = lambda: calls.append('patch_all')
+    psycogreen_gevent = types.ModuleType('psycogreen.gevent')
+    psycogreen_gevent.patch_psycopg = lambda: calls.append('patch_psycopg')
+    monkeypatch.setitem(sys.modules, 'gevent', types.ModuleType('gevent'))
+    monkeypatch.setitem(sys.modules, 'gevent.monkey', monkey)
+    monkeypatch.setitem(sys.modules, 'psycogreen', types.ModuleType('psycogreen'))
+    monkeypatch.setitem(sys.modules, 'psycogreen.gevent', psycogreen_gevent)
+    return calls
+
+
+def test_gevent_patches_the_master_before_the_app_loads(monkeypatch, tmp_path):
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'gevent')
+    monkeypatch.delenv('GUNICORN_PRELOAD', raising=False)
+    calls = fake_gevent(monkeypatch)
+
+    config = runpy.run_path(CONFIG_PATH)
+
+    assert calls == ['patch_all', 'patch_psycopg']
+    assert config['psycogreen_patched'] is True
+    assert config['preload_app'] is True
+
+
+def test_worker_model_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    fake_gevent(monkeypatch)
+    monkeypatch.setenv('PORT', '8000')
+    monkeypatch.setenv('WEB_CONCURRENCY', '3')
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'gevent')
+    monkeypatch.setenv('GUNICORN_WORKER_CONNECTIONS', '500')
+    monkeypatch.setenv('GUNICORN_GRACEFUL_TIMEOUT', '10')
+    monkeypatch.setenv('GUNICORN_PRELOAD', 'false')
+
+    config = runpy.run_path(CONFIG_PATH)
+
+    assert config['bind'] == '0.0.0.0:8000'
+    assert config['workers'] == 3
+    assert config['worker_class'] == 'gevent'
+    assert config['worker_connections'] == 500
+    assert config['graceful_timeout'] == 10
+    assert config['preload_app'] is False
@@ -0,0 +1,48 @@
+"""
+Tests for the JSON provider
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app_integrated import app
+from json_provider import FastJSONProvider, orjson_dumps, select_dumps, stdlib_dumps
+
+PAYLOAD = {
+    'date': date(2025, 3, 10),
+    'at': datetime(2025, 3, 10, 12, 30),
+    'amount': Decimal('12.50'),
+    'months': {1: 10.0, 12: 0},
+    'name': 'Café',
+}
+EXPECTED = {
+    'date': '2025-03-10',
+    'at': '2025-03-10T12:30:00',
+    'amount': 12.5,
+    'months': {'1': 10.0, '12': 0},
+    'name': 'Café',
+}
+
+BACKENDS = [stdlib_dumps] + ([orjson_dumps] if orjson_dumps else [])
+
+
+@pytest.mark.parametrize('dumps', BACKENDS)
+def test_backends_encode_dates_decimals_and_int_keys(dumps):
+    assert json.loads(dumps(PAYLOAD)) == EXPECTED
+
+
+def test_select_dumps_honours_setting():
+    assert select_dumps('stdlib') is stdlib_dumps
+    assert select_dumps('auto') is (orjson_dumps or stdlib_dumps)
+
+
+@pytest.mark.parametrize('dumps', BACKENDS)
+def test_jsonify_uses_provider(dumps):
+    provider = FastJSONProvider(app, dumps)
+    with app.app_context():
+        response = provider.response(PAYLOAD)
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == EXPECTED
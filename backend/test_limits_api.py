@@ -0,0 +1,75 @@
+"""
+Tests for the batch monthly limits endpoints
+"""
+
+from app_integrated import db, MonthlyLimit, Year
+from conftest import count_queries
+
+
+def test_put_then_get_all_twelve_limits(client, auth_headers, user):
+    response = client.put('/api/limits?year=2025', headers=auth_headers,
+                          json={'limits': {'1': 500, '2': '750.25', '12': 100}})
+
+    assert response.status_code == 200
+    limits = client.get('/api/limits?year=2025', headers=auth_headers).get_json()['limits']
+    assert len(limits) == 12
+    assert (limits['1'], limits['2'], limits['3'], limits['12']) == (500, 750.25, 0, 100)
+    assert db.session.query(MonthlyLimit.monthly_limit_amount).filter_by(month_id=2).scalar() == 75025
+    assert Year.query.filter_by(year_number=2025).count() == 1
+
+
+def test_put_upserts_and_clears_without_duplicates(client, auth_headers, user):
+    client.put('/api/limits?year=2025', headers=auth_headers, json={'limits': {'1': 500, '2': 600}})
+    client.post('/api/limit', headers=auth_headers, json={'year': 2025, 'month': 1, 'limit': 550})
+
+    response = client.put('/api/limits', headers=auth_headers, json={'year': 2025, 'limits': {'1': 650, '2': 0}})
+
+    assert response.status_code == 200
+    assert response.get_json()['limits']['1'] == 650
+    assert db.session.query(MonthlyLimit.month_id, MonthlyLimit.monthly_limit_amount).all() == [(1, 65000)]
+
+
+def test_get_limits_is_one_etagged_read(client, auth_headers, user):
+    client.put('/api/limits?year=2025', headers=auth_headers, json={'limits': {'3': 500}})
+    first = client.get('/api/limits?year=2025', headers=auth_headers)
+
+    with count_queries() as statements:
+        client.get('/api/limits?year=2025', headers=auth_headers)
+    not_modified = client.get('/api/limits?year=2025', headers={**auth_headers, 'If-None-Match': first.headers['ETag']})
+
+    assert len(statements) == 2  # user row (version + currency), then the limits
+    assert not_modified.status_code == 304
+
+
+def test_put_rejects_bad_input(client, auth_headers, user):
+    assert client.put('/api/limits?year=2025', headers=auth_headers, json={'limits': {'13': 1}}).status_code == 400
+    assert client.put('/api/limits?year=2025', headers=auth_headers, json={'limits': {'1': -5}}).status_code == 400
+    assert client.put('/api/limits?year=2025', headers=auth_headers, json={'limits': {'1': 'x'}}).status_code == 400
+    assert client.put('/api/limits?year=2025', headers=auth_headers, json={}).status_code == 400
+    assert MonthlyLimit.query.count() == 0
+
+
+def test_limits_reject_bad_years_and_months_without_creating_years(client, auth_headers, user):
+    response = client.put('/api/limits?year=2025', headers=auth_headers, json={'limits': {'abc': 1}})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Invalid month 'abc'"
+    assert client.put('/api/limits', headers=auth_headers,
+                      json={'year': 'abc', 'limits': {'1': 5}}).status_code == 400
+    assert client.put('/api/limits', headers=auth_headers,
+                      json={'year': 99999, 'limits': {'1': 5}}).status_code == 400
+    assert client.post('/api/limit', headers=auth_headers,
+                       json={'year': 'abc', 'month': 1, 'limit': 5}).status_code == 400
+    assert client.post('/api/limit', headers=auth_headers,
+                       json={'year': 1200, 'month': 1, 'limit': 5}).status_code == 400
+    assert client.post('/api/limit', headers=auth_headers,
+                       json={'year': 2025, 'month': 'x', 'limit': 5}).status_code == 400
+    assert Year.query.count() == 0
+
+
+def test_post_limit_rejects_negative_instead_of_clearing(client, auth_headers, user):
+    client.post('/api/limit', headers=auth_headers, json={'year': 2025, 'month': 1, 'limit': 500})
+
+    response = client.post('/api/limit', headers=auth_headers, json={'year': 2025, 'month': 1, 'limit': -1})
+
+    assert response.status_code == 400
+    assert db.session.query(MonthlyLimit.monthly_limit_amount).scalar() == 50000
@@ -0,0 +1,43 @@
+"""
+Tests for the structured logging helpers
+"""
+
+import json
+import logging
+
+from app_integrated import app
+from logging_config import JsonFormatter, RouteSamplingFilter, parse_sample_rates
+
+
+def make_record(level=logging.INFO, msg='saved %s', args=(3,), **extra):
+    record = logging.LogRecord('app_integrated', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_renders_message_and_extra_fields():
+    line = JsonFormatter().format(make_record(user_id=7))
+
+    entry = json.loads(line)
+    assert entry['msg'] == 'saved 3'
+    assert entry['level'] == 'INFO'
+    assert entry['user_id'] == 7
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates('/api/expenses=0.1, /api/year_bundle=1') == {
+        '/api/expenses': 0.1,
+        '/api/year_bundle': 1.0,
+    }
+    assert parse_sample_rates(None) == {}
+
+
+def test_sampling_drops_info_but_keeps_warnings_for_sampled_route():
+    sampling = RouteSamplingFilter({'/api/expenses': 0.0})
+
+    with app.test_request_context('/api/expenses'):
+        assert sampling.filter(make_record(logging.INFO)) is False
+        assert sampling.filter(make_record(logging.WARNING)) is True
+
+    with app.test_request_context('/api/summary'):
+        assert sampling.filter(make_record(logging.INFO)) is True
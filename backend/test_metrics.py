@@ -0,0 +1,46 @@
+"""
+Tests for the Prometheus request and database metrics
+"""
+
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_request_latency_status_and_sql_per_route(client, auth_headers, user, category):
+    route = {'route': '/api/expenses', 'method': 'GET'}
+    requests_before = sample('http_requests_total', status='200', **route)
+    latency_before = sample('http_request_duration_seconds_count', **route)
+    statements_before = sample('http_request_db_statements_sum', route='/api/expenses')
+
+    response = client.get('/api/expenses?year=2025&month=3', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert sample('http_requests_total', status='200', **route) == requests_before + 1
+    assert sample('http_request_duration_seconds_count', **route) == latency_before + 1
+    assert sample('http_request_db_statements_sum', route='/api/expenses') > statements_before
+    assert sample('http_requests_in_flight') == 0
+
+
+def test_unknown_paths_share_one_label(client):
+    before = sample('http_requests_total', route='unmatched', method='GET', status='404')
+
+    client.get('/no/such/page')
+    client.get('/no/such/other-page')
+
+    assert sample('http_requests_total', route='unmatched', method='GET', status='404') == before + 2
+
+
+def test_metrics_endpoint_serves_prometheus_text(client):
+    client.get('/api/months')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_requests_total{method="GET",route="/api/months",status="200"}' in body
+    assert 'route="/metrics"' not in body
@@ -0,0 +1,93 @@
+"""
+Tests for integer minor-unit money storage
+"""
+
+import pytest
+from sqlalchemy import literal, select
+from sqlalchemy.dialects import postgresql
+
+from app_integrated import db, rescaled_amount, Currency, Expense, MonthlySpendRollup, User
+from conftest import add_expenses
+from money import to_major, to_minor
+
+
+def test_to_minor_rounds_half_up_without_float_drift():
+    assert to_minor(0.1, 100) == 10
+    assert to_minor('12.345', 100) == 1235
+    assert to_minor(1.005, 100) == 101
+    assert to_minor(12.5, 1) == 13
+    assert to_minor('1.2345', 1000) == 1235
+    with pytest.raises(ValueError):
+        to_minor('abc', 100)
+    with pytest.raises(ValueError):
+        to_minor(float('nan'), 100)
+
+
+def test_to_major():
+    assert to_major(1250, 100) == 12.5
+    assert to_major(1250, 1) == 1250
+    assert to_major(None, 100) == 0
+
+
+def test_summary_totals_are_exact(client, auth_headers, user, category):
+    for price in (0.1, 0.2):
+        response = client.post('/api/expenses', headers=auth_headers, json={
+            'year': 2025,
+            'month': 3,
+            'expense': {'category_id': category.expense_category_id, 'amount': price, 'date': '2025-03-10'}
+        })
+        assert response.status_code == 201
+
+    summary = client.get('/api/summary?type=monthly&year=2025&month=3', headers=auth_headers).get_json()
+
+    assert summary['total_expenses'] == 0.3
+    assert db.session.query(Expense.expense_item_price).order_by(Expense.expense_id).all() == [(10,), (20,)]
+
+
+def test_currency_change_rescales_stored_amounts(client, auth_headers, user, category):
+    db.session.add_all([
+        Currency(currency_id=1, currency_name='US Dollar', currency_symbol='$'),
+        Currency(currency_id=5, currency_name='Japanese Yen', currency_symbol='¥', minor_unit_digits=0),
+    ])
+    db.session.commit()
+    add_expenses(user.user_id, category.expense_category_id, 2, price=12.5)
+    assert client.post('/api/global_limit', headers=auth_headers, json={'global_limit': 99.99}).status_code == 200
+
+    response = client.post('/api/user/currency', headers=auth_headers, json={'currency_id': 5})
+
+    assert response.status_code == 200
+    assert db.session.query(Expense.expense_item_price).distinct().all() == [(13,)]
+    assert db.session.get(User, user.user_id).global_limit == 100
+    rollup = MonthlySpendRollup.query.filter_by(user_id=user.user_id).one()
+    assert (rollup.total, rollup.count) == (26, 2)
+    summary = client.get('/api/summary?type=monthly&year=2025&month=3', headers=auth_headers).get_json()
+    assert summary['total_expenses'] == 26
+
+
+@pytest.mark.parametrize('currency_id, error', [
+    ('abc', 'Currency id must be an integer'),
+    (99, 'Invalid currency'),
+])
+def test_global_limit_rejects_bad_currency_before_rescaling(client, auth_headers, user, category, currency_id, error):
+    db.session.add(Currency(currency_id=1, currency_name='US Dollar', currency_symbol='$'))
+    db.session.commit()
+    add_expenses(user.user_id, category.expense_category_id, 1, price=12.5)
+
+    response = client.post('/api/global_limit', headers=auth_headers,
+                           json={'global_limit': 50, 'currency_id': currency_id})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+    assert db.session.query(Expense.expense_item_price).scalar() == 1250
+
+
+def test_rescale_rounds_half_up_in_numeric(client):
+    amounts = {1250: 13, 1249: 12, 250: 3, 1350: 14}
+    for minor, expected in amounts.items():
+        assert db.session.execute(select(rescaled_amount(literal(minor), 100, 1))).scalar() == expected
+    assert db.session.execute(select(rescaled_amount(literal(13), 1, 100))).scalar() == 1300
+
+    # SQLite has no exact NUMERIC; on PostgreSQL the whole expression must stay NUMERIC
+    sql = str(select(rescaled_amount(Expense.expense_item_price, 100, 1)).compile(dialect=postgresql.dialect()))
+    assert 'CAST(expense.expense_item_price AS NUMERIC(38, 0))' in sql
+    assert 'FLOAT' not in sql.upper() and 'DOUBLE' not in sql.upper()
@@ -0,0 +1,60 @@
+"""
+Tests for the reference data cache and its endpoints
+"""
+
+from app_integrated import app, db, Currency, Month, reference_cache
+from conftest import count_queries
+
+
+def test_currencies_served_from_cache_with_etag(client):
+    db.session.add(Currency(currency_id=1, currency_name='US Dollar', currency_symbol='$'))
+    db.session.commit()
+
+    first = client.get('/api/currencies')
+    assert first.status_code == 200
+    assert first.get_json()['currencies'][0]['currency_symbol'] == '$'
+    etag = first.headers['ETag']
+
+    with count_queries() as statements:
+        second = client.get('/api/currencies')
+        not_modified = client.get('/api/currencies', headers={'If-None-Match': etag})
+
+    assert statements == []
+    assert second.headers['ETag'] == etag
+    assert not_modified.status_code == 304
+
+
+def test_reference_write_invalidates_cache(client):
+    db.session.add(Month(month_id=1, month_name='January'))
+    db.session.commit()
+    assert len(client.get('/api/months').get_json()['months']) == 1
+
+    db.session.add(Month(month_id=2, month_name='February'))
+    db.session.commit()
+
+    assert len(client.get('/api/months').get_json()['months']) == 2
+
+
+def test_categories_merge_global_and_user_rows(client, auth_headers, category):
+    client.get('/api/categories', headers=auth_headers)
+    loads_before = reference_cache.loads
+
+    client.post('/api/categories', json={'category_name': 'Coffee'}, headers=auth_headers)
+    response = client.get('/api/categories', headers=auth_headers)
+
+    names = [cat['category_name'] for cat in response.get_json()['categories']]
+    assert names == ['Coffee', 'Food & Dining']
+    assert response.headers['ETag']
+    # A user category is not reference data, so the cache is not reloaded
+    assert reference_cache.loads == loads_before
+
+
+def test_categories_are_encoded_by_the_app_json_provider(client, auth_headers, category, monkeypatch):
+    encoded = []
+    dumps_bytes = app.json.dumps_bytes
+    monkeypatch.setattr(app.json, 'dumps_bytes', lambda obj: encoded.append(obj) or dumps_bytes(obj))
+
+    response = client.get('/api/categories', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert encoded == [response.get_json()]
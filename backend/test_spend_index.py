@@ -0,0 +1,87 @@
+"""
+Tests for the cumulative daily spend index
+"""
+
+from datetime import date
+
+from spend_index import DailySpendIndex, SpendIndexCache
+
+
+ROWS = [
+    (date(2024, 12, 31), 1, 'Food', 10.0, 1),
+    (date(2025, 1, 1), 1, 'Food', 5.0, 2),
+    (date(2025, 1, 1), 2, 'Travel', 100.0, 1),
+    (date(2025, 3, 15), 2, 'Travel', 50.0, 1),
+]
+
+
+def test_range_summary_uses_inclusive_bounds():
+    index = DailySpendIndex.build(ROWS)
+
+    assert index.range_summary(date(2025, 1, 1), date(2025, 1, 1)) == (105.0, 3, {1: (5.0, 2), 2: (100.0, 1)})
+    assert index.range_summary(date(2024, 12, 31), date(2025, 3, 15))[:2] == (165.0, 5)
+
+
+def test_range_summary_clamps_to_indexed_days():
+    index = DailySpendIndex.build(ROWS)
+
+    assert index.range_summary(date(2000, 1, 1), date(2030, 1, 1))[:2] == (165.0, 5)
+    assert index.range_summary(date(2025, 3, 16), date(2030, 1, 1)) == (0, 0, {})
+    assert DailySpendIndex.build([]).range_summary(date(2025, 1, 1), date(2025, 12, 31)) == (0, 0, {})
+
+
+def test_apply_delta_returns_updated_copy():
+    index = DailySpendIndex.build(ROWS)
+    updated = index.apply_delta(date(2025, 2, 1), 1, 7.0, 1)
+
+    assert updated.range_summary(date(2025, 2, 1), date(2025, 2, 28))[:2] == (7.0, 1)
+    assert index.range_summary(date(2025, 2, 1), date(2025, 2, 28)) == (0, 0, {})
+    assert index.apply_delta(date(2026, 1, 1), 1, 7.0, 1) is None
+    assert index.apply_delta(date(2025, 2, 1), 99, 7.0, 1) is None
+
+
+def test_cache_applies_deltas_only_from_previous_version():
+    cache = SpendIndexCache(maxsize=2)
+    loads = []
+
+    def load_rows():
+        loads.append(1)
+        return ROWS
+
+    cache.get(1, 4, load_rows)
+    cache.apply(1, 5, date(2025, 2, 1), 1, 7.0, 1)
+    index = cache.get(1, 5, load_rows)
+    assert len(loads) == 1
+    assert index.range_summary(date(2025, 2, 1), date(2025, 2, 1))[:2] == (7.0, 1)
+
+    cache.apply(1, 7, date(2025, 2, 1), 1, 7.0, 1)  # version 6 was written elsewhere
+    cache.get(1, 7, load_rows)
+    assert len(loads) == 2
+
+
+def test_cache_does_not_tag_rows_with_a_version_that_moved_during_the_load():
+    cache = SpendIndexCache(maxsize=2)
+    versions = iter([5])  # a write committed (version 4 -> 5) while the rows were loading
+
+    index = cache.get(1, 4, lambda: ROWS, current_version=lambda: next(versions))
+    cache.apply(1, 5, date(2025, 1, 1), 1, 5.0, 2)  # the write that is already in ROWS
+
+    assert index.range_summary(date(2025, 1, 1), date(2025, 1, 1))[:2] == (105.0, 3)
+    rebuilt = cache.get(1, 5, lambda: ROWS, current_version=lambda: 5)
+    assert rebuilt.range_summary(date(2025, 1, 1), date(2025, 1, 1))[:2] == (105.0, 3)
+    assert cache.builds == 2
+
+
+def test_cache_is_bounded_by_bytes():
+    entry_bytes = DailySpendIndex.build(ROWS).nbytes
+    cache = SpendIndexCache(maxsize=100, max_bytes=entry_bytes * 2)
+
+    for user_id in range(1, 4):
+        cache.get(user_id, 1, lambda: ROWS)
+
+    assert cache.nbytes == entry_bytes * 2
+    assert [cache.get(user_id, 1, lambda: []).days for user_id in (2, 3)] == [75, 75]
+    assert cache.get(1, 1, lambda: []).days == 0  # evicted first, rebuilt from the new rows
+
+    cache.clear()
+    assert cache.nbytes == 0
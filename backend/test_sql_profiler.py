@@ -0,0 +1,72 @@
+"""
+Tests for the opt-in SQL profiler
+"""
+
+import json
+import logging
+
+import pytest
+
+from app_integrated import sql_profiler
+from sql_profiler import is_explainable, statement_shape, summarize
+
+
+@pytest.fixture
+def profiler():
+    sql_profiler.enable()
+    slow_seconds, repeat_threshold = sql_profiler.slow_seconds, sql_profiler.repeat_threshold
+    yield sql_profiler
+    sql_profiler.disable()
+    sql_profiler.slow_seconds, sql_profiler.repeat_threshold = slow_seconds, repeat_threshold
+
+
+def test_statement_shape_ignores_values():
+    first = statement_shape("SELECT * FROM expense WHERE user_id = 1 AND name = 'a' AND id IN (1, 2, 3)")
+    second = statement_shape("SELECT *  FROM expense\nWHERE user_id = 42 AND name = 'b''c' AND id IN (7)")
+    assert first == second == 'SELECT * FROM expense WHERE user_id = ? AND name = ? AND id IN (...)'
+
+
+def test_only_plain_selects_are_explained():
+    assert is_explainable('SELECT 1')
+    assert is_explainable('WITH t AS (SELECT 1) SELECT * FROM t')
+    assert not is_explainable('WITH t AS (DELETE FROM expense RETURNING *) SELECT * FROM t')
+    assert not is_explainable('UPDATE "user" SET data_version = 1')
+
+
+def test_summarize_flags_repeated_shapes_and_slow_statements():
+    statements = [['SELECT ? FROM t', 'SELECT 1 FROM t', (), 0.001, False] for _ in range(6)]
+    statements.append(['SELECT * FROM big', 'SELECT * FROM big', (), 0.5, False])
+
+    report = summarize(statements, repeat_threshold=5, slow_seconds=0.1)
+
+    assert report['statements'] == 7
+    assert report['shapes'] == 2
+    assert report['repeated'] == [{'shape': 'SELECT ? FROM t', 'count': 6, 'ms': 6.0}]
+    assert report['slow'] == [{'sql': 'SELECT * FROM big', 'ms': 500.0}]
+
+
+def test_report_header_only_when_requested(client, auth_headers, user, profiler):
+    plain = client.get('/api/expenses?year=2025&month=3', headers=auth_headers)
+    profiled = client.get('/api/expenses?year=2025&month=3', headers={**auth_headers, 'X-SQL-Profile': '1'})
+
+    assert 'X-SQL-Profile' not in plain.headers
+    report = json.loads(profiled.headers['X-SQL-Profile'])
+    assert report['statements'] >= 1
+    assert profiled.headers['Server-Timing'].startswith('db;dur=')
+
+
+def test_repeated_shapes_and_slow_queries_are_logged_with_plan(client, auth_headers, user, profiler, caplog):
+    profiler.repeat_threshold = 1
+    profiler.slow_seconds = 1e-9
+
+    with caplog.at_level(logging.WARNING, logger='sql_profiler'):
+        client.get('/api/expenses?year=2025&month=3', headers=auth_headers)
+
+    assert any(record.getMessage().startswith('Possible N+1 on GET /api/expenses') for record in caplog.records)
+    slow = [record for record in caplog.records if record.getMessage().startswith('Slow query on GET /api/expenses')]
+    assert slow and any(record.plan and 'expense' in record.plan for record in slow)
+
+
+def test_disabled_profiler_adds_no_header(client, auth_headers, user):
+    response = client.get('/api/expenses?year=2025&month=3', headers={**auth_headers, 'X-SQL-Profile': '1'})
+    assert 'X-SQL-Profile' not in response.headers
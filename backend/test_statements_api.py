@@ -0,0 +1,141 @@
+"""
+Tests for PDF statements
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+import app_integrated
+from app_integrated import db, MonthlyLimit, Year
+from conftest import add_expenses
+from statements import StatementRenderer, render_statement_file, render_statement_pdf
+
+STATEMENT = {
+    'title': 'Monthly statement: March 2025',
+    'subtitle': 'Tester <&>',
+    'currency_name': 'Indian Rupee',
+    'currency_symbol': '₹',
+    'total': 30.0,
+    'count': 3,
+    'categories': [('Food & Dining', 30.0, 3)],
+    'limits': [('March 2025', 500.0, 30.0)]
+}
+
+
+@pytest.fixture
+def renderer(tmp_path, monkeypatch):
+    renderer = StatementRenderer(str(tmp_path), executor=ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(app_integrated, 'statement_renderer', renderer)
+    yield renderer
+    renderer.shutdown()
+
+
+def test_render_statement_pdf_returns_pdf_bytes():
+    assert render_statement_pdf(STATEMENT).startswith(b'%PDF')
+
+
+def test_render_statement_file_replaces_older_versions(tmp_path):
+    old = render_statement_file(STATEMENT, str(tmp_path / '1' / '2025-03-v1.pdf'))
+    other_period = render_statement_file(STATEMENT, str(tmp_path / '1' / '2025-04-v1.pdf'))
+    new = render_statement_file(STATEMENT, str(tmp_path / '1' / '2025-03-v2.pdf'))
+
+    assert not os.path.exists(old)
+    assert os.path.exists(new) and os.path.exists(other_period)
+
+
+def test_renderer_runs_in_worker_processes(tmp_path):
+    renderer = StatementRenderer(str(tmp_path), max_workers=1)
+    try:
+        path = renderer.path_for(1, '2025-03', 1)
+        assert renderer.submit(path, STATEMENT) is renderer.submit(path, STATEMENT)
+        renderer.join(timeout=60)
+        assert open(path, 'rb').read(4) == b'%PDF'
+    finally:
+        renderer.shutdown()
+
+
+def test_statement_is_rendered_in_background_then_served(client, auth_headers, user, category, renderer):
+    add_expenses(user.user_id, category.expense_category_id, 3, expenditure_date=date(2025, 3, 10))
+    year = Year(year_number=2025)
+    db.session.add(year)
+    db.session.flush()
+    db.session.add(MonthlyLimit(user_id=user.user_id, monthly_limit_amount=50000, month_id=3, year_id=year.year_id))
+    db.session.commit()
+    url = '/api/statements?type=monthly&year=2025&month=3'
+
+    first = client.get(url, headers=auth_headers)
+    assert first.status_code == 202
+    assert first.headers['Retry-After'] == '1'
+
+    renderer.join(timeout=30)
+    ready = client.get(url, headers=auth_headers)
+    assert ready.status_code == 200
+    assert ready.mimetype == 'application/pdf'
+    assert ready.get_data().startswith(b'%PDF')
+
+
+def test_build_statement_collects_yearly_numbers(client, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 2, expenditure_date=date(2025, 1, 5))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 7, 5), price=5.0)
+
+    statement = app_integrated.build_statement(user.user_id, 2025)
+
+    assert (statement['total'], statement['count']) == (25.0, 3)
+    assert statement['categories'] == [('Food & Dining', 25.0, 3)]
+    assert statement['limits'][0] == ('January 2025', 0, 20.0)
+    assert len(statement['limits']) == 13
+
+
+def test_new_expense_changes_statement_version(client, auth_headers, user, category, renderer):
+    url = '/api/statements?type=yearly&year=2025'
+    client.get(url, headers=auth_headers)
+    renderer.join(timeout=30)
+    assert client.get(url, headers=auth_headers).status_code == 200
+
+    add_expenses(user.user_id, category.expense_category_id, 1)
+
+    assert client.get(url, headers=auth_headers).status_code == 202
+
+
+def test_statement_rejects_bad_period(client, auth_headers, user):
+    response = client.get('/api/statements?type=monthly&year=2025&month=13', headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_render_status_is_shared_between_workers(tmp_path):
+    first = StatementRenderer(str(tmp_path), executor=ThreadPoolExecutor(max_workers=1))
+    other_worker = StatementRenderer(str(tmp_path), executor=ThreadPoolExecutor(max_workers=1))
+    path = first.path_for(1, '2025-03', 1)
+    try:
+        first.submit(path, {'title': 'missing the numbers'})
+        first.join(timeout=30)
+
+        assert not other_worker.is_pending(path)
+        assert 'subtitle' in other_worker.pop_failure(path)
+        assert first.pop_failure(path) is None  # reporting the failure clears it
+        assert os.listdir(os.path.dirname(path)) == []
+    finally:
+        first.shutdown()
+        other_worker.shutdown()
+
+
+def test_pending_marker_blocks_other_workers_until_it_times_out(tmp_path):
+    renderer = StatementRenderer(str(tmp_path), executor=ThreadPoolExecutor(max_workers=1), render_timeout=60)
+    path = renderer.path_for(1, '2025-03', 2)
+    os.makedirs(os.path.dirname(path))
+    open(path + '.pending', 'w').close()  # claimed by another worker
+    open(renderer.path_for(1, '2025-03', 1) + '.failed', 'w').close()
+    try:
+        assert renderer.is_pending(path)
+        assert renderer.submit(path, STATEMENT) is None
+
+        os.utime(path + '.pending', (0, 0))  # that worker died mid-render
+        assert not renderer.is_pending(path)
+        assert renderer.submit(path, STATEMENT) is not None
+        renderer.join(timeout=30)
+        assert os.listdir(os.path.dirname(path)) == ['2025-03-v2.pdf']
+    finally:
+        renderer.shutdown()
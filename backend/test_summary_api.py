@@ -0,0 +1,122 @@
+"""
+Tests for the summary endpoint
+"""
+
+from datetime import date
+
+from app_integrated import MonthlySpendRollup, reference_cache, spend_index_cache
+from conftest import add_expenses, count_queries
+
+
+def test_monthly_summary_groups_by_category(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 3, price=12.5)
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 4, 1))
+
+    response = client.get('/api/summary?type=monthly&year=2025&month=3', headers=auth_headers)
+
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert summary['total_expenses'] == 37.5
+    assert summary['expense_count'] == 3
+    assert summary['categories'] == {'Food & Dining': 37.5}
+
+
+def test_yearly_summary_groups_by_month(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 2, expenditure_date=date(2025, 1, 31))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 12, 1))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2026, 1, 1))
+
+    response = client.get('/api/summary?type=yearly&year=2025', headers=auth_headers)
+
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert summary['total_expenses'] == 30.0
+    assert summary['expense_count'] == 3
+    assert summary['monthly_breakdown']['1'] == 20.0
+    assert summary['monthly_breakdown']['12'] == 10.0
+    assert summary['monthly_breakdown']['6'] == 0
+
+
+def test_summary_query_count_is_constant(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 1)
+    reference_cache.get()  # loaded once per process, not per request
+    with count_queries() as few:
+        client.get('/api/summary?type=monthly&year=2025&month=3', headers=auth_headers)
+
+    add_expenses(user.user_id, category.expense_category_id, 50)
+    with count_queries() as many:
+        client.get('/api/summary?type=monthly&year=2025&month=3', headers=auth_headers)
+
+    assert len(many) == len(few)
+
+
+def test_expense_writes_keep_rollup_in_step(client, auth_headers, user, category):
+    def post_expense(amount, day):
+        response = client.post('/api/expenses', headers=auth_headers, json={
+            'year': 2025, 'month': 5,
+            'expense': {'amount': amount, 'category_id': category.expense_category_id, 'date': f'2025-05-{day:02d}'}
+        })
+        return response.get_json()['expense_id']
+
+    post_expense(20, 1)
+    second = post_expense(5, 2)
+    client.delete('/api/expenses', headers=auth_headers, json={'expense_id': second})
+
+    rollup = MonthlySpendRollup.query.filter_by(user_id=user.user_id, year=2025, month=5).one()
+    assert (rollup.total, rollup.count) == (2000, 1)
+
+    summary = client.get('/api/summary?type=yearly&year=2025', headers=auth_headers).get_json()
+    assert summary['monthly_breakdown']['5'] == 20.0
+    assert summary['expense_count'] == 1
+
+
+def test_deleting_last_expense_removes_rollup_row(client, auth_headers, user, category):
+    response = client.post('/api/expenses', headers=auth_headers, json={
+        'year': 2025, 'month': 5,
+        'expense': {'amount': 20, 'category_id': category.expense_category_id, 'date': '2025-05-01'}
+    })
+    client.delete('/api/expenses', headers=auth_headers, json={'expense_id': response.get_json()['expense_id']})
+
+    assert MonthlySpendRollup.query.count() == 0
+
+
+def test_custom_summary_spans_years(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 2, expenditure_date=date(2024, 12, 30))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 1, 2))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 2, 1))
+
+    response = client.get('/api/summary?type=custom&start_date=2024-12-30&end_date=2025-01-31', headers=auth_headers)
+
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert summary['total_expenses'] == 30.0
+    assert summary['expense_count'] == 3
+    assert summary['categories'] == {'Food & Dining': 30.0}
+
+
+def test_custom_summary_follows_expense_writes(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 1, 1))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 6, 30))
+    url = '/api/summary?type=custom&start_date=2025-01-01&end_date=2025-12-31'
+    builds = spend_index_cache.builds
+    assert client.get(url, headers=auth_headers).get_json()['total_expenses'] == 20.0
+
+    response = client.post('/api/expenses', headers=auth_headers, json={
+        'year': 2025, 'month': 3,
+        'expense': {'amount': 7, 'category_id': category.expense_category_id, 'date': '2025-03-01'}
+    })
+    summary = client.get(url, headers=auth_headers).get_json()
+    assert (summary['total_expenses'], summary['expense_count']) == (27.0, 3)
+
+    client.delete('/api/expenses', headers=auth_headers, json={'expense_id': response.get_json()['expense_id']})
+    summary = client.get(url, headers=auth_headers).get_json()
+    assert (summary['total_expenses'], summary['expense_count']) == (20.0, 2)
+    assert spend_index_cache.builds == builds + 1  # writes were folded in, not rebuilt
+
+
+def test_custom_summary_rejects_bad_dates(client, auth_headers, user):
+    bad_format = client.get('/api/summary?type=custom&start_date=2025/01/01&end_date=2025-02-01', headers=auth_headers)
+    reversed_range = client.get('/api/summary?type=custom&start_date=2025-02-01&end_date=2025-01-01', headers=auth_headers)
+
+    assert bad_format.status_code == 400
+    assert reversed_range.status_code == 400
@@ -0,0 +1,85 @@
+"""
+Tests for the synthetic data generator
+"""
+
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import func
+
+from app_integrated import (
+    db, create_access_token, rebuild_user_spend_rollup,
+    Expense, ExpenseCategory, MonthlyLimit, MonthlySpendRollup, User
+)
+from synthetic_data import (
+    CATEGORY_PROFILES, ChunkGenerator, Layout, Population, copy_lines, generate_population
+)
+
+LAYOUT = Layout(1, 100, {name: i for i, name in enumerate(CATEGORY_PROFILES, 1)}, {2024: 1, 2025: 2})
+
+
+def test_generate_population_loads_consistent_rows(client, user):
+    population = Population(60, 3000, date(2024, 1, 1), date(2025, 12, 31), seed=5, limit_share=0.5)
+
+    totals = generate_population(db.engine, db.metadata, population, chunk_users=25)
+
+    synthetic = User.query.filter(User.username.like('synthetic_%'))
+    assert totals['user'] == synthetic.count() == 60
+    assert min(row.user_id for row in synthetic) == user.user_id + 1
+    assert totals['expense'] == Expense.query.count() > 0
+    assert totals['expense_category'] == ExpenseCategory.query.filter(ExpenseCategory.user_id.isnot(None)).count()
+    assert totals['monthly_limit'] == MonthlyLimit.query.count() > 0
+    # The generated rollup is exactly what a rebuild from the expenses produces
+    generated = sorted(db.session.query(MonthlySpendRollup.user_id, MonthlySpendRollup.year, MonthlySpendRollup.month,
+                                        MonthlySpendRollup.category_id, MonthlySpendRollup.total,
+                                        MonthlySpendRollup.count).all())
+    for row in synthetic:
+        rebuild_user_spend_rollup(row.user_id)
+    db.session.commit()
+    assert sorted(db.session.query(MonthlySpendRollup.user_id, MonthlySpendRollup.year, MonthlySpendRollup.month,
+                                   MonthlySpendRollup.category_id, MonthlySpendRollup.total,
+                                   MonthlySpendRollup.count).all()) == generated
+
+
+def test_generated_users_are_served_by_the_api(client):
+    population = Population(5, 500, date(2025, 1, 1), date(2025, 12, 31), seed=2)
+    generate_population(db.engine, db.metadata, population)
+    heavy_user_id, expense_count = db.session.query(Expense.user_id, func.count()).group_by(
+        Expense.user_id).order_by(func.count().desc()).first()
+    token = create_access_token({'user_id': heavy_user_id, 'username': 'synthetic', 'email': ''})
+
+    response = client.get('/api/summary?type=yearly&year=2025', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 200
+    assert response.get_json()['expense_count'] == expense_count
+
+
+def test_chunks_are_reproducible_and_skewed():
+    population = Population(400, 40_000, date(2024, 1, 1), date(2025, 12, 31), seed=9)
+    first = ChunkGenerator(population, LAYOUT, 0, 400)
+    rows = list(first.expenses())
+    again = ChunkGenerator(population, LAYOUT, 0, 400)
+
+    assert list(again.expenses()) == rows
+    assert again.users == first.users and again.limits() == first.limits()
+    per_user = sorted(Counter(row[0] for row in rows).values(), reverse=True)
+    assert sum(per_user[:40]) > 0.25 * len(rows)  # the top 10% of users spend far more than 10%
+    by_month = Counter(row[6].month for row in rows)
+    assert by_month[12] > by_month[2] * 1.3
+
+
+def test_population_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        Population(0, 10, date(2025, 1, 1), date(2025, 2, 1))
+    with pytest.raises(ValueError):
+        Population(10, 10, date(2025, 2, 1), date(2025, 1, 1))
+    with pytest.raises(ValueError):
+        Population(10, 10, date(2025, 1, 1), date(2025, 2, 1), pareto_alpha=1.0)
+
+
+def test_copy_lines_escapes_text_and_nulls():
+    assert copy_lines([(1, 'tab\there', None, date(2025, 3, 1)), (2, 'back\\slash\nline', '', 5)]) == (
+        '1\ttab\\there\t\\N\t2025-03-01\n'
+        '2\tback\\\\slash\\nline\t\t5\n'
+    )
@@ -0,0 +1,68 @@
+"""
+Tests for the verified JWT cache
+"""
+
+import app_integrated
+from token_cache import TokenCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss_counters():
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+
+    assert cache.get('token-a') is None
+    cache.put('token-a', 42)
+    assert cache.get('token-a') == 42
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_entry_expires_at_token_exp_before_ttl():
+    clock = FakeClock()
+    cache = TokenCache(maxsize=10, ttl_seconds=300, clock=clock)
+    cache.put('token-a', 42, token_exp=clock.now + 10)
+
+    clock.now += 9
+    assert cache.get('token-a') == 42
+    clock.now += 1
+    assert cache.get('token-a') is None
+    assert cache.stats()['expirations'] == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TokenCache(maxsize=2, ttl_seconds=60)
+    cache.put('token-a', 1)
+    cache.put('token-b', 2)
+    cache.get('token-a')
+    cache.put('token-c', 3)
+
+    assert cache.get('token-b') is None
+    assert cache.get('token-a') == 1
+    assert cache.get('token-c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_repeated_requests_decode_token_once(client, auth_headers, monkeypatch):
+    calls = []
+    original = app_integrated.verify_token
+
+    def counting_verify_token(token):
+        calls.append(token)
+        return original(token)
+
+    monkeypatch.setattr(app_integrated, 'verify_token', counting_verify_token)
+
+    for _ in range(5):
+        assert client.get('/api/global_limit', headers=auth_headers).status_code == 200
+
+    assert len(calls) == 1
@@ -0,0 +1,51 @@
+"""
+Tests for the dashboard year bundle endpoint
+"""
+
+from datetime import date
+
+from app_integrated import db, MonthlyLimit, Year
+from conftest import add_expenses, count_queries
+
+
+def test_year_bundle_groups_expenses_and_limits(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 2, expenditure_date=date(2025, 3, 10))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2025, 11, 2))
+    add_expenses(user.user_id, category.expense_category_id, 1, expenditure_date=date(2024, 3, 10))
+    year = Year(year_number=2025)
+    db.session.add(year)
+    db.session.flush()
+    db.session.add(MonthlyLimit(user_id=user.user_id, monthly_limit_amount=50000, month_id=3, year_id=year.year_id))
+    user.global_limit = 600000
+    db.session.commit()
+
+    response = client.get('/api/year_bundle?year=2025', headers=auth_headers)
+
+    assert response.status_code == 200
+    bundle = response.get_json()
+    assert len(bundle['expenses']['3']) == 2
+    assert len(bundle['expenses']['11']) == 1
+    assert bundle['expenses']['1'] == []
+    assert bundle['monthly_limits']['3'] == 500.0
+    assert bundle['monthly_limits']['4'] == 0
+    assert bundle['global_limit'] == 6000.0
+    assert [c['category_name'] for c in bundle['categories']] == ['Food & Dining']
+
+
+def test_year_bundle_requires_auth(client):
+    response = client.get('/api/year_bundle?year=2025')
+    assert response.status_code == 401
+
+
+def test_year_bundle_query_count_is_constant(client, auth_headers, user, category):
+    add_expenses(user.user_id, category.expense_category_id, 1)
+    client.get('/api/year_bundle?year=2025', headers=auth_headers)  # warm the reference cache
+    with count_queries() as few:
+        client.get('/api/year_bundle?year=2025', headers=auth_headers)
+
+    for month in range(1, 13):
+        add_expenses(user.user_id, category.expense_category_id, 5, expenditure_date=date(2025, month, 15))
+    with count_queries() as many:
+        client.get('/api/year_bundle?year=2025', headers=auth_headers)
+
+    assert len(many) == len(few)
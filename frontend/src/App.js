@@ -233,61 +233,11 @@ function App() {
       console.log('🧹 App: Cleared all cached data to force fresh load from database');
       
       try {
-        // Create all API calls to run in parallel for fastest loading
-        console.log('🚀 Starting parallel fetch of all data from PostgreSQL...');
+        // Load the whole year in a single request instead of one call per month
+        console.log('🚀 Fetching year bundle from PostgreSQL...');
         
         const token = localStorage.getItem('token');
-
-        // Wrap fetch calls to suppress abort/timeout errors from flashing
-        const safeFetch = (url, options) => {
-          return fetch(url, options).catch(err => {
-            // Silently handle timeout and network errors - they're handled by Promise.allSettled
-            if (err.name === 'AbortError' || err.message.includes('timeout')) {
-              console.log('🔕 Suppressed timeout error for:', url);
-            } else if (err.message.includes('Failed to fetch')) {
-              console.log('🔕 Suppressed network error for:', url);
-            }
-            throw err; // Re-throw to let Promise.allSettled handle it
-          });
-        };
-
-        const globalLimitPromise = safeFetch(API_CONFIG.ENDPOINTS.GLOBAL_LIMIT, {
-          method: 'GET',
-          headers: {
-            'Content-Type': 'application/json',
-            'Authorization': token ? `Bearer ${token}` : ''
-          },
-          signal: AbortSignal.timeout(8000)
-        });
-
-        // Create all monthly limit fetch promises
-        const monthLimitPromises = months.map(monthObj =>
-          safeFetch(buildUrl(API_CONFIG.ENDPOINTS.MONTHLY_LIMIT, { year, month: monthObj.month_id }), {
-            method: 'GET',
-            headers: {
-              'Content-Type': 'application/json',
-              'Authorization': token ? `Bearer ${token}` : ''
-            },
-            signal: AbortSignal.timeout(8000)
-          }).then(response => ({ monthId: monthObj.month_id, response }))
-          .catch(err => ({ monthId: monthObj.month_id, error: err }))
-        );
-
-        // Create all expense fetch promises
-        const expensePromises = months.map(monthObj => {
-          return safeFetch(buildUrl(API_CONFIG.ENDPOINTS.EXPENSES, { year, month: monthObj.month_id }), {
-            method: 'GET',
-            headers: {
-              'Content-Type': 'application/json',
-              'Authorization': token ? `Bearer ${token}` : ''
-            },
-            signal: AbortSignal.timeout(8000)
-          }).then(response => ({ monthId: monthObj.month_id, response }))
-          .catch(err => ({ monthId: monthObj.month_id, error: err }))
-        });
-
-        // Fetch categories
-        const categoriesPromise = safeFetch(API_CONFIG.ENDPOINTS.CATEGORIES, {
+        const response = await fetch(buildUrl(API_CONFIG.ENDPOINTS.YEAR_BUNDLE, { year }), {
           method: 'GET',
           headers: {
             'Content-Type': 'application/json',
@@ -296,107 +246,49 @@ function App() {
           signal: AbortSignal.timeout(8000)
         });
         
-        // Execute all requests in parallel
-        console.log('⚡ Executing all API calls in parallel...');
-        const [globalLimitResponse, categoriesResponse, ...monthLimitResponses] = await Promise.allSettled([
-          globalLimitPromise,
-          categoriesPromise,
-          ...monthLimitPromises
-        ]);
+        if (!response.ok) {
+          throw new Error(`Year bundle request failed with status ${response.status}`);
+        }
         
-        // Process and show critical data (limits) immediately
-        let globalLimitValue = 0;
-        if (globalLimitResponse.status === 'fulfilled') {
-          try {
-            const globalData = await globalLimitResponse.value.json();
-            globalLimitValue = globalData.global_limit || 0;
-            console.log('✅ Global limit loaded immediately:', globalLimitValue);
-            setGlobalLimit(globalLimitValue); // Show immediately
-            setTempGlobalLimit(globalLimitValue);
-          } catch (error) {
-            console.log('❌ Global limit parse error:', error);
-          }
+        const bundle = await response.json();
+        
+        // Global limit
+        const globalLimitValue = bundle.global_limit || 0;
+        console.log('✅ Global limit loaded:', globalLimitValue);
+        setGlobalLimit(globalLimitValue);
+        setTempGlobalLimit(globalLimitValue);
+        
+        // Currency
+        if (bundle.currency) {
+          setCurrency(bundle.currency.currency_id);
+          setCurrentCurrencySymbol(bundle.currency.currency_symbol);
         }
         
-        // Process monthly limits immediately
+        // Monthly limits (backend returns all 12 months, 0 when unset)
         const limitData = {};
         const tempLimitData = {};
-        for (const result of monthLimitResponses) {
-          if (result.status === 'fulfilled' && result.value && !result.value.error) {
-            try {
-              const { monthId, response } = result.value;
-              if (response) {
-                const monthData = await response.json();
-                // Backend returns 'limit', not 'monthly_limit'
-                if (monthData.limit && monthData.limit > 0) {
-                  limitData[monthId] = monthData.limit;
-                  tempLimitData[monthId] = monthData.limit.toString();
-                  console.log(`✅ Monthly limit loaded immediately for month ${monthId}: ${currentCurrencySymbol}${monthData.limit}`);
-                }
-              }
-            } catch (error) {
-              console.log('❌ Monthly limit parse error:', error);
-            }
-          } else if (result.value?.error) {
-            console.log(`🔕 Skipped failed monthly limit for month ${result.value.monthId}`);
+        Object.entries(bundle.monthly_limits || {}).forEach(([monthId, limit]) => {
+          if (limit && limit > 0) {
+            limitData[monthId] = limit;
+            tempLimitData[monthId] = limit.toString();
           }
-        }
-        
-        // Apply limits immediately for faster perceived loading
+        });
         setMonthLimits(limitData);
         setTempMonthLimits(tempLimitData);
-        console.log('🚀 Critical limit data applied immediately');
-        
-        // Load categories immediately
-        if (categoriesResponse.status === 'fulfilled') {
-          try {
-            const categoriesData = await categoriesResponse.value.json();
-            console.log('✅ Categories loaded from API:', categoriesData.categories);
-            setCategories(categoriesData.categories || []);
-            // Make categories available globally for debugging
-            window.debugCategories = categoriesData.categories || [];
-            console.log('Categories set in state, you can check window.debugCategories');
-          } catch (error) {
-            console.log('❌ Categories parse error:', error);
-          }
-        }
+        console.log('✅ Monthly limits loaded for months:', Object.keys(limitData));
         
-        // Now fetch expenses (less critical, can show loading state longer)
-        const expenseResponses = await Promise.allSettled(expensePromises);
+        // Categories
+        console.log('✅ Categories loaded from API:', bundle.categories);
+        setCategories(bundle.categories || []);
+        // Make categories available globally for debugging
+        window.debugCategories = bundle.categories || [];
         
-        // Process expenses (limits already processed above)
+        // Expenses, keyed the same way as the rest of the app
         const expenseData = {};
-        for (const result of expenseResponses) {
-          if (result.status === 'fulfilled' && result.value && !result.value.error) {
-            try {
-              const { monthId, response } = result.value;
-              if (response) {
-                const expenseList = await response.json();
-                expenseData[`${year}-${monthId}`] = Array.isArray(expenseList) ? expenseList : [];
-                console.log(`✅ Expenses loaded for month ${monthId}: ${expenseData[`${year}-${monthId}`].length} items`);
-              } else {
-                const monthId = result.value?.monthId;
-                if (monthId) {
-                  expenseData[`${year}-${monthId}`] = [];
-                }
-              }
-            } catch (error) {
-              console.log('❌ Expenses parse error:', error);
-              // Get monthId from result.value if available
-              const monthId = result.value?.monthId;
-              if (monthId) {
-                expenseData[`${year}-${monthId}`] = [];
-              }
-            }
-          } else {
-            // Set empty array for failed requests or errors
-            const monthId = result.value?.monthId;
-            if (monthId) {
-              expenseData[`${year}-${monthId}`] = [];
-              console.log(`🔕 Skipped failed expenses for month ${monthId}`);
-            }
-          }
-        }
+        months.forEach(monthObj => {
+          const monthExpenses = bundle.expenses?.[monthObj.month_id];
+          expenseData[`${year}-${monthObj.month_id}`] = Array.isArray(monthExpenses) ? monthExpenses : [];
+        });
         
         // Apply final expense data to state (limits already applied above)
         console.log('🚀 Applying final expense data to UI state...');
@@ -1297,25 +1189,26 @@ function App() {
       const limitData = {};
       const tempLimitData = {};
       
-      for (const monthObj of months) {
-        const monthId = monthObj.month_id;
-        try {
-          const monthResponse = await fetch(buildUrl(API_CONFIG.ENDPOINTS.MONTHLY_LIMIT, { year, month: monthId }), {
-            signal: AbortSignal.timeout(5000)
-          });
-          
-          if (monthResponse.ok) {
-            const monthData = await monthResponse.json();
-            console.log(`Monthly limit response for month ${monthId}:`, monthData);
-            if (monthData.limit > 0) {
-              limitData[monthId] = monthData.limit;
-              tempLimitData[monthId] = monthData.limit.toString();
-            }
-          }
-        } catch (error) {
-          console.log(`❌ Failed to fetch limit for month ${monthId}:`, error);
-        }
+      // All twelve months in one request
+      const token = localStorage.getItem('token');
+      const response = await fetch(buildUrl(API_CONFIG.ENDPOINTS.MONTHLY_LIMITS, { year }), {
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': token ? `Bearer ${token}` : ''
+        },
+        signal: AbortSignal.timeout(5000)
+      });
+      
+      if (!response.ok) {
+        throw new Error(`Failed to fetch monthly limits: ${response.status}`);
       }
+      const data = await response.json();
+      Object.entries(data.limits || {}).forEach(([monthId, limit]) => {
+        if (limit > 0) {
+          limitData[monthId] = limit;
+          tempLimitData[monthId] = limit.toString();
+        }
+      });
       
       console.log('🔄 Refreshed monthly limits:', limitData);
       setMonthLimits(limitData);
@@ -1331,12 +1224,12 @@ function App() {
       console.log('Clearing monthly limit for month:', monthIdx);
       
       // Send 0 to backend to clear the limit
-      const requestData = { year, month: monthIdx, limit: 0 };
-      console.log('App: Sending POST to /api/limit to clear limit:', requestData);
+      const requestData = { limits: { [monthIdx]: 0 } };
+      console.log('App: Sending PUT to /api/limits to clear limit:', requestData);
       
       const token = localStorage.getItem('token');
-      const response = await fetch(API_CONFIG.ENDPOINTS.MONTHLY_LIMIT, {
-        method: 'POST',
+      const response = await fetch(buildUrl(API_CONFIG.ENDPOINTS.MONTHLY_LIMITS, { year }), {
+        method: 'PUT',
         headers: { 
           'Content-Type': 'application/json',
           'Authorization': token ? `Bearer ${token}` : ''
@@ -1403,12 +1296,12 @@ function App() {
         return;
       }
       
-      const requestData = { year, month: monthIdx, limit: limitValue };
-      console.log('App: Sending POST to /api/limit with data:', requestData);
+      const requestData = { limits: { [monthIdx]: limitValue } };
+      console.log('App: Sending PUT to /api/limits with data:', requestData);
       
       const token = localStorage.getItem('token');
-      const response = await fetch(API_CONFIG.ENDPOINTS.MONTHLY_LIMIT, {
-        method: 'POST',
+      const response = await fetch(buildUrl(API_CONFIG.ENDPOINTS.MONTHLY_LIMITS, { year }), {
+        method: 'PUT',
         headers: { 
           'Content-Type': 'application/json',
           'Authorization': token ? `Bearer ${token}` : ''
@@ -1418,7 +1311,7 @@ function App() {
       
       if (response.ok) {
         const data = await response.json();
-        console.log('App: POST /api/limit response data:', data);
+        console.log('App: PUT /api/limits response data:', data);
         
         // IMMEDIATELY update the monthLimits state with the saved value
         setMonthLimits(prev => {
@@ -1438,7 +1331,7 @@ function App() {
         console.log('App: Monthly limit saved and state updated successfully');
       } else {
         const errorText = await response.text();
-        console.error('App: Error response from /api/limit:', errorText);
+        console.error('App: Error response from /api/limits:', errorText);
         setMonthLimitSuccess(prev => ({ ...prev, [monthIdx]: 'Failed to save monthly limit' }));
         setTimeout(() => {
           setMonthLimitSuccess(prev => ({ ...prev, [monthIdx]: '' }));
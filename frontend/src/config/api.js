@@ -20,6 +20,7 @@ const API_ENDPOINTS = {
   // Limits
   GLOBAL_LIMIT: `${API_BASE_URL}/api/global_limit`,
   MONTHLY_LIMIT: `${API_BASE_URL}/api/limit`,
+  MONTHLY_LIMITS: `${API_BASE_URL}/api/limits`,
   
   // Currencies
   CURRENCIES: `${API_BASE_URL}/api/currencies`,
@@ -31,6 +32,9 @@ const API_ENDPOINTS = {
   // Summary
   SUMMARY: `${API_BASE_URL}/api/summary`,
   
+  // Dashboard (expenses, limits, categories and currency for a whole year)
+  YEAR_BUNDLE: `${API_BASE_URL}/api/year_bundle`,
+  
   // Database Test
   TEST_DB: `${API_BASE_URL}/api/test-db`,
 };
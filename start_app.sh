@@ -46,11 +46,19 @@ echo -e "\n${YELLOW}🔫 Killing existing processes on ports 5002 and 3000...${N
 lsof -ti:5002 | xargs kill -9 2>/dev/null
 lsof -ti:3000 | xargs kill -9 2>/dev/null
 
-# Start backend
+# Start backend: gunicorn (see backend/gunicorn.conf.py) unless APP_SERVER=dev
 echo -e "\n${YELLOW}🔥 Starting backend server...${NC}"
-cd backend/app
-python3 app_integrated.py &
-BACKEND_PID=$!
+cd backend
+if [ "${APP_SERVER:-gunicorn}" != "dev" ] && command_exists gunicorn; then
+    gunicorn -c gunicorn.conf.py wsgi:app &
+    BACKEND_PID=$!
+else
+    if [ "${APP_SERVER:-gunicorn}" != "dev" ]; then
+        echo -e "${YELLOW}⚠️  gunicorn not found (pip install -r backend/requirements.txt); using the development server${NC}"
+    fi
+    (cd app && exec python3 app_integrated.py) &
+    BACKEND_PID=$!
+fi
 echo -e "${GREEN}✅ Backend started with PID: $BACKEND_PID${NC}"
 
 # Wait for backend to be ready
@@ -68,7 +76,7 @@ fi
 
 # Start frontend
 echo -e "\n${YELLOW}🎨 Starting frontend server...${NC}"
-cd ../../frontend
+cd ../frontend
 
 # Install dependencies if needed
 if [ ! -d "node_modules" ]; then
@@ -84,14 +92,16 @@ echo -e "${GREEN}✅ Frontend started with PID: $FRONTEND_PID${NC}"
 # Function to cleanup on exit
 cleanup() {
     echo -e "\n${YELLOW}🛑 Shutting down servers...${NC}"
-    kill $BACKEND_PID 2>/dev/null
     kill $FRONTEND_PID 2>/dev/null
+    # SIGTERM: gunicorn stops accepting connections and lets workers finish in-flight requests
+    kill -TERM $BACKEND_PID 2>/dev/null
+    wait $BACKEND_PID 2>/dev/null
     echo -e "${GREEN}✅ Servers stopped${NC}"
     exit 0
 }
 
 # Set up trap to cleanup on Ctrl+C
-trap cleanup INT
+trap cleanup INT TERM
 
 # Display running status
 echo -e "\n${GREEN}=================================================="